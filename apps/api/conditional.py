@@ -0,0 +1,39 @@
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+
+
+def make_etag(*parts):
+    """Weak ETag over the given parts, or None if any part is unknown."""
+    if any(part is None for part in parts):
+        return None
+    return 'W/"{}"'.format(hashlib.sha256(repr(parts).encode()).hexdigest()[:32])
+
+
+def conditional(etag_func):
+    """Add ETag / If-None-Match handling to an APIView GET handler.
+
+    etag_func(request, *args, **kwargs) runs before the handler and should cost
+    no more than an indexed lookup; returning None skips conditional handling.
+    A matching If-None-Match is answered with 304 without calling the handler,
+    and the ETag is attached to successful responses.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            etag = etag_func(request, *args, **kwargs)
+            if etag is not None:
+                not_modified = get_conditional_response(request, etag=etag)
+                if not_modified is not None:
+                    not_modified["ETag"] = etag
+                    return not_modified
+
+            response = handler(view, request, *args, **kwargs)
+            if etag is not None and response.status_code == 200:
+                response["ETag"] = etag
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from itertools import batched
+
+from apps.api.fast_json import FastJSONRenderer
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def projected_batches(rows, chunk_size, projection, attach=None):
+    """Serialize rows `chunk_size` at a time, calling attach(results, rows) on each chunk."""
+    for chunk in batched(rows, chunk_size):
+        results = projection.serialize(chunk)
+        if attach is not None:
+            attach(results, chunk)
+        yield results
+
+
+def ndjson_lines(batches):
+    """One JSON document per line; yields one bytes chunk per batch."""
+    renderer = FastJSONRenderer()
+    for results in batches:
+        yield b"".join(renderer.render(result) + b"\n" for result in results)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def csv_lines(batches, keys, attempt_keys=None):
+    """CSV with a header row; yields one bytes chunk per batch.
+
+    With attempt_keys, each attempt gets its own row (columns `attempts.<key>`)
+    repeating its delivery's columns, and deliveries without attempts get one
+    row with the attempt columns empty.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value.encode()
+
+    writer.writerow([*keys, *(f"attempts.{key}" for key in attempt_keys or [])])
+    yield flush()
+
+    empty_attempt = dict.fromkeys(attempt_keys or [])
+    for results in batches:
+        for result in results:
+            row = [_csv_value(result[key]) for key in keys]
+            if attempt_keys is None:
+                writer.writerow(row)
+                continue
+            for attempt in result["attempts"] or [empty_attempt]:
+                writer.writerow(row + [_csv_value(attempt[key]) for key in attempt_keys])
+        yield flush()
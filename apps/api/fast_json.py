@@ -0,0 +1,83 @@
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# UUIDs are serialized natively by orjson exactly as DRF does (str(uuid)).
+# Datetimes, dates and times are passed through to DRF's encoder, which
+# truncates to milliseconds and writes UTC as "Z", as do Decimals and lazy
+# strings. Serializers already emit formatted strings, so the callback is rare.
+DUMPS_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+_default = encoders.JSONEncoder().default
+
+# orjson reads integers beyond 64 bits as floats, losing precision. Any integer
+# that large has at least 20 digits, so bodies with a run of 20 digits go to the
+# stock parser. Mapping digits to "0" and searching is much faster than a regex.
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_LONG_DIGIT_RUN = b"0" * 20
+
+
+def _has_long_digit_run(body):
+    return _LONG_DIGIT_RUN in body.translate(_DIGITS_TO_ZERO)
+
+
+def available():
+    """Return True if the fast codec is installed and in use."""
+    return orjson is not None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when installed.
+
+    Produces the same bytes as the stock renderer for compact output, except
+    that small floats in exponent form drop the zero padding (1e-7, not 1e-07)
+    and NaN or infinity become null instead of raising. Falls back to the stock
+    renderer when orjson is absent, when an indent is requested, or for values
+    orjson rejects such as integers beyond 64 bits or non-string keys.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=DUMPS_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, which is valid JSON but not valid JavaScript otherwise.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that decodes with orjson when installed.
+
+    Input orjson rejects or reads differently (malformed JSON, integers beyond
+    64 bits, non-UTF-8 charsets) is handed to the stock parser, so accepted
+    documents, parsed values and error messages are unchanged.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        body = stream.read()
+        if encoding.lower().replace("-", "") == "utf8" and not _has_long_digit_run(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+
+        return super().parse(io.BytesIO(body), media_type, parser_context)
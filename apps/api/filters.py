@@ -0,0 +1,49 @@
+import json
+
+from django.db.models import Q
+
+PAYLOAD_PARAM_PREFIX = "payload."
+
+
+def _nest(path, value):
+    for key in reversed(path):
+        value = {key: value}
+    return value
+
+
+def _literal(value):
+    """Return (True, parsed) if a query value is a JSON number, boolean or null."""
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return False, None
+    if isinstance(parsed, (str, list, dict)):
+        return False, None
+    return True, parsed
+
+
+def payload_filter(query_params, field="payload"):
+    """Q for `payload.<key>[.<key>...]=<value>` query parameters as JSONB containment.
+
+    Each parameter becomes `field @> {"key": value}`, which the events payload GIN
+    index answers directly. Values match as strings, and also as numbers, booleans
+    or null when they parse as one. Raises ValueError on an empty key path or a
+    NUL character, which JSONB cannot represent.
+    """
+    query = Q()
+    for param, values in query_params.lists():
+        if not param.startswith(PAYLOAD_PARAM_PREFIX):
+            continue
+        path = param[len(PAYLOAD_PARAM_PREFIX):].split(".")
+        if not all(path) or "\x00" in param:
+            raise ValueError(f"Invalid payload filter: {param}")
+
+        for value in values:
+            if "\x00" in value:
+                raise ValueError(f"Invalid payload filter value for {param}")
+            match = Q(**{f"{field}__contains": _nest(path, value)})
+            is_literal, parsed = _literal(value)
+            if is_literal:
+                match |= Q(**{f"{field}__contains": _nest(path, parsed)})
+            query &= match
+    return query
@@ -0,0 +1,104 @@
+import io
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.api import fast_json
+from apps.api.fast_json import FastJSONParser, FastJSONRenderer
+
+
+def _delivery_page(size):
+    # Shaped like serializer output: IDs and datetimes are already strings.
+    now = timezone.now().isoformat()
+    return {
+        "results": [
+            {
+                "id": f"del_{uuid.uuid4()}",
+                "event_id": f"evt_{uuid.uuid4()}",
+                "endpoint_id": f"ep_{uuid.uuid4()}",
+                "endpoint_name": "billing-service",
+                "event_type": "order.completed",
+                "status": "FAILED",
+                "attempts_count": 3,
+                "created_at": now,
+                "attempts": [
+                    {
+                        "id": f"att_{uuid.uuid4()}",
+                        "attempt_number": n,
+                        "started_at": now,
+                        "http_status": 503,
+                        "response_headers_json": {f"x-header-{h}": "value" * 4 for h in range(20)},
+                        "response_body_snippet": '{"error": "Service Unavailable"}' * 8,
+                    }
+                    for n in range(1, 4)
+                ],
+            }
+            for _ in range(size)
+        ],
+        "has_more": True,
+        "next_cursor": "WyIyMDI0LTAxLTAxVDAwOjAwOjAwKzAwOjAwIiwiLi4uIl0",
+    }
+
+
+def _event_body(items):
+    payload = {
+        "order_id": "ord_123",
+        "items": [
+            {"sku": f"sku_{n}", "name": "Widget ü", "quantity": n, "price": n * 1.25, "tags": ["a", "b", "c"]}
+            for n in range(items)
+        ],
+    }
+    return JSONRenderer().render({"type": "order.created", "payload": payload, "endpoint_ids": []})
+
+
+class Command(BaseCommand):
+    help = "Compare DRF's JSON parser and renderer with the fast codec"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200, help="Documents per measurement")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        codec = "orjson" if fast_json.available() else "not installed, falls back to stock"
+        self.stdout.write(f"fast codec: {codec}")
+        self.stdout.write(f"{'case':>22} {'stock MB/s':>12} {'fast MB/s':>12} {'speedup':>9}")
+
+        for size in [20, 100]:
+            page = _delivery_page(size)
+            self._compare(
+                f"render {size} deliveries",
+                lambda: JSONRenderer().render(page),
+                lambda: FastJSONRenderer().render(page),
+                len(JSONRenderer().render(page)),
+                iterations,
+            )
+
+        for items in [100, 2000]:
+            body = _event_body(items)
+            self._compare(
+                f"parse {len(body) // 1024}KB event",
+                lambda: JSONParser().parse(io.BytesIO(body)),
+                lambda: FastJSONParser().parse(io.BytesIO(body)),
+                len(body),
+                iterations,
+            )
+
+    def _compare(self, case, stock, fast, size_bytes, iterations):
+        stock_seconds = self._time(stock, iterations)
+        fast_seconds = self._time(fast, iterations)
+        stock_rate = size_bytes * iterations / stock_seconds / 1e6
+        fast_rate = size_bytes * iterations / fast_seconds / 1e6
+        self.stdout.write(
+            f"{case:>22} {stock_rate:>12.1f} {fast_rate:>12.1f} {stock_seconds / fast_seconds:>8.1f}x"
+        )
+
+    def _time(self, fn, iterations):
+        fn()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        return time.perf_counter() - start
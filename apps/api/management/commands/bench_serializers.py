@@ -0,0 +1,85 @@
+import hashlib
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.api.serializers.deliveries import DELIVERY_PROJECTION, DeliverySerializer
+from apps.deliveries.models import Delivery
+from apps.endpoints.models import Endpoint
+from apps.events.models import Event
+from apps.tenants.models import Tenant
+
+PAGE_SIZES = [20, 100]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare DeliverySerializer with the values() projection on delivery list pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200, help="Pages serialized per measurement")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options["iterations"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _run(self, iterations):
+        tenant = Tenant.objects.create(name="bench-serializers")
+        endpoint = Endpoint.objects.create(tenant=tenant, name="bench-endpoint", url="https://example.com/hook")
+        payload_json = json.dumps({"order_id": "ord_123"})
+        event = Event.objects.create(
+            tenant=tenant,
+            type="order.created",
+            payload_json=payload_json,
+            payload_hash=hashlib.sha256(payload_json.encode()).hexdigest(),
+        )
+        now = timezone.now()
+        for _ in range(max(PAGE_SIZES)):
+            Delivery.objects.create(
+                tenant=tenant, event=event, endpoint=endpoint,
+                status=Delivery.Status.DELIVERED, attempts_count=1,
+                first_scheduled_at=now, last_attempt_at=now, terminal_at=now,
+            )
+
+        base = Delivery.objects.filter(tenant=tenant).order_by("-created_at", "-id")
+        self.stdout.write(f"{'page':>6} {'path':>12} {'serialize ms':>14} {'query+serialize ms':>20}")
+        for size in PAGE_SIZES:
+            instances = list(base.select_related("endpoint", "event")[:size])
+            rows = list(base.values(*DELIVERY_PROJECTION.sources)[:size])
+
+            results = {
+                "serializer": (
+                    self._time(lambda: DeliverySerializer(instances, many=True).data, iterations),
+                    self._time(lambda: DeliverySerializer(
+                        list(base.select_related("endpoint", "event")[:size]), many=True,
+                    ).data, iterations),
+                ),
+                "projection": (
+                    self._time(lambda: DELIVERY_PROJECTION.serialize(rows), iterations),
+                    self._time(lambda: DELIVERY_PROJECTION.serialize(
+                        list(base.values(*DELIVERY_PROJECTION.sources)[:size]),
+                    ), iterations),
+                ),
+            }
+            for path, (serialize_ms, total_ms) in results.items():
+                self.stdout.write(f"{size:>6} {path:>12} {serialize_ms:>14.3f} {total_ms:>20.3f}")
+
+            speedup = results["serializer"][0] / results["projection"][0]
+            self.stdout.write(self.style.SUCCESS(f"{size:>6} {'speedup':>12} {speedup:>13.1f}x"))
+
+    def _time(self, fn, iterations):
+        fn()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        return (time.perf_counter() - start) * 1000 / iterations
@@ -0,0 +1,15 @@
+from rest_framework.negotiation import BaseContentNegotiation
+
+
+class JSONErrorNegotiation(BaseContentNegotiation):
+    """Always pick the first renderer, for views that stream their own non-JSON responses.
+
+    Errors from such views are still rendered as JSON, whatever the Accept header
+    or `format` parameter asks for.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
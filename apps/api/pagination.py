@@ -0,0 +1,45 @@
+import base64
+import binascii
+import json
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(timestamp, pk):
+    """Encode a (timestamp, id) keyset position as an opaque URL-safe cursor."""
+    raw = json.dumps([timestamp.isoformat(), str(pk)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor from encode_cursor into (timestamp, id); raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, pk = json.loads(raw)
+        parsed = parse_datetime(timestamp)
+        uuid.UUID(pk)
+    except (binascii.Error, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if parsed is None:
+        raise ValueError("Invalid cursor")
+    return parsed, pk
+
+
+def keyset_before(field, timestamp, pk):
+    """Q for rows after (timestamp, pk) when ordered by (field, id) descending.
+
+    The redundant `field <= timestamp` bound lets the planner start the index
+    scan at the cursor instead of filtering from the top.
+    """
+    return Q(**{f"{field}__lte": timestamp}) & (
+        Q(**{f"{field}__lt": timestamp}) | Q(**{field: timestamp, "id__lt": pk})
+    )
+
+
+def keyset_after(field, timestamp, pk):
+    """Q for rows after (timestamp, pk) when ordered by (field, id) ascending; see keyset_before."""
+    return Q(**{f"{field}__gte": timestamp}) & (
+        Q(**{f"{field}__gt": timestamp}) | Q(**{field: timestamp, "id__gt": pk})
+    )
@@ -0,0 +1,47 @@
+from django.utils import timezone
+
+
+def prefixed(prefix):
+    """Formatter that renders a raw UUID as a prefixed ID, like PrefixedIDField."""
+    return lambda value, tz: f"{prefix}{value}"
+
+
+def iso_datetime(value, tz):
+    """Format a datetime like DRF's DateTimeField: ISO 8601 in the current timezone, UTC as "Z"."""
+    if value.tzinfo is not tz:
+        value = value.astimezone(tz)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class Projection:
+    """Serializes rows from `queryset.values(*projection.sources)` into response dicts.
+
+    `fields` maps each output key, in output order, to a (source, formatter)
+    pair. The output matches the equivalent DRF serializer without per-row field
+    binding or attribute lookups. Formatters are called as formatter(value, tz),
+    with the current timezone resolved once per call, and only on non-null values
+    as DRF does; the formatter None passes the value through unchanged.
+    """
+
+    def __init__(self, fields):
+        self.fields = [(key, source, formatter) for key, (source, formatter) in fields.items()]
+        self.sources = list(dict.fromkeys(source for _, source, _ in self.fields))
+        self.keys = [key for key, _, _ in self.fields]
+
+    def only(self, keys):
+        """Return a projection limited to the given output keys, keeping this projection's order."""
+        return Projection({key: (source, formatter) for key, source, formatter in self.fields if key in keys})
+
+    def serialize(self, rows):
+        fields = self.fields
+        tz = timezone.get_current_timezone()
+        return [
+            {
+                key: row[source] if formatter is None or row[source] is None else formatter(row[source], tz)
+                for key, source, formatter in fields
+            }
+            for row in rows
+        ]
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from apps.api.prefixed_ids import PrefixedIDField
+from apps.api.projection import Projection, iso_datetime, prefixed
 from apps.attempts.models import Attempt
 from apps.deliveries.models import Delivery
 
@@ -60,3 +61,40 @@ class DeliveryDetailSerializer(DeliverySerializer):
 
     class Meta(DeliverySerializer.Meta):
         fields = DeliverySerializer.Meta.fields + ["attempts"]
+
+
+# Fast paths for the list endpoints, producing the same output as
+# DeliverySerializer and AttemptSerializer from a values() projection.
+DELIVERY_PROJECTION = Projection({
+    "id": ("id", prefixed("del_")),
+    "event_id": ("event_id", prefixed("evt_")),
+    "endpoint_id": ("endpoint_id", prefixed("ep_")),
+    "endpoint_name": ("endpoint__name", None),
+    "event_type": ("event__type", None),
+    "mode": ("mode", None),
+    "status": ("status", None),
+    "attempts_count": ("attempts_count", None),
+    "next_attempt_at": ("next_attempt_at", iso_datetime),
+    "first_scheduled_at": ("first_scheduled_at", iso_datetime),
+    "last_attempt_at": ("last_attempt_at", iso_datetime),
+    "terminal_at": ("terminal_at", iso_datetime),
+    "terminal_reason": ("terminal_reason", None),
+    "cancel_requested": ("cancel_requested", None),
+    "created_at": ("created_at", iso_datetime),
+    "updated_at": ("updated_at", iso_datetime),
+})
+
+ATTEMPT_PROJECTION = Projection({
+    "id": ("id", prefixed("att_")),
+    "attempt_number": ("attempt_number", None),
+    "started_at": ("started_at", iso_datetime),
+    "ended_at": ("ended_at", iso_datetime),
+    "latency_ms": ("latency_ms", None),
+    "outcome": ("outcome", None),
+    "classification": ("classification", None),
+    "http_status": ("http_status", None),
+    "response_headers_json": ("response_headers_json", None),
+    "response_body_snippet": ("response_body_snippet", None),
+    "error_detail": ("error_detail", None),
+    "created_at": ("created_at", iso_datetime),
+})
@@ -1,7 +1,9 @@
+from django.db import transaction
 from rest_framework import serializers
 
 from apps.api.prefixed_ids import PrefixedIDField
 from apps.endpoints.models import Endpoint
+from workers.endpoint_names import propagate_endpoint_name
 
 
 class EndpointSerializer(serializers.ModelSerializer):
@@ -67,6 +69,11 @@ class EndpointUpdateSerializer(serializers.ModelSerializer):
         if secret is not None:
             instance.secret_encrypted = secret.encode() if secret else None
 
+        if "name" in validated_data and validated_data["name"] != instance.name:
+            # The deliveries' search copy is rewritten in batches after the rename commits.
+            endpoint_id = str(instance.id)
+            transaction.on_commit(lambda: propagate_endpoint_name.delay(endpoint_id))
+
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
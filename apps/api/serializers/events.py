@@ -10,6 +10,7 @@ from apps.api.prefixed_ids import PrefixedIDField
 from apps.deliveries.models import Delivery
 from apps.endpoints.models import Endpoint
 from apps.events.models import Event
+from workers import tenant_backlog
 from workers.metrics import deliveries_created_total
 
 
@@ -50,6 +51,7 @@ class EventCreateSerializer(serializers.Serializer):
             tenant=tenant,
             type=validated_data["type"],
             payload_json=payload_str,
+            payload=payload,
             payload_hash=payload_hash,
         )
 
@@ -107,6 +109,7 @@ class EventCreateSerializer(serializers.Serializer):
 
             deliveries.append({"delivery": delivery, "created": created})
 
+        tenant_backlog.add(tenant.id, sum(1 for d in deliveries if d["created"]))
         return {"event": event, "deliveries": deliveries}
 
 
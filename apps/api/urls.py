@@ -6,19 +6,29 @@ from apps.api.views.analytics import (
     LatencyDistributionView,
     SuccessRateView,
 )
-from apps.api.views.deliveries import DeliveryListView, DeliveryDetailView, DeliveryCancelView
+from apps.api.views.deliveries import (
+    DeliveryCancelView,
+    DeliveryChangesView,
+    DeliveryDetailView,
+    DeliveryExportView,
+    DeliveryListView,
+)
 from apps.api.views.endpoints import EndpointListCreateView, EndpointDetailView
-from apps.api.views.events import EventCreateView
+from apps.api.views.events import EventListCreateView
 from apps.api.views.kill_switch import KillSwitchView
 from apps.api.views.oauth import OAuthProvisionView, RevokeSessionView
 from apps.api.views.replays import ReplayCreateView
+from apps.api.views.stream import DeliveryStreamView
 from apps.api.views.tenant import TenantInfoView
 
 urlpatterns = [
     path("endpoints", EndpointListCreateView.as_view(), name="endpoint-list"),
     path("endpoints/<str:endpoint_id>", EndpointDetailView.as_view(), name="endpoint-detail"),
-    path("events", EventCreateView.as_view(), name="event-create"),
+    path("events", EventListCreateView.as_view(), name="event-list"),
     path("deliveries", DeliveryListView.as_view(), name="delivery-list"),
+    path("deliveries/changes", DeliveryChangesView.as_view(), name="delivery-changes"),
+    path("deliveries/export", DeliveryExportView.as_view(), name="delivery-export"),
+    path("deliveries/stream", DeliveryStreamView.as_view(), name="delivery-stream"),
     path("deliveries/<str:delivery_id>", DeliveryDetailView.as_view(), name="delivery-detail"),
     path("deliveries/<str:delivery_id>/cancel", DeliveryCancelView.as_view(), name="delivery-cancel"),
     path("replays", ReplayCreateView.as_view(), name="replay-create"),
@@ -1,3 +1,4 @@
+import time
 from datetime import timedelta
 
 from django.db.models import Count, Avg, Q
@@ -7,16 +8,33 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.api.authentication import APIKeyAuthentication, IsAPIKeyAuthenticated
+from apps.api.conditional import conditional, make_etag
 from apps.api.prefixed_ids import to_prefixed
 from apps.attempts.models import Attempt
 from apps.deliveries.models import Delivery
 from apps.endpoints.models import Endpoint
+from workers import versions
+
+
+def analytics_etag(request):
+    """Tenant's delivery and endpoint versions within the current minute.
+
+    Windows are relative to now, so results also change as time passes with no
+    writes; the minute bucket bounds how long a cached response is reused.
+    """
+    tenant_versions = versions.current(request.user.id, versions.DELIVERIES, versions.ENDPOINTS)
+    if tenant_versions is None:
+        return None
+    return make_etag(
+        request.path, request.user.id, *tenant_versions, request.META.get("QUERY_STRING", ""), int(time.time() // 60)
+    )
 
 
 class DeliveryVolumeView(APIView):
     authentication_classes = [APIKeyAuthentication]
     permission_classes = [IsAPIKeyAuthenticated]
 
+    @conditional(analytics_etag)
     def get(self, request):
         hours = min(int(request.query_params.get("hours", 24)), 168)
         since = timezone.now() - timedelta(hours=hours)
@@ -50,6 +68,7 @@ class SuccessRateView(APIView):
     authentication_classes = [APIKeyAuthentication]
     permission_classes = [IsAPIKeyAuthenticated]
 
+    @conditional(analytics_etag)
     def get(self, request):
         hours = min(int(request.query_params.get("hours", 24)), 168)
         since = timezone.now() - timedelta(hours=hours)
@@ -85,6 +104,7 @@ class LatencyDistributionView(APIView):
     authentication_classes = [APIKeyAuthentication]
     permission_classes = [IsAPIKeyAuthenticated]
 
+    @conditional(analytics_etag)
     def get(self, request):
         since = timezone.now() - timedelta(hours=24)
 
@@ -119,6 +139,7 @@ class EndpointHealthView(APIView):
     authentication_classes = [APIKeyAuthentication]
     permission_classes = [IsAPIKeyAuthenticated]
 
+    @conditional(analytics_etag)
     def get(self, request):
         since = timezone.now() - timedelta(hours=24)
         endpoints = Endpoint.objects.filter(tenant=request.user)
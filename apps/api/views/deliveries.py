@@ -1,92 +1,344 @@
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import partial
 
-from django.db.models import Q
+from django.conf import settings
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.db.models import F, Q, TextField
+from django.db.models.functions import Cast, Upper
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.api.authentication import APIKeyAuthentication, IsAPIKeyAuthenticated
+from apps.api.conditional import conditional, make_etag
+from apps.api.exports import EXPORT_FORMATS, csv_lines, ndjson_lines, projected_batches
+from apps.api.filters import payload_filter
+from apps.api.negotiation import JSONErrorNegotiation
+from apps.api.pagination import decode_cursor, encode_cursor, keyset_after, keyset_before
 from apps.api.prefixed_ids import from_prefixed, to_prefixed
-from apps.api.serializers.deliveries import DeliverySerializer, DeliveryDetailSerializer
+from apps.api.serializers.deliveries import ATTEMPT_PROJECTION, DELIVERY_PROJECTION
+from apps.attempts.models import Attempt
 from apps.deliveries.models import Delivery
 from apps.deliveries.state_machine import DeliveryStateMachine
+from workers import versions
 
 PAGE_SIZE = 20
 
 
+def search_filter(search):
+    """Match event type or endpoint name by substring (including prefix) or fuzzy word similarity.
+
+    Both forms are served by the per-tenant trigram indexes on the denormalized columns.
+    """
+    query = Q()
+    for field in ["event_type", "endpoint_name"]:
+        query |= Q(**{f"{field}__icontains": search})
+        query |= Q(TrigramWordSimilar(Upper(Cast(field, TextField())), search.upper()))
+    return query
+
+
+def _parse_timestamp(value, name):
+    """Parse an ISO 8601 query parameter; no timezone means UTC. Raises ValueError naming the parameter."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"Invalid {name}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+def filter_deliveries(queryset, query_params):
+    """Apply the delivery list filters shared by the list and export endpoints.
+
+    Raises ValueError for an invalid timestamp or payload filter.
+    """
+    delivery_status = query_params.get("status")
+    if delivery_status:
+        queryset = queryset.filter(status=delivery_status)
+
+    endpoint_id = query_params.get("endpoint_id")
+    if endpoint_id:
+        queryset = queryset.filter(endpoint_id=from_prefixed(endpoint_id, "ep_"))
+
+    event_id = query_params.get("event_id")
+    if event_id:
+        queryset = queryset.filter(event_id=from_prefixed(event_id, "evt_"))
+
+    search = query_params.get("search")
+    if search:
+        queryset = queryset.filter(search_filter(search))
+
+    created_after = query_params.get("created_after")
+    if created_after:
+        queryset = queryset.filter(created_at__gte=_parse_timestamp(created_after, "created_after"))
+
+    created_before = query_params.get("created_before")
+    if created_before:
+        queryset = queryset.filter(created_at__lt=_parse_timestamp(created_before, "created_before"))
+
+    payload = payload_filter(query_params, field="event__payload")
+    if payload:
+        # An event has its deliveries' tenant; saying so lets the join use the
+        # tenant-prefixed payload index.
+        queryset = queryset.filter(payload, event__tenant_id=F("tenant_id"))
+    return queryset
+
+
+def _split(value):
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def delivery_fieldset(query_params, expand_by_default=False):
+    """Resolve `fields` and `expand` into (delivery projection, attempt projection or None).
+
+    `fields` lists delivery keys, plus `attempts` or `attempts.<key>` to embed
+    (a subset of) attempts; `expand=attempts` embeds all attempt fields. Only
+    the selected columns are queried. Raises ValueError naming unknown fields.
+    """
+    fields = _split(query_params.get("fields"))
+    expand = _split(query_params.get("expand"))
+
+    unknown = [name for name in expand if name != "attempts"]
+    if unknown:
+        raise ValueError(f"Unknown expansion: {', '.join(unknown)}")
+
+    delivery_keys = [name for name in fields if name != "attempts" and not name.startswith("attempts.")]
+    attempt_keys = [name[len("attempts."):] for name in fields if name.startswith("attempts.")]
+    unknown = [name for name in delivery_keys if name not in DELIVERY_PROJECTION.keys]
+    unknown += [f"attempts.{name}" for name in attempt_keys if name not in ATTEMPT_PROJECTION.keys]
+    if unknown:
+        raise ValueError(f"Unknown field: {', '.join(unknown)}")
+
+    delivery_projection = DELIVERY_PROJECTION.only(delivery_keys) if fields else DELIVERY_PROJECTION
+
+    if "fields" not in query_params and "expand" not in query_params:
+        with_attempts = expand_by_default
+    else:
+        with_attempts = "attempts" in expand or "attempts" in fields or bool(attempt_keys)
+    if not with_attempts:
+        return delivery_projection, None
+    return delivery_projection, ATTEMPT_PROJECTION.only(attempt_keys) if attempt_keys else ATTEMPT_PROJECTION
+
+
+def attach_attempts(results, rows, projection):
+    """Embed each delivery's attempts, fetching only the projected columns in one query."""
+    attempts = {}
+    queryset = Attempt.objects.filter(delivery_id__in=[row["id"] for row in rows]).order_by("attempt_number")
+    for attempt in queryset.values(*dict.fromkeys(["delivery_id", *projection.sources])):
+        attempts.setdefault(attempt["delivery_id"], []).append(attempt)
+    for result, row in zip(results, rows):
+        result["attempts"] = projection.serialize(attempts.get(row["id"], []))
+
+
+def _validation_error(message):
+    return Response(
+        {"error": {"code": "VALIDATION_ERROR", "message": message, "details": {}}},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+def list_etag(request):
+    """Tenant's delivery and endpoint versions, so any change to either invalidates every page."""
+    tenant_versions = versions.current(request.user.id, versions.DELIVERIES, versions.ENDPOINTS)
+    if tenant_versions is None:
+        return None
+    return make_etag("deliveries", request.user.id, *tenant_versions, request.META.get("QUERY_STRING", ""))
+
+
+def detail_etag(request, delivery_id):
+    """Delivery updated_at and the tenant's endpoint version.
+
+    Attempts are written in the same transaction as a save of their delivery,
+    so updated_at covers them too.
+    """
+    try:
+        raw_id = from_prefixed(delivery_id, "del_")
+    except ValueError:
+        return None
+    updated_at = Delivery.objects.filter(id=raw_id, tenant=request.user).values_list("updated_at", flat=True).first()
+    tenant_versions = versions.current(request.user.id, versions.ENDPOINTS)
+    if updated_at is None or tenant_versions is None:
+        return None
+    return make_etag("delivery", raw_id, updated_at, *tenant_versions, request.META.get("QUERY_STRING", ""))
+
+
 class DeliveryListView(APIView):
     authentication_classes = [APIKeyAuthentication]
     permission_classes = [IsAPIKeyAuthenticated]
 
+    @conditional(list_etag)
     def get(self, request):
-        queryset = Delivery.objects.filter(tenant=request.user).select_related("endpoint", "event")
-
-        delivery_status = request.query_params.get("status")
-        if delivery_status:
-            queryset = queryset.filter(status=delivery_status)
-
-        endpoint_id = request.query_params.get("endpoint_id")
-        if endpoint_id:
-            queryset = queryset.filter(endpoint_id=from_prefixed(endpoint_id, "ep_"))
-
-        event_id = request.query_params.get("event_id")
-        if event_id:
-            queryset = queryset.filter(event_id=from_prefixed(event_id, "evt_"))
+        try:
+            delivery_projection, attempt_projection = delivery_fieldset(request.query_params)
+        except ValueError as e:
+            return _validation_error(str(e))
 
-        search = request.query_params.get("search")
-        if search:
-            queryset = queryset.filter(
-                Q(event__type__icontains=search) | Q(endpoint__name__icontains=search)
-            )
+        try:
+            queryset = filter_deliveries(Delivery.objects.filter(tenant=request.user), request.query_params)
+        except ValueError as e:
+            return _validation_error(str(e))
 
         cursor = request.query_params.get("cursor")
         if cursor:
-            cursor_dt = parse_datetime(cursor)
-            if cursor_dt:
-                queryset = queryset.filter(created_at__lt=cursor_dt)
+            try:
+                cursor_created_at, cursor_id = decode_cursor(cursor)
+            except ValueError:
+                return _validation_error("Invalid cursor")
+            queryset = queryset.filter(keyset_before("created_at", cursor_created_at, cursor_id))
 
         limit = min(int(request.query_params.get("limit", PAGE_SIZE)), 100)
-        queryset = queryset.order_by("-created_at")[: limit + 1]
-        results = list(queryset)
+        # id and created_at are always read for the cursor, even when not requested.
+        sources = dict.fromkeys([*delivery_projection.sources, "id", "created_at"])
+        queryset = queryset.order_by("-created_at", "-id").values(*sources)[: limit + 1]
+        rows = list(queryset)
 
-        has_more = len(results) > limit
+        has_more = len(rows) > limit
         if has_more:
-            results = results[:limit]
+            rows = rows[:limit]
 
-        serializer = DeliverySerializer(results, many=True)
+        results = delivery_projection.serialize(rows)
+        if attempt_projection is not None:
+            attach_attempts(results, rows, attempt_projection)
 
         response_data = {
-            "results": serializer.data,
+            "results": results,
             "has_more": has_more,
-            "next_cursor": results[-1].created_at.isoformat() if has_more and results else None,
+            "next_cursor": encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if has_more and rows else None,
         }
 
         return Response(response_data)
 
 
-class DeliveryDetailView(APIView):
+class DeliveryChangesView(APIView):
+    """Deliveries in the order they last changed, for incremental sync.
+
+    `next_cursor` is always returned and does not expire; pass it back as
+    `cursor` to get only what changed since. Changes are listed once they are
+    DELIVERY_CHANGES_SETTLE_SECONDS old, so a transaction that commits after a
+    later one cannot land behind a cursor that has already moved past it.
+    """
+
     authentication_classes = [APIKeyAuthentication]
     permission_classes = [IsAPIKeyAuthenticated]
 
-    def get_object(self, request, delivery_id):
+    def get(self, request):
         try:
-            raw_id = from_prefixed(delivery_id, "del_")
-            return Delivery.objects.select_related("endpoint", "event").prefetch_related(
-                "attempts"
-            ).get(id=raw_id, tenant=request.user)
-        except Delivery.DoesNotExist:
-            return None
+            delivery_projection, attempt_projection = delivery_fieldset(request.query_params)
+        except ValueError as e:
+            return _validation_error(str(e))
+
+        horizon = timezone.now() - timedelta(seconds=settings.DELIVERY_CHANGES_SETTLE_SECONDS)
+        queryset = Delivery.objects.filter(tenant=request.user, updated_at__lt=horizon)
+
+        position = None
+        cursor = request.query_params.get("cursor")
+        updated_since = request.query_params.get("updated_since")
+        if cursor:
+            try:
+                position = decode_cursor(cursor)
+            except ValueError:
+                return _validation_error("Invalid cursor")
+        elif updated_since:
+            try:
+                since = _parse_timestamp(updated_since, "updated_since")
+            except ValueError as e:
+                return _validation_error(str(e))
+            # The nil UUID sorts first, so changes at exactly `since` are included.
+            position = (since, uuid.UUID(int=0))
+        if position is not None:
+            queryset = queryset.filter(keyset_after("updated_at", *position))
+
+        limit = min(int(request.query_params.get("limit", PAGE_SIZE)), 100)
+        sources = dict.fromkeys([*delivery_projection.sources, "id", "updated_at"])
+        rows = list(queryset.order_by("updated_at", "id").values(*sources)[: limit + 1])
+
+        has_more = len(rows) > limit
+        if has_more:
+            rows = rows[:limit]
+
+        if rows:
+            next_cursor = encode_cursor(rows[-1]["updated_at"], rows[-1]["id"])
+        else:
+            # Nothing new: keep the caller's position, or start from the horizon.
+            next_cursor = encode_cursor(*(position or (horizon, uuid.UUID(int=0))))
+
+        results = delivery_projection.serialize(rows)
+        if attempt_projection is not None:
+            attach_attempts(results, rows, attempt_projection)
+
+        return Response({"results": results, "has_more": has_more, "next_cursor": next_cursor})
+
+
+class DeliveryExportView(APIView):
+    """Stream every delivery matching the list filters as NDJSON (default) or CSV.
+
+    Rows are read through a server-side cursor EXPORT_CHUNK_SIZE at a time, and
+    attempts (`expand=attempts`) are fetched per chunk, so memory use does not
+    grow with the size of the export.
+    """
 
+    authentication_classes = [APIKeyAuthentication]
+    permission_classes = [IsAPIKeyAuthenticated]
+    # `format` picks the export format rather than a renderer; errors are still JSON.
+    content_negotiation_class = JSONErrorNegotiation
+
+    def get(self, request):
+        export_format = request.query_params.get("format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return _validation_error(f"Unknown format: {export_format}")
+
+        try:
+            delivery_projection, attempt_projection = delivery_fieldset(request.query_params)
+            queryset = filter_deliveries(Delivery.objects.filter(tenant=request.user), request.query_params)
+        except ValueError as e:
+            return _validation_error(str(e))
+
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+        sources = dict.fromkeys([*delivery_projection.sources, "id"])
+        rows = queryset.order_by("-created_at", "-id").values(*sources).iterator(chunk_size=chunk_size)
+        attach = partial(attach_attempts, projection=attempt_projection) if attempt_projection is not None else None
+        batches = projected_batches(rows, chunk_size, delivery_projection, attach)
+
+        if export_format == "csv":
+            attempt_keys = attempt_projection.keys if attempt_projection is not None else None
+            content = csv_lines(batches, delivery_projection.keys, attempt_keys)
+        else:
+            content = ndjson_lines(batches)
+
+        response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[export_format])
+        response["Content-Disposition"] = f'attachment; filename="deliveries.{export_format}"'
+        return response
+
+
+class DeliveryDetailView(APIView):
+    authentication_classes = [APIKeyAuthentication]
+    permission_classes = [IsAPIKeyAuthenticated]
+
+    def get_object(self, request, delivery_id, sources):
+        raw_id = from_prefixed(delivery_id, "del_")
+        return Delivery.objects.filter(id=raw_id, tenant=request.user).values(*sources).first()
+
+    @conditional(detail_etag)
     def get(self, request, delivery_id):
-        delivery = self.get_object(request, delivery_id)
-        if delivery is None:
+        try:
+            delivery_projection, attempt_projection = delivery_fieldset(request.query_params, expand_by_default=True)
+        except ValueError as e:
+            return _validation_error(str(e))
+
+        row = self.get_object(request, delivery_id, dict.fromkeys([*delivery_projection.sources, "id"]))
+        if row is None:
             return Response(
                 {"error": {"code": "NOT_FOUND", "message": "Delivery not found", "details": {}}},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        serializer = DeliveryDetailSerializer(delivery)
-        return Response(serializer.data)
+        data = delivery_projection.serialize([row])[0]
+        if attempt_projection is not None:
+            attach_attempts([data], [row], attempt_projection)
+        return Response(data)
 
 
 class DeliveryCancelView(APIView):
@@ -3,15 +3,25 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.api.authentication import APIKeyAuthentication, IsAPIKeyAuthenticated
+from apps.api.conditional import conditional, make_etag
 from apps.api.prefixed_ids import from_prefixed
 from apps.api.serializers.endpoints import EndpointSerializer, EndpointCreateSerializer, EndpointUpdateSerializer
 from apps.endpoints.models import Endpoint
+from workers import versions
+
+
+def list_etag(request):
+    tenant_versions = versions.current(request.user.id, versions.ENDPOINTS)
+    if tenant_versions is None:
+        return None
+    return make_etag("endpoints", request.user.id, *tenant_versions)
 
 
 class EndpointListCreateView(APIView):
     authentication_classes = [APIKeyAuthentication]
     permission_classes = [IsAPIKeyAuthenticated]
 
+    @conditional(list_etag)
     def get(self, request):
         endpoints = Endpoint.objects.filter(tenant=request.user)
         serializer = EndpointSerializer(endpoints, many=True)
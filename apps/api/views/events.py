@@ -4,13 +4,65 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.api.authentication import APIKeyAuthentication, IsAPIKeyAuthenticated
+from apps.api.filters import payload_filter
+from apps.api.pagination import decode_cursor, encode_cursor, keyset_before
+from apps.api.throttling import IngestThrottle
 from apps.api.prefixed_ids import to_prefixed
-from apps.api.serializers.events import EventCreateSerializer
+from apps.api.serializers.events import EventCreateSerializer, EventSerializer
+from apps.events.models import Event
 
+PAGE_SIZE = 20
 
-class EventCreateView(APIView):
+
+class EventListCreateView(APIView):
     authentication_classes = [APIKeyAuthentication]
     permission_classes = [IsAPIKeyAuthenticated]
+    throttle_classes = [IngestThrottle]
+
+    def get_throttles(self):
+        # Only ingest is rate-limited; listing is a plain read.
+        if self.request.method != "POST":
+            return []
+        return super().get_throttles()
+
+    def get(self, request):
+        queryset = Event.objects.filter(tenant=request.user)
+
+        event_type = request.query_params.get("type")
+        if event_type:
+            queryset = queryset.filter(type=event_type)
+
+        try:
+            queryset = queryset.filter(payload_filter(request.query_params))
+        except ValueError as e:
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "message": str(e), "details": {}}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            try:
+                cursor_created_at, cursor_id = decode_cursor(cursor)
+            except ValueError:
+                return Response(
+                    {"error": {"code": "VALIDATION_ERROR", "message": "Invalid cursor", "details": {}}},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            queryset = queryset.filter(keyset_before("created_at", cursor_created_at, cursor_id))
+
+        limit = min(int(request.query_params.get("limit", PAGE_SIZE)), 100)
+        results = list(queryset.order_by("-created_at", "-id")[: limit + 1])
+
+        has_more = len(results) > limit
+        if has_more:
+            results = results[:limit]
+
+        return Response({
+            "results": EventSerializer(results, many=True).data,
+            "has_more": has_more,
+            "next_cursor": encode_cursor(results[-1].created_at, results[-1].id) if has_more and results else None,
+        })
 
     def post(self, request):
         serializer = EventCreateSerializer(data=request.data, context={"request": request})
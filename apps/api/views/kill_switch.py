@@ -1,21 +1,78 @@
+from django.conf import settings
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.api.authentication import APIKeyAuthentication, IsAPIKeyAuthenticated
-from workers.kill_switch import activate, deactivate, is_active
+from apps.api.prefixed_ids import from_prefixed, to_prefixed
+from apps.endpoints.models import Endpoint
+from workers import kill_switch
 
 
 class KillSwitchView(APIView):
+    """Pause delivery for the authenticated tenant, one of its endpoints, or globally.
+
+    Tenant keys may only toggle their own tenant and endpoint scopes. The global
+    switch additionally requires the X-Internal-Secret header.
+    """
+
     authentication_classes = [APIKeyAuthentication]
     permission_classes = [IsAPIKeyAuthenticated]
 
     def get(self, request):
-        return Response({"active": is_active()})
+        tenant = request.user
+        paused_tenants, paused_endpoints = kill_switch.paused_scopes()
+        endpoint_ids = Endpoint.objects.filter(
+            tenant=tenant, id__in=sorted(paused_endpoints),
+        ).values_list("id", flat=True) if paused_endpoints else []
+
+        return Response({
+            "active": str(tenant.id) in paused_tenants,
+            "global": kill_switch.is_active(),
+            "endpoints": sorted(to_prefixed("ep_", endpoint_id) for endpoint_id in endpoint_ids),
+        })
 
     def post(self, request):
         active = request.data.get("active")
-        if active is True:
-            activate()
-        elif active is False:
-            deactivate()
-        return Response({"active": is_active()})
+        scope = request.data.get("scope", kill_switch.TENANT)
+        tenant = request.user
+
+        if not isinstance(active, bool):
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "message": "active must be a boolean", "details": {}}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if scope == kill_switch.GLOBAL:
+            internal_secret = request.headers.get("X-Internal-Secret")
+            if not settings.INTERNAL_API_SECRET or internal_secret != settings.INTERNAL_API_SECRET:
+                return Response(
+                    {"error": {"code": "FORBIDDEN", "message": "Invalid internal secret", "details": {}}},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+            scope_kwargs = {}
+        elif scope == kill_switch.TENANT:
+            scope_kwargs = {"tenant_id": tenant.id}
+        elif scope == kill_switch.ENDPOINT:
+            try:
+                endpoint = Endpoint.objects.get(
+                    id=from_prefixed(request.data.get("endpoint_id", ""), "ep_"), tenant=tenant,
+                )
+            except (ValueError, Endpoint.DoesNotExist):
+                return Response(
+                    {"error": {"code": "NOT_FOUND", "message": "Endpoint not found", "details": {}}},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            scope_kwargs = {"endpoint_id": endpoint.id}
+        else:
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "message": "scope must be one of global, tenant, endpoint", "details": {}}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if active:
+            kill_switch.activate(**scope_kwargs)
+        else:
+            kill_switch.deactivate(**scope_kwargs)
+
+        return self.get(request)
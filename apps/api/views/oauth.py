@@ -61,9 +61,7 @@ class OAuthProvisionView(APIView):
                 user.tenant = tenant
                 user.save(update_fields=["tenant"])
 
-        APIKey.objects.filter(
-            tenant=tenant, name="oauth-dashboard", status=APIKey.Status.ACTIVE
-        ).update(status=APIKey.Status.REVOKED)
+        APIKey.objects.filter(tenant=tenant, name="oauth-dashboard").revoke()
 
         _, raw_key = APIKey.objects.create_key(tenant=tenant, name="oauth-dashboard")
 
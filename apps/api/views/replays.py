@@ -4,15 +4,18 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.api.authentication import APIKeyAuthentication, IsAPIKeyAuthenticated
+from apps.api.throttling import IngestThrottle
 from apps.api.prefixed_ids import to_prefixed
 from apps.api.serializers.replays import ReplayCreateSerializer
 from apps.deliveries.models import Delivery
 from apps.replays.models import DeliveryBatch, DeliveryBatchItem
+from workers import tenant_backlog
 
 
 class ReplayCreateView(APIView):
     authentication_classes = [APIKeyAuthentication]
     permission_classes = [IsAPIKeyAuthenticated]
+    throttle_classes = [IngestThrottle]
 
     def post(self, request):
         serializer = ReplayCreateSerializer(data=request.data)
@@ -68,6 +71,7 @@ class ReplayCreateView(APIView):
                     event=source.event,
                     endpoint=source.endpoint,
                     mode=Delivery.Mode.RELIABLE,
+                    origin=Delivery.Origin.REPLAY,
                     status=Delivery.Status.PENDING,
                 )
                 created_count += 1
@@ -81,6 +85,7 @@ class ReplayCreateView(APIView):
 
         if not dry_run:
             created_count = source_deliveries.count()
+            tenant_backlog.add(tenant.id, created_count)
 
         batch.created_deliveries_count = created_count
         batch.status = DeliveryBatch.Status.COMPLETED
@@ -0,0 +1,116 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.api.authentication import APIKeyAuthentication, IsAPIKeyAuthenticated
+from apps.api.negotiation import JSONErrorNegotiation
+from workers.delivery_stream import Subscription, parse_resume_token
+
+logger = logging.getLogger("apps.api.stream")
+
+# Client reconnect delay sent with every stream, in milliseconds.
+RETRY_MS = 1000
+# Retry-After sent when this process already holds DELIVERY_STREAM_MAX_CONNECTIONS streams.
+LIMIT_RETRY_AFTER_SECONDS = 30
+
+_open_streams = 0
+_open_streams_lock = threading.Lock()
+
+
+def _claim_stream_slot():
+    global _open_streams
+    with _open_streams_lock:
+        if _open_streams >= settings.DELIVERY_STREAM_MAX_CONNECTIONS:
+            return False
+        _open_streams += 1
+        return True
+
+
+def _release_stream_slot():
+    global _open_streams
+    with _open_streams_lock:
+        _open_streams -= 1
+
+
+def _event_stream(subscription, resume_token):
+    with subscription:
+        yield f"retry: {RETRY_MS}\n\n"
+        try:
+            for event in subscription.events(
+                resume_token,
+                heartbeat_seconds=settings.DELIVERY_STREAM_HEARTBEAT_SECONDS,
+                max_seconds=settings.DELIVERY_STREAM_MAX_SECONDS,
+            ):
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                kind, entry_id, data = event
+                yield f"id: {entry_id}\nevent: {kind}\ndata: {data or '{}'}\n\n"
+        except Exception as e:
+            # The client reconnects with its last event ID and resumes from there.
+            logger.warning("Delivery stream interrupted", extra={"error": str(e)})
+
+
+class _EventStream:
+    """Response body for one stream; frees its slot when the response is closed, even unread."""
+
+    def __init__(self, subscription, resume_token):
+        self.subscription = subscription
+        self.resume_token = resume_token
+        self._closed = False
+
+    def __iter__(self):
+        return _event_stream(self.subscription, self.resume_token)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            _release_stream_slot()
+
+
+class DeliveryStreamView(APIView):
+    """Server-sent events for the tenant's delivery state transitions.
+
+    Resumes after the Last-Event-ID header (or `last_event_id` parameter) when
+    given, otherwise starts from now. Each open stream holds a server thread, so
+    a process serves at most DELIVERY_STREAM_MAX_CONNECTIONS at once and answers
+    further requests with 503 and Retry-After.
+    """
+
+    authentication_classes = [APIKeyAuthentication]
+    permission_classes = [IsAPIKeyAuthenticated]
+    # EventSource asks for text/event-stream only; errors are still JSON.
+    content_negotiation_class = JSONErrorNegotiation
+
+    def get(self, request):
+        token = request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id")
+        resume_token = parse_resume_token(token) if token else None
+        # An unusable token resumes from a point that is never retained, so the client gets a reset.
+        if token and resume_token is None:
+            resume_token = "0-1"
+
+        if not _claim_stream_slot():
+            return Response(
+                {
+                    "error": {
+                        "code": "STREAM_LIMIT_REACHED",
+                        "message": "Too many open delivery streams, retry later",
+                        "details": {},
+                    }
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(LIMIT_RETRY_AFTER_SECONDS)},
+            )
+
+        response = StreamingHttpResponse(
+            _EventStream(Subscription(request.user.id), resume_token),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
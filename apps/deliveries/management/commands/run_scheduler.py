@@ -0,0 +1,48 @@
+import logging
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from workers.partitions import PartitionHeartbeat, PartitionOwner
+from workers.scheduler import run_scheduler_tick
+
+logger = logging.getLogger("workers.scheduler")
+
+
+class Command(BaseCommand):
+    help = "Run a scheduler instance that owns a leased share of endpoint partitions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--instance-id", default=None, help="Stable identifier for this instance")
+
+    def handle(self, *args, **options):
+        owner = PartitionOwner(instance_id=options["instance_id"])
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        self.stdout.write(f"Scheduler instance {owner.instance_id} started")
+
+        try:
+            while not self.stopping:
+                started = time.monotonic()
+                try:
+                    partitions = owner.rebalance()
+                    if partitions:
+                        with PartitionHeartbeat(owner):
+                            run_scheduler_tick(partitions)
+                except Exception as e:
+                    logger.error("Scheduler tick failed", extra={
+                        "instance_id": owner.instance_id,
+                        "error": str(e),
+                    })
+                elapsed = time.monotonic() - started
+                time.sleep(max(0.0, settings.SCHEDULER_TICK_SECONDS - elapsed))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            owner.release_all()
+            self.stdout.write(f"Scheduler instance {owner.instance_id} stopped")
+
+    def _stop(self, signum, frame):
+        self.stopping = True
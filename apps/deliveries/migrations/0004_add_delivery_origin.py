@@ -0,0 +1,18 @@
+# Generated by Django 6.0.9 on 2026-10-19 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('deliveries', '0003_add_idempotency_reused_flag'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='delivery',
+            name='origin',
+            field=models.CharField(choices=[('EVENT', 'Event'), ('REPLAY', 'Replay')], default='EVENT', max_length=10),
+        ),
+    ]
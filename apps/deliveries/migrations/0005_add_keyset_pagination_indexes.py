@@ -0,0 +1,32 @@
+# Generated by Django 6.0.9 on 2026-10-19 15:49
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Built concurrently so existing deliveries stay writable while the indexes build.
+    atomic = False
+
+    dependencies = [
+        ('deliveries', '0004_add_delivery_origin'),
+        ('endpoints', '0002_initial'),
+        ('events', '0001_initial'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(fields=['tenant_id', 'created_at', 'id'], name='idx_deliveries_tenant_created'),
+        ),
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(fields=['tenant_id', 'status', 'created_at', 'id'], name='idx_deliveries_tenant_status'),
+        ),
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(fields=['tenant_id', 'endpoint_id', 'created_at', 'id'], name='idx_deliveries_tenant_ep'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.9 on 2026-10-19 15:51
+
+from django.contrib.postgres.operations import BtreeGinExtension, TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('deliveries', '0005_add_keyset_pagination_indexes'),
+        ('endpoints', '0002_initial'),
+        ('events', '0001_initial'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        BtreeGinExtension(),
+        migrations.AddField(
+            model_name='delivery',
+            name='endpoint_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='delivery',
+            name='event_type',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
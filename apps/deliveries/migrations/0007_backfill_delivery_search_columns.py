@@ -0,0 +1,48 @@
+from django.db import migrations
+
+BATCH_SIZE = 5000
+
+
+def backfill_search_columns(apps, schema_editor):
+    # Each batch commits on its own, so row locks are held for one primary-key
+    # range at a time rather than the whole table.
+    with schema_editor.connection.cursor() as cursor:
+        lower = None
+        while True:
+            cursor.execute(
+                """
+                SELECT id FROM (
+                    SELECT id FROM deliveries WHERE %s::uuid IS NULL OR id > %s::uuid ORDER BY id LIMIT %s
+                ) batch ORDER BY id DESC LIMIT 1
+                """,
+                [lower, lower, BATCH_SIZE],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return
+            upper = row[0]
+            cursor.execute(
+                """
+                UPDATE deliveries d
+                SET event_type = e.type, endpoint_name = ep.name
+                FROM events e, endpoints ep
+                WHERE (%s::uuid IS NULL OR d.id > %s::uuid) AND d.id <= %s
+                  AND e.id = d.event_id AND ep.id = d.endpoint_id
+                """,
+                [lower, lower, upper],
+            )
+            lower = upper
+
+
+class Migration(migrations.Migration):
+
+    # Backfilled in batches outside a transaction so deliveries stay writable.
+    atomic = False
+
+    dependencies = [
+        ('deliveries', '0006_add_delivery_search_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.9 on 2026-10-19 15:51
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Built concurrently so existing deliveries stay writable while the indexes build.
+    atomic = False
+
+    dependencies = [
+        ('deliveries', '0007_backfill_delivery_search_columns'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=django.contrib.postgres.indexes.GinIndex(models.F('tenant_id'), django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('event_type', models.TextField())), name='gin_trgm_ops'), name='idx_deliveries_event_type_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=django.contrib.postgres.indexes.GinIndex(models.F('tenant_id'), django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('endpoint_name', models.TextField())), name='gin_trgm_ops'), name='idx_deliveries_endpoint_trgm'),
+        ),
+    ]
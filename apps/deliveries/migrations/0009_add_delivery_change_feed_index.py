@@ -0,0 +1,21 @@
+# Generated by Django 6.0.9 on 2026-10-19 16:16
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Built concurrently so existing deliveries stay writable while the index builds.
+    atomic = False
+
+    dependencies = [
+        ('deliveries', '0008_add_delivery_search_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(fields=['tenant_id', 'updated_at', 'id'], name='idx_deliveries_tenant_updated'),
+        ),
+    ]
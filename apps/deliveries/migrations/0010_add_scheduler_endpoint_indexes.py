@@ -0,0 +1,25 @@
+# Generated by Django 6.0.9 on 2026-10-19 16:32
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Built concurrently so existing deliveries stay writable while the indexes build.
+    atomic = False
+
+    dependencies = [
+        ('deliveries', '0009_add_delivery_change_feed_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['endpoint_id', 'created_at', 'id'], name='idx_deliveries_ep_pending'),
+        ),
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(condition=models.Q(('status', 'SCHEDULED')), fields=['endpoint_id', 'next_attempt_at', 'id'], name='idx_deliveries_ep_scheduled'),
+        ),
+    ]
@@ -1,10 +1,14 @@
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models import F, Q, TextField
+from django.db.models.functions import Cast, Upper
 
 from apps.endpoints.models import Endpoint
 from apps.events.models import Event
 from apps.tenants.models import Tenant
+from workers import versions
 
 
 class Delivery(models.Model):
@@ -21,6 +25,10 @@ class Delivery(models.Model):
         EXPIRED = "EXPIRED", "Expired"
         CANCELLED = "CANCELLED", "Cancelled"
 
+    class Origin(models.TextChoices):
+        EVENT = "EVENT", "Event"
+        REPLAY = "REPLAY", "Replay"
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     tenant = models.ForeignKey(
         Tenant,
@@ -42,6 +50,14 @@ class Delivery(models.Model):
         choices=Mode.choices,
         default=Mode.RELIABLE,
     )
+    origin = models.CharField(
+        max_length=10,
+        choices=Origin.choices,
+        default=Origin.EVENT,
+    )
+    # Copies of event.type and endpoint.name so search does not join (see search_filter).
+    event_type = models.CharField(max_length=255, default="", blank=True)
+    endpoint_name = models.CharField(max_length=255, default="", blank=True)
     idempotency_key = models.CharField(max_length=255, null=True, blank=True)
     idempotency_key_hash = models.CharField(max_length=64, null=True, blank=True)
     idempotency_key_reused = models.BooleanField(default=False)
@@ -74,15 +90,68 @@ class Delivery(models.Model):
                 fields=["status", "next_attempt_at"],
                 name="idx_deliveries_status_next",
             ),
+            # The scheduler's per-endpoint scans: oldest PENDING and earliest due
+            # SCHEDULED deliveries of one endpoint, in the order they are picked.
+            models.Index(
+                fields=["endpoint_id", "created_at", "id"],
+                condition=Q(status="PENDING"),
+                name="idx_deliveries_ep_pending",
+            ),
+            models.Index(
+                fields=["endpoint_id", "next_attempt_at", "id"],
+                condition=Q(status="SCHEDULED"),
+                name="idx_deliveries_ep_scheduled",
+            ),
             models.Index(
                 fields=["tenant_id", "endpoint_id", "idempotency_key_hash"],
                 name="idx_deliveries_dedup",
             ),
+            # Keyset pagination of the delivery list, newest first, per filter combination.
+            models.Index(
+                fields=["tenant_id", "created_at", "id"],
+                name="idx_deliveries_tenant_created",
+            ),
+            models.Index(
+                fields=["tenant_id", "status", "created_at", "id"],
+                name="idx_deliveries_tenant_status",
+            ),
+            models.Index(
+                fields=["tenant_id", "endpoint_id", "created_at", "id"],
+                name="idx_deliveries_tenant_ep",
+            ),
+            # Change feed, oldest change first.
+            models.Index(
+                fields=["tenant_id", "updated_at", "id"],
+                name="idx_deliveries_tenant_updated",
+            ),
+            # Trigram search per tenant. The indexed expressions match what
+            # `icontains` generates, so plain icontains filters can use them.
+            GinIndex(
+                F("tenant_id"),
+                OpClass(Upper(Cast("event_type", TextField())), name="gin_trgm_ops"),
+                name="idx_deliveries_event_type_trgm",
+            ),
+            GinIndex(
+                F("tenant_id"),
+                OpClass(Upper(Cast("endpoint_name", TextField())), name="gin_trgm_ops"),
+                name="idx_deliveries_endpoint_trgm",
+            ),
         ]
 
     def __str__(self):
         return f"{self.endpoint.name} - {self.event.type} ({self.status})"
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if adding:
+            self.event_type = self.event.type
+            self.endpoint_name = self.endpoint.name
+        super().save(*args, **kwargs)
+        # Later list-visible changes are state transitions, whose stream publish
+        # advances the version (see delivery_stream.publish).
+        if adding:
+            versions.bump(versions.DELIVERIES, self.tenant_id)
+
     @property
     def is_terminal(self):
         return self.status in [
@@ -4,9 +4,12 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 
+from apps.api.prefixed_ids import to_prefixed
 from apps.deliveries.models import Delivery
+from workers import delivery_stream, retry_leveling
 
 
 BACKOFF_SCHEDULE = [
@@ -24,12 +27,36 @@ BACKOFF_SCHEDULE = [
 
 
 def compute_next_attempt(attempt_number):
-    """Compute next attempt time with exponential backoff and full jitter."""
+    """Compute next attempt time with exponential backoff and full jitter.
+
+    With RETRY_LEVELING_ENABLED the jittered time is additionally steered towards
+    less loaded time buckets, within the same bounds.
+    """
     base_delay = BACKOFF_SCHEDULE[min(attempt_number - 1, len(BACKOFF_SCHEDULE) - 1)]
+    if settings.RETRY_LEVELING_ENABLED:
+        return retry_leveling.leveled_retry_time(timezone.now(), base_delay)
     jittered_delay = random.uniform(0, base_delay)
     return timezone.now() + timedelta(seconds=jittered_delay)
 
 
+def _transition(delivery_id, event_id, endpoint_id, status, attempts_count, updated_at):
+    return {
+        "id": to_prefixed("del_", delivery_id),
+        "event_id": to_prefixed("evt_", event_id),
+        "endpoint_id": to_prefixed("ep_", endpoint_id),
+        "status": status,
+        "attempts_count": attempts_count,
+        "updated_at": updated_at,
+    }
+
+
+def _publish(delivery):
+    delivery_stream.publish((delivery.tenant_id, _transition(
+        delivery.id, delivery.event_id, delivery.endpoint_id,
+        delivery.status, delivery.attempts_count, delivery.updated_at,
+    )))
+
+
 class DeliveryStateMachine:
     """Manages delivery state transitions."""
 
@@ -47,6 +74,7 @@ class DeliveryStateMachine:
             delivery.first_scheduled_at = timezone.now()
 
         delivery.save(update_fields=["status", "next_attempt_at", "first_scheduled_at", "updated_at"])
+        _publish(delivery)
         return delivery
 
     @staticmethod
@@ -61,12 +89,29 @@ class DeliveryStateMachine:
 
         delivery.status = Delivery.Status.IN_PROGRESS
         delivery.lease_id = uuid.uuid4()
-        delivery.lease_expires_at = timezone.now() + timedelta(seconds=settings.LEASE_DURATION_SECONDS)
+        delivery.lease_expires_at = timezone.now() + timedelta(
+            seconds=DeliveryStateMachine.lease_duration(delivery.endpoint)
+        )
         delivery.next_attempt_at = None
 
         delivery.save(update_fields=["status", "lease_id", "lease_expires_at", "next_attempt_at", "updated_at"])
+        _publish(delivery)
         return delivery
 
+    @staticmethod
+    def lease_duration(endpoint):
+        """Lease length in seconds: long enough to cover the endpoint's request timeout."""
+        return max(settings.LEASE_DURATION_SECONDS, endpoint.timeout_seconds + settings.LEASE_GRACE_SECONDS)
+
+    @staticmethod
+    def extend_lease(delivery_id, lease_id, duration_seconds):
+        """Push out the lease expiry if the caller still holds the lease. Returns False once it is lost."""
+        return Delivery.objects.filter(
+            id=delivery_id,
+            lease_id=lease_id,
+            status=Delivery.Status.IN_PROGRESS,
+        ).update(lease_expires_at=timezone.now() + timedelta(seconds=duration_seconds)) == 1
+
     @staticmethod
     @transaction.atomic
     def complete_success(delivery):
@@ -85,6 +130,7 @@ class DeliveryStateMachine:
             "status", "terminal_at", "terminal_reason", "next_attempt_at",
             "lease_id", "lease_expires_at", "updated_at"
         ])
+        _publish(delivery)
         return delivery
 
     @staticmethod
@@ -119,6 +165,7 @@ class DeliveryStateMachine:
             "status", "attempts_count", "last_attempt_at", "next_attempt_at",
             "terminal_at", "terminal_reason", "lease_id", "lease_expires_at", "updated_at"
         ])
+        _publish(delivery)
         return delivery
 
     @staticmethod
@@ -139,6 +186,7 @@ class DeliveryStateMachine:
             "status", "terminal_at", "terminal_reason", "next_attempt_at",
             "lease_id", "lease_expires_at", "updated_at"
         ])
+        _publish(delivery)
         return delivery
 
     @staticmethod
@@ -159,6 +207,7 @@ class DeliveryStateMachine:
             "status", "terminal_at", "terminal_reason", "next_attempt_at",
             "lease_id", "lease_expires_at", "updated_at"
         ])
+        _publish(delivery)
         return delivery
 
     @staticmethod
@@ -179,24 +228,36 @@ class DeliveryStateMachine:
             "status", "terminal_at", "terminal_reason", "next_attempt_at",
             "lease_id", "lease_expires_at", "updated_at"
         ])
+        _publish(delivery)
         return delivery
 
     @staticmethod
     @transaction.atomic
-    def recover_lease(delivery):
-        """Recover from crashed worker - transition IN_PROGRESS back to SCHEDULED."""
-        if delivery.status != Delivery.Status.IN_PROGRESS:
-            raise ValueError(f"Cannot recover lease for delivery in {delivery.status} state")
-
-        delivery.status = Delivery.Status.SCHEDULED
-        delivery.next_attempt_at = timezone.now() + timedelta(seconds=settings.LEASE_RECOVERY_DELAY_SECONDS)
-        delivery.lease_id = None
-        delivery.lease_expires_at = None
-
-        delivery.save(update_fields=[
-            "status", "next_attempt_at", "lease_id", "lease_expires_at", "updated_at"
-        ])
-        return delivery
+    def bulk_recover_leases(delivery_ids, now=None):
+        """Recover many crashed-worker leases with a single UPDATE - IN_PROGRESS back to SCHEDULED.
+
+        The lost attempt is counted so the next attempt gets a fresh attempt number.
+        """
+        now = now or timezone.now()
+        leased = Delivery.objects.filter(
+            id__in=delivery_ids,
+            status=Delivery.Status.IN_PROGRESS,
+        )
+        rows = list(leased.values_list("id", "tenant_id", "event_id", "endpoint_id", "attempts_count"))
+        delivery_stream.publish(*(
+            (tenant_id, _transition(
+                delivery_id, event_id, endpoint_id, Delivery.Status.SCHEDULED, attempts_count + 1, now,
+            ))
+            for delivery_id, tenant_id, event_id, endpoint_id, attempts_count in rows
+        ))
+        return leased.update(
+            status=Delivery.Status.SCHEDULED,
+            attempts_count=F("attempts_count") + 1,
+            next_attempt_at=now + timedelta(seconds=settings.LEASE_RECOVERY_DELAY_SECONDS),
+            lease_id=None,
+            lease_expires_at=None,
+            updated_at=now,
+        )
 
     @staticmethod
     def _check_ttl_exceeded(delivery):
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.9 on 2026-10-19 16:43
+
+import workers.partitions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('endpoints', '0002_initial'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='endpoint',
+            index=models.Index(workers.partitions.EndpointPartition('id', partitions=64), models.F('status'), name='idx_endpoints_partition'),
+        ),
+    ]
@@ -5,6 +5,8 @@ from django.db import models
 from django.utils import timezone
 
 from apps.tenants.models import Tenant
+from workers import versions, warmup
+from workers.partitions import EndpointPartition
 
 
 class Endpoint(models.Model):
@@ -43,11 +45,30 @@ class Endpoint(models.Model):
         indexes = [
             models.Index(fields=["tenant_id"], name="idx_endpoints_tenant"),
             models.Index(fields=["tenant_id", "status"], name="idx_endpoints_tenant_status"),
+            # Scheduler partition lookup. Changing SCHEDULER_PARTITIONS needs a new migration
+            # to rebuild it; partition filters stay correct meanwhile, just unindexed.
+            models.Index(
+                EndpointPartition("id", partitions=settings.SCHEDULER_PARTITIONS),
+                models.F("status"),
+                name="idx_endpoints_partition",
+            ),
         ]
 
     def __str__(self):
         return f"{self.tenant.name} - {self.name}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        versions.bump(versions.ENDPOINTS, self.tenant_id)
+
+    def delete(self, *args, **kwargs):
+        tenant_id = self.tenant_id
+        result = super().delete(*args, **kwargs)
+        # Deleting an endpoint cascades to its deliveries.
+        versions.bump(versions.ENDPOINTS, tenant_id)
+        versions.bump(versions.DELIVERIES, tenant_id)
+        return result
+
     def pause(self):
         self.status = self.Status.PAUSED
         self.paused_at = timezone.now()
@@ -57,6 +78,7 @@ class Endpoint(models.Model):
         self.status = self.Status.ACTIVE
         self.paused_at = None
         self.save(update_fields=["status", "paused_at", "updated_at"])
+        warmup.start(endpoint_id=self.id)
 
     @property
     def is_active(self):
@@ -0,0 +1,50 @@
+from django.db import migrations
+
+BATCH_SIZE = 5000
+
+# JSONB cannot store U+0000; payloads containing a \u0000 escape stay NULL, as
+# Event.save leaves them.
+NUL_ESCAPE = r"(^|[^\\])(\\\\)*\\u0000"
+
+
+def backfill_payload(apps, schema_editor):
+    # Each batch commits on its own, so row locks are held for one primary-key
+    # range at a time rather than the whole table.
+    with schema_editor.connection.cursor() as cursor:
+        lower = None
+        while True:
+            cursor.execute(
+                """
+                SELECT id FROM (
+                    SELECT id FROM events WHERE %s::uuid IS NULL OR id > %s::uuid ORDER BY id LIMIT %s
+                ) batch ORDER BY id DESC LIMIT 1
+                """,
+                [lower, lower, BATCH_SIZE],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return
+            upper = row[0]
+            cursor.execute(
+                """
+                UPDATE events SET payload = payload_json::jsonb
+                WHERE (%s::uuid IS NULL OR id > %s::uuid) AND id <= %s AND payload IS NULL
+                    AND payload_json !~ %s
+                """,
+                [lower, lower, upper, NUL_ESCAPE],
+            )
+            lower = upper
+
+
+class Migration(migrations.Migration):
+
+    # Backfilled in batches outside a transaction so event ingest is not blocked.
+    atomic = False
+
+    dependencies = [
+        ('events', '0002_add_event_payload_jsonb'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_payload, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.9 on 2026-10-19 15:57
+
+import django.contrib.postgres.indexes
+import django.db.models.expressions
+from django.contrib.postgres.operations import AddIndexConcurrently, BtreeGinExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # Built concurrently so event ingest is not blocked while the index builds.
+    atomic = False
+
+    dependencies = [
+        ('events', '0003_backfill_event_payload'),
+    ]
+
+    operations = [
+        BtreeGinExtension(),
+        AddIndexConcurrently(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(django.db.models.expressions.F('tenant_id'), django.contrib.postgres.indexes.OpClass('payload', name='jsonb_path_ops'), name='idx_events_payload'),
+        ),
+    ]
@@ -1,9 +1,17 @@
+import json
+import re
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models import F
 
 from apps.tenants.models import Tenant
 
+# JSONB cannot store U+0000. In JSON text it is a \u0000 escape whose backslash is
+# not itself escaped, i.e. preceded by an even number of backslashes.
+NUL_ESCAPE = re.compile(r"(?:^|[^\\])(?:\\\\)*\\u0000")
+
 
 class Event(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -14,6 +22,9 @@ class Event(models.Model):
     )
     type = models.CharField(max_length=255)
     payload_json = models.TextField()
+    # JSONB mirror of payload_json for containment filters; payload_json stays the
+    # exact body that is signed and sent. NULL when the payload contains U+0000.
+    payload = models.JSONField(null=True, blank=True)
     payload_hash = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -22,7 +33,17 @@ class Event(models.Model):
         indexes = [
             models.Index(fields=["tenant_id", "created_at"], name="idx_events_tenant_created"),
             models.Index(fields=["tenant_id", "type", "created_at"], name="idx_events_tenant_type_created"),
+            # Containment filters per tenant; tenant_id leads so one tenant's matches
+            # are found without collecting every tenant's.
+            GinIndex(F("tenant_id"), OpClass("payload", name="jsonb_path_ops"), name="idx_events_payload"),
         ]
 
     def __str__(self):
         return f"{self.tenant.name} - {self.type} ({self.id})"
+
+    def save(self, *args, **kwargs):
+        if self.payload_json and NUL_ESCAPE.search(self.payload_json):
+            self.payload = None
+        elif self.payload is None and self.payload_json:
+            self.payload = json.loads(self.payload_json)
+        super().save(*args, **kwargs)
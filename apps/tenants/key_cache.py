@@ -0,0 +1,103 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from workers.redis_client import ensure_listener, get_client
+
+logger = logging.getLogger("apps.tenants.key_cache")
+
+API_KEY_CACHE_KEY = "deliverant:api_key:{key_hash}"
+API_KEY_INVALIDATION_CHANNEL = "deliverant:api_key:invalidated"
+
+# Two-tier cache from API key hash to an APIKey/tenant snapshot: a per-process
+# LRU in front of Redis. Invalidation deletes the Redis entry and broadcasts the
+# key hash so every process evicts it from its LRU immediately. Redis errors are
+# logged and treated as misses, so authentication falls back to the database.
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _on_message(data):
+    with _local_lock:
+        _local.pop(data.decode(), None)
+
+
+def clear_local():
+    with _local_lock:
+        _local.clear()
+
+
+def _on_reset():
+    clear_local()
+
+
+def _get_local(key_hash):
+    with _local_lock:
+        entry = _local.get(key_hash)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if time.monotonic() >= expires_at:
+            del _local[key_hash]
+            return None
+        _local.move_to_end(key_hash)
+        return snapshot
+
+
+def _set_local(key_hash, snapshot):
+    with _local_lock:
+        _local[key_hash] = (time.monotonic() + settings.API_KEY_CACHE_LOCAL_TTL_SECONDS, snapshot)
+        _local.move_to_end(key_hash)
+        while len(_local) > settings.API_KEY_CACHE_LOCAL_SIZE:
+            _local.popitem(last=False)
+
+
+def lookup(key_hash):
+    """Return the cached snapshot for a key hash, or None on a miss."""
+    ensure_listener(API_KEY_INVALIDATION_CHANNEL, _on_message, _on_reset)
+
+    snapshot = _get_local(key_hash)
+    if snapshot is not None:
+        return snapshot
+
+    try:
+        snapshot = cache.get(API_KEY_CACHE_KEY.format(key_hash=key_hash))
+    except Exception as e:
+        logger.warning("API key cache unavailable, reading from database", extra={"error": str(e)})
+        return None
+    if snapshot is not None:
+        _set_local(key_hash, snapshot)
+    return snapshot
+
+
+def store(key_hash, snapshot):
+    try:
+        cache.set(API_KEY_CACHE_KEY.format(key_hash=key_hash), snapshot, timeout=settings.API_KEY_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning("API key cache unavailable, not caching key", extra={"error": str(e)})
+        return
+    _set_local(key_hash, snapshot)
+
+
+def invalidate(*key_hashes):
+    """Drop key hashes from Redis and from every process's local cache.
+
+    If Redis is unavailable, other processes may keep serving the keys until their
+    cached entries expire (API_KEY_CACHE_TTL_SECONDS at most).
+    """
+    if not key_hashes:
+        return
+    for key_hash in key_hashes:
+        _on_message(key_hash.encode())
+    try:
+        cache.delete_many([API_KEY_CACHE_KEY.format(key_hash=key_hash) for key_hash in key_hashes])
+        pipe = get_client().pipeline(transaction=False)
+        for key_hash in key_hashes:
+            pipe.publish(API_KEY_INVALIDATION_CHANNEL, key_hash)
+        pipe.execute()
+    except Exception as e:
+        logger.error("Failed to invalidate cached API keys", extra={"error": str(e)})
@@ -1,11 +1,21 @@
 import hashlib
+import logging
 import secrets
 import uuid
+from datetime import timedelta
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
 from django.utils import timezone
 
+from apps.tenants import key_cache
+
+logger = logging.getLogger("apps.tenants.models")
+
+LAST_USED_THROTTLE_KEY = "deliverant:api_key_last_used:{key_id}"
+
 
 class Tenant(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -36,7 +46,23 @@ class User(AbstractUser):
         return self.email or self.username
 
 
-class APIKeyManager(models.Manager):
+class APIKeyQuerySet(models.QuerySet):
+    def revoke(self):
+        """Revoke every key in the queryset and drop them from the auth cache."""
+        key_hashes = list(self.filter(status=APIKey.Status.ACTIVE).values_list("key_hash", flat=True))
+        count = self.filter(key_hash__in=key_hashes).update(status=APIKey.Status.REVOKED)
+        _invalidate_cached_keys(key_hashes)
+        return count
+
+
+def _invalidate_cached_keys(key_hashes):
+    # Invalidate now and again on commit, so a concurrent request cannot
+    # re-cache the key from a snapshot read before the revocation committed.
+    key_cache.invalidate(*key_hashes)
+    transaction.on_commit(lambda: key_cache.invalidate(*key_hashes))
+
+
+class APIKeyManager(models.Manager.from_queryset(APIKeyQuerySet)):
     def create_key(self, tenant, name=None):
         raw_key = secrets.token_urlsafe(32)
         key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
@@ -86,18 +112,65 @@ class APIKey(models.Model):
     @classmethod
     def get_from_key(cls, raw_key):
         key_hash = cls.hash_key(raw_key)
+        snapshot = key_cache.lookup(key_hash)
+        if snapshot is not None:
+            return cls.from_snapshot(snapshot)
+
         try:
-            return cls.objects.select_related("tenant").get(
+            api_key = cls.objects.select_related("tenant").get(
                 key_hash=key_hash,
                 status=cls.Status.ACTIVE,
             )
         except cls.DoesNotExist:
             return None
 
+        key_cache.store(key_hash, api_key.to_snapshot())
+        return api_key
+
+    def to_snapshot(self):
+        return {
+            "key": {
+                "id": self.id,
+                "tenant_id": self.tenant_id,
+                "key_hash": self.key_hash,
+                "name": self.name,
+                "status": self.status,
+                "created_at": self.created_at,
+                "last_used_at": self.last_used_at,
+            },
+            "tenant": {
+                "id": self.tenant.id,
+                "name": self.tenant.name,
+                "created_at": self.tenant.created_at,
+            },
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Rebuild a saved APIKey with its tenant from a cached snapshot, without a query."""
+        key_fields, tenant_fields = snapshot["key"], snapshot["tenant"]
+        api_key = cls.from_db(None, list(key_fields), list(key_fields.values()))
+        api_key.tenant = Tenant.from_db(None, list(tenant_fields), list(tenant_fields.values()))
+        return api_key
+
     def update_last_used(self):
-        self.last_used_at = timezone.now()
+        """Record use of the key, writing at most once per API_KEY_LAST_USED_INTERVAL_SECONDS."""
+        now = timezone.now()
+        interval = settings.API_KEY_LAST_USED_INTERVAL_SECONDS
+        if self.last_used_at is not None and now - self.last_used_at < timedelta(seconds=interval):
+            return
+        try:
+            if not cache.add(LAST_USED_THROTTLE_KEY.format(key_id=self.id), 1, timeout=interval):
+                return
+        except Exception as e:
+            # Without Redis the key is read from the database on every request, so
+            # the last_used_at check above still limits writes.
+            logger.warning("API key last-used throttle unavailable, writing directly", extra={"error": str(e)})
+
+        self.last_used_at = now
         self.save(update_fields=["last_used_at"])
 
     def revoke(self):
         self.status = self.Status.REVOKED
         self.save(update_fields=["status"])
+        _invalidate_cached_keys([self.key_hash])
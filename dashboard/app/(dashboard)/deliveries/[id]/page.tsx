@@ -3,6 +3,7 @@
 import { useParams } from "next/navigation";
 import useSWR from "swr";
 import { apiFetch, fetcher } from "@/lib/api";
+import { useDeliveryStream } from "@/lib/deliveryStream";
 import type { DeliveryDetail } from "@/lib/types";
 import { DeliveryStatusBadge } from "@/components/DeliveryStatusBadge";
 import { AttemptTimeline } from "@/components/AttemptTimeline";
@@ -16,8 +17,12 @@ import { CountdownTimer } from "@/components/CountdownTimer";
 export default function DeliveryDetailPage() {
   const { id } = useParams<{ id: string }>();
   const { data: delivery, mutate } = useSWR<DeliveryDetail>(`/deliveries/${id}`, fetcher, {
-    refreshInterval: 3000,
+    refreshInterval: () => (live ? 0 : 3000),
   });
+  const live = useDeliveryStream(
+    () => mutate(),
+    (transition) => transition.id === id
+  );
   const [cancelling, setCancelling] = useState(false);
 
   if (!delivery) {
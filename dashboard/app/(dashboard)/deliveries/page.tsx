@@ -3,6 +3,7 @@
 import { useState, useCallback, useEffect, useRef } from "react";
 import useSWR from "swr";
 import { fetcher, apiFetch } from "@/lib/api";
+import { isNewDelivery, patchDeliveries, useDeliveryStream, useThrottled } from "@/lib/deliveryStream";
 import type { Delivery, Endpoint, PaginatedResponse } from "@/lib/types";
 import { DeliveryStatusBadge } from "@/components/DeliveryStatusBadge";
 import { SkeletonTable } from "@/components/Skeleton";
@@ -10,6 +11,10 @@ import { EmptyState } from "@/components/EmptyState";
 import Link from "next/link";
 import { LuSearch, LuLoader } from "react-icons/lu";
 
+// Transitions are applied to the loaded rows in place; refetches, needed only
+// when rows enter or leave the list, are spaced at least this far apart.
+const REFETCH_INTERVAL_MS = 5000;
+
 const STATUSES = [
   "",
   "PENDING",
@@ -47,17 +52,36 @@ export default function DeliveriesPage() {
   if (search) params.set("search", search);
   const qs = params.toString();
 
-  const { data, isLoading } = useSWR<PaginatedResponse<Delivery>>(
+  const { data, isLoading, mutate } = useSWR<PaginatedResponse<Delivery>>(
     `/deliveries${qs ? `?${qs}` : ""}`,
     fetcher,
     {
-      refreshInterval: 5000,
+      refreshInterval: () => (live ? 0 : 5000),
       onSuccess: (res) => {
         setExtraPages([]);
         setNextCursor(res.has_more ? res.next_cursor : null);
       },
     }
   );
+  const refetch = useThrottled(() => mutate(), REFETCH_INTERVAL_MS);
+  const live = useDeliveryStream((transitions) => {
+    if (transitions === null || !data) {
+      refetch();
+      return;
+    }
+    const pageSize = data.results.length;
+    const { deliveries, unseen } = patchDeliveries([...data.results, ...extraPages], transitions);
+    mutate({ ...data, results: deliveries.slice(0, pageSize) }, { revalidate: false });
+    setExtraPages(deliveries.slice(pageSize));
+
+    const entering = unseen.some(
+      (t) =>
+        (statusFilter ? t.status === statusFilter : isNewDelivery(t)) &&
+        (!endpointFilter || t.endpoint_id === endpointFilter)
+    );
+    const leaving = statusFilter !== "" && deliveries.some((d) => d.status !== statusFilter);
+    if (entering || leaving) refetch();
+  });
   const { data: endpoints } = useSWR<Endpoint[]>("/endpoints", fetcher);
 
   const filtered = [...(data?.results ?? []), ...extraPages];
@@ -48,6 +48,35 @@ export default function EventsDocs() {
 }`}</CodeBlock>
       </Endpoint>
 
+      <Endpoint
+        method="GET"
+        path="/v1/events"
+        description="List events with optional type and payload filters and cursor-based pagination."
+      >
+        <ParamTable
+          title="Query parameters"
+          params={[
+            { name: "type", type: "string", required: false, description: "Filter by event type (exact match)" },
+            { name: "payload.<key>", type: "string", required: false, description: "Filter by payload content (e.g. payload.order_id=ord_123; nested keys use dots)" },
+            { name: "cursor", type: "string", required: false, description: "Opaque pagination cursor from next_cursor" },
+            { name: "limit", type: "integer", required: false, description: "Results per page (default 20, max 100)" },
+          ]}
+        />
+
+        <CodeBlock title="200 Response">{`{
+  "results": [
+    {
+      "id": "evt_f47ac10b-58cc-4372-a567-0e02b2c3d479",
+      "type": "order.created",
+      "payload": { "order_id": "ord_123" },
+      "created_at": "2024-01-01T00:00:00Z"
+    }
+  ],
+  "has_more": false,
+  "next_cursor": null
+}`}</CodeBlock>
+      </Endpoint>
+
       {/* Idempotency */}
       <div className="space-y-4">
         <h2 className="text-xl font-semibold">Idempotency</h2>
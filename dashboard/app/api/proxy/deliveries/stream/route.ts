@@ -0,0 +1,8 @@
+import { NextRequest } from "next/server";
+import { streamFromApi } from "@/lib/session";
+
+export const dynamic = "force-dynamic";
+
+export async function GET(request: NextRequest) {
+  return streamFromApi(`/deliveries/stream${request.nextUrl.search}`, request);
+}
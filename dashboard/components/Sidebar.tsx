@@ -5,6 +5,7 @@ import Link from "next/link";
 import { usePathname, useRouter } from "next/navigation";
 import useSWR from "swr";
 import { fetcher } from "@/lib/api";
+import { isNewDelivery, patchDeliveries, useDeliveryStream, useThrottled } from "@/lib/deliveryStream";
 import type { PaginatedResponse, Delivery } from "@/lib/types";
 import {
   LuLayoutDashboard,
@@ -26,6 +27,8 @@ const navItems: { href: string; label: string; icon: IconType }[] = [
   { href: "/settings", label: "Settings", icon: LuSettings },
 ];
 
+const SIDEBAR_REFETCH_INTERVAL_MS = 10_000;
+
 const mobileTabItems = navItems.filter((item) => item.href !== "/settings");
 const mobileMoreItems = navItems.filter((item) => item.href === "/settings");
 
@@ -35,11 +38,22 @@ export function Sidebar() {
   const [moreOpen, setMoreOpen] = useState(false);
   const moreRef = useRef<HTMLDivElement>(null);
 
-  const { data: deliveriesData } = useSWR<PaginatedResponse<Delivery>>(
+  const { data: deliveriesData, mutate } = useSWR<PaginatedResponse<Delivery>>(
     "/deliveries",
     fetcher,
-    { refreshInterval: 5000 }
+    { refreshInterval: () => (live ? 0 : 5000) }
   );
+  // Loaded rows are updated in place; only new deliveries need a (throttled) refetch.
+  const refetch = useThrottled(() => mutate(), SIDEBAR_REFETCH_INTERVAL_MS);
+  const live = useDeliveryStream((transitions) => {
+    if (transitions === null || !deliveriesData) {
+      refetch();
+      return;
+    }
+    const { deliveries, unseen } = patchDeliveries(deliveriesData.results, transitions);
+    mutate({ ...deliveriesData, results: deliveries }, { revalidate: false });
+    if (unseen.some(isNewDelivery)) refetch();
+  });
 
   const inProgressCount =
     deliveriesData?.results?.filter((d) =>
@@ -0,0 +1,165 @@
+"use client";
+
+import { useCallback, useEffect, useRef, useState } from "react";
+import type { Delivery, DeliveryTransition } from "@/lib/types";
+
+// Transitions arriving faster than this are delivered together in one callback.
+const MIN_CALLBACK_INTERVAL_MS = 1000;
+// Delay before reopening a stream the server refused (503 at its stream limit).
+const REOPEN_DELAY_MS = 30_000;
+
+// null means the stream was reset and anything shown may be stale.
+type Listener = (transition: DeliveryTransition | null) => void;
+
+// One EventSource per tab, shared by every subscriber and closed with the last one.
+let source: EventSource | null = null;
+let reopenTimer: ReturnType<typeof setTimeout> | null = null;
+let connected = false;
+const listeners = new Set<Listener>();
+const connectionListeners = new Set<(connected: boolean) => void>();
+
+function setConnected(value: boolean) {
+  connected = value;
+  connectionListeners.forEach((listener) => listener(value));
+}
+
+function open() {
+  const stream = new EventSource("/api/proxy/deliveries/stream");
+  source = stream;
+  stream.onopen = () => setConnected(true);
+  stream.onerror = () => {
+    setConnected(false);
+    // EventSource reconnects on its own after a dropped connection, resuming from
+    // the last event id, but gives up after an error response; retry that later.
+    if (stream.readyState === EventSource.CLOSED && source === stream) {
+      source = null;
+      reopenTimer = setTimeout(() => {
+        reopenTimer = null;
+        if (!source && listeners.size > 0) open();
+      }, REOPEN_DELAY_MS);
+    }
+  };
+  stream.addEventListener("delivery", (e) => {
+    const transition: DeliveryTransition = JSON.parse((e as MessageEvent).data);
+    listeners.forEach((listener) => listener(transition));
+  });
+  stream.addEventListener("reset", () => listeners.forEach((listener) => listener(null)));
+}
+
+function close() {
+  if (reopenTimer) clearTimeout(reopenTimer);
+  reopenTimer = null;
+  source?.close();
+  source = null;
+  setConnected(false);
+}
+
+/**
+ * Calls onTransitions with the transitions received since the last call
+ * (batched), optionally only those matching `filter`, or with null after a
+ * reset when anything shown may be stale. Returns whether the stream is
+ * connected, so callers can fall back to polling while it is not.
+ */
+export function useDeliveryStream(
+  onTransitions: (transitions: DeliveryTransition[] | null) => void,
+  filter?: (transition: DeliveryTransition) => boolean
+): boolean {
+  const [isConnected, setIsConnected] = useState(connected);
+  const onTransitionsRef = useRef(onTransitions);
+  const filterRef = useRef(filter);
+
+  useEffect(() => {
+    onTransitionsRef.current = onTransitions;
+    filterRef.current = filter;
+  });
+
+  useEffect(() => {
+    let lastCall = 0;
+    let timer: ReturnType<typeof setTimeout> | null = null;
+    let pending: DeliveryTransition[] | null = [];
+
+    const fire = () => {
+      lastCall = Date.now();
+      timer = null;
+      const batch = pending;
+      pending = [];
+      onTransitionsRef.current(batch);
+    };
+
+    const listener: Listener = (transition) => {
+      if (transition && filterRef.current && !filterRef.current(transition)) return;
+      if (transition === null) pending = null;
+      else pending?.push(transition);
+      if (timer) return;
+      timer = setTimeout(fire, Math.max(0, lastCall + MIN_CALLBACK_INTERVAL_MS - Date.now()));
+    };
+
+    listeners.add(listener);
+    connectionListeners.add(setIsConnected);
+    if (!source && !reopenTimer) open();
+
+    return () => {
+      if (timer) clearTimeout(timer);
+      listeners.delete(listener);
+      connectionListeners.delete(setIsConnected);
+      if (listeners.size === 0) close();
+    };
+  }, []);
+
+  return isConnected;
+}
+
+/**
+ * Applies transitions to deliveries already loaded, so a page can update rows
+ * in place instead of refetching. Returns the updated rows and the transitions
+ * for deliveries not among them.
+ */
+export function patchDeliveries(
+  deliveries: Delivery[],
+  transitions: DeliveryTransition[]
+): { deliveries: Delivery[]; unseen: DeliveryTransition[] } {
+  const latest = new Map<string, DeliveryTransition>();
+  for (const transition of transitions) {
+    const previous = latest.get(transition.id);
+    if (!previous || previous.updated_at <= transition.updated_at) latest.set(transition.id, transition);
+  }
+
+  const seen = new Set<string>();
+  const patched = deliveries.map((delivery) => {
+    const transition = latest.get(delivery.id);
+    if (!transition) return delivery;
+    seen.add(delivery.id);
+    return transition.updated_at >= delivery.updated_at ? { ...delivery, ...transition } : delivery;
+  });
+  return { deliveries: patched, unseen: [...latest.values()].filter((t) => !seen.has(t.id)) };
+}
+
+/** Whether a transition is a delivery's first scheduling, i.e. a delivery new to lists. */
+export function isNewDelivery(transition: DeliveryTransition): boolean {
+  return transition.status === "SCHEDULED" && transition.attempts_count === 0;
+}
+
+/** Returns a stable function that calls fn at most once per intervalMs, trailing. */
+export function useThrottled(fn: () => void, intervalMs: number): () => void {
+  const fnRef = useRef(fn);
+  const state = useRef<{ lastCall: number; timer: ReturnType<typeof setTimeout> | null }>({
+    lastCall: 0,
+    timer: null,
+  });
+
+  useEffect(() => {
+    fnRef.current = fn;
+  });
+
+  useEffect(() => () => {
+    if (state.current.timer) clearTimeout(state.current.timer);
+  }, []);
+
+  return useCallback(() => {
+    if (state.current.timer) return;
+    state.current.timer = setTimeout(() => {
+      state.current = { lastCall: Date.now(), timer: null };
+      fnRef.current();
+    }, Math.max(0, state.current.lastCall + intervalMs - Date.now()));
+  }, [intervalMs]);
+}
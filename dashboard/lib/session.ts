@@ -42,3 +42,33 @@ export async function proxyToApi(path: string, init?: RequestInit) {
   const data = await res.json();
   return Response.json(data, { status: res.status });
 }
+
+export async function streamFromApi(path: string, request: Request) {
+  const apiKey = await getApiKey();
+  if (!apiKey) {
+    return Response.json({ error: "Not authenticated" }, { status: 401 });
+  }
+
+  const lastEventId = request.headers.get("Last-Event-ID");
+  const res = await fetch(`${API_BASE}${path}`, {
+    signal: request.signal,
+    headers: {
+      Accept: "text/event-stream",
+      Authorization: `Bearer ${apiKey}`,
+      ...(lastEventId ? { "Last-Event-ID": lastEventId } : {}),
+    },
+  });
+
+  if (!res.ok || !res.body) {
+    const data = await res.json();
+    return Response.json(data, { status: res.status });
+  }
+
+  return new Response(res.body, {
+    headers: {
+      "Content-Type": "text/event-stream",
+      "Cache-Control": "no-cache",
+      "X-Accel-Buffering": "no",
+    },
+  });
+}
@@ -58,6 +58,11 @@ export interface DeliveryDetail extends Delivery {
   attempts: Attempt[];
 }
 
+export type DeliveryTransition = Pick<
+  Delivery,
+  "id" | "event_id" | "endpoint_id" | "status" | "attempts_count" | "updated_at"
+>;
+
 export interface Event {
   id: string;
   type: string;
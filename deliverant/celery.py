@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from django.conf import settings
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "deliverant.settings.development")
 
@@ -8,12 +9,22 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
 app.conf.beat_schedule = {
-    "schedule-due-deliveries": {
-        "task": "workers.scheduler.schedule_due_deliveries",
-        "schedule": 1.0,
-    },
     "recover-expired-leases": {
         "task": "workers.lease.recover_expired_leases",
         "schedule": 10.0,
     },
+    "refresh-backlog-gauges": {
+        "task": "workers.gauges.refresh_backlog_gauges",
+        "schedule": 15.0,
+    },
+    "refresh-endpoint-success-rates": {
+        "task": "workers.gauges.refresh_endpoint_success_rates",
+        "schedule": 30.0,
+    },
 }
+
+if not settings.SHARDED_SCHEDULER:
+    app.conf.beat_schedule["schedule-due-deliveries"] = {
+        "task": "workers.scheduler.schedule_due_deliveries",
+        "schedule": 1.0,
+    }
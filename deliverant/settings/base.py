@@ -20,6 +20,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "django_prometheus",
     "apps.tenants",
@@ -85,11 +86,12 @@ AUTH_USER_MODEL = "tenants.User"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [],
     "DEFAULT_PERMISSION_CLASSES": [],
+    # orjson-backed when installed (the `fast-json` extra), stock DRF otherwise.
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "apps.api.fast_json.FastJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "apps.api.fast_json.FastJSONParser",
     ],
     "EXCEPTION_HANDLER": "deliverant.exceptions.custom_exception_handler",
 }
@@ -100,7 +102,13 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
-CELERY_IMPORTS = ["workers.scheduler", "workers.delivery", "workers.lease"]
+CELERY_IMPORTS = [
+    "workers.scheduler",
+    "workers.delivery",
+    "workers.lease",
+    "workers.gauges",
+    "workers.endpoint_names",
+]
 
 REDIS_URL = env("REDIS_URL", default="redis://localhost:6379/0")
 
@@ -119,10 +127,90 @@ MAX_ATTEMPTS = 12
 MAX_DELIVERY_TTL_HOURS = 72
 DEFAULT_ATTEMPT_TIMEOUT_SECONDS = 10
 LEASE_DURATION_SECONDS = 30
+LEASE_GRACE_SECONDS = 15
+LEASE_HEARTBEAT_INTERVAL_SECONDS = 10
 LEASE_RECOVERY_DELAY_SECONDS = 30
+LEASE_RECOVERY_BATCH_SIZE = 10000
 DEDUP_WINDOW_HOURS = 72
 MAX_ENDPOINT_CONCURRENCY = 10
+SCHEDULER_ENDPOINT_BATCH_CAP = 10
+
+# Sharded scheduler: run `manage.py run_scheduler` instances instead of the
+# celery-beat scheduling task; each owns a leased share of endpoint partitions.
+SHARDED_SCHEDULER = env.bool("SHARDED_SCHEDULER", default=False)
+SCHEDULER_PARTITIONS = 64
+SCHEDULER_PARTITION_LEASE_SECONDS = 10
+SCHEDULER_TICK_SECONDS = 1.0
 MAX_REPLAY_BATCH_SIZE = 1000
+ENDPOINT_RENAME_BATCH_SIZE = 5000
+KILL_SWITCH_LOCAL_TTL_SECONDS = 5
+
+# API key lookups are cached per process (LRU) and in Redis; revocations
+# invalidate both tiers immediately.
+API_KEY_CACHE_TTL_SECONDS = 60
+API_KEY_CACHE_LOCAL_TTL_SECONDS = 10
+API_KEY_CACHE_LOCAL_SIZE = 1024
+API_KEY_LAST_USED_INTERVAL_SECONDS = 60
+
+# Ingest (events and replays) token buckets: `rate` requests per second refill,
+# up to `burst`. Ingest is shed while a tenant's PENDING/SCHEDULED backlog is at
+# TENANT_BACKLOG_LIMIT (0 disables); counters resync with the backlog gauges.
+INGEST_RATE_LIMITS = {
+    "tenant": {"rate": 200, "burst": 400},
+    "api_key": {"rate": 100, "burst": 200},
+}
+TENANT_BACKLOG_LIMIT = 100000
+BACKLOG_SHED_RETRY_AFTER_SECONDS = 15
+
+# After a kill switch is released or an endpoint resumes, dispatch ramps from
+# WARMUP_INITIAL_FRACTION of full capacity to 100% over WARMUP_WINDOW_SECONDS.
+WARMUP_WINDOW_SECONDS = 300
+WARMUP_INITIAL_FRACTION = 0.1
+
+# Dispatch lanes: each lane has its own Celery queue (and worker pool) and a
+# per-tick dispatch budget so retries and replays cannot starve fresh traffic.
+DELIVERY_LANES = {
+    "fresh": {"queue": "deliveries.fresh", "budget": 100},
+    "retry": {"queue": "deliveries.retry", "budget": 50},
+    "replay": {"queue": "deliveries.replay", "budget": 25},
+    "slow": {"queue": "deliveries.slow", "budget": 20},
+}
+RETRY_LANE_MIN_ATTEMPT = 2
+
+# Endpoints whose recent p95 attempt latency crosses SLOW_ENDPOINT_P95_MS are
+# routed to the slow lane until it drops below SLOW_ENDPOINT_RECOVERY_P95_MS.
+SLOW_ENDPOINT_P95_MS = 5000
+SLOW_ENDPOINT_RECOVERY_P95_MS = 2500
+SLOW_ENDPOINT_SAMPLE_SIZE = 50
+SLOW_ENDPOINT_MIN_SAMPLES = 10
+SLOW_ENDPOINT_SAMPLE_TTL_SECONDS = 900
+
+# Retry load leveling: each retry time is the least loaded (by planned attempts
+# per RETRY_LEVELING_BUCKET_SECONDS bucket) of RETRY_LEVELING_CHOICES jittered candidates.
+RETRY_LEVELING_ENABLED = env.bool("RETRY_LEVELING_ENABLED", default=False)
+RETRY_LEVELING_BUCKET_SECONDS = 10
+RETRY_LEVELING_CHOICES = 3
+
+SUCCESS_RATE_WINDOW_SECONDS = 900
+SUCCESS_RATE_BUCKET_SECONDS = 60
+
+# Server-sent delivery transitions (GET /v1/deliveries/stream). Each tenant's
+# recent transitions are kept for resuming; a stream is closed after
+# DELIVERY_STREAM_MAX_SECONDS and the client reconnects with its last event ID.
+# Each open stream holds a Gunicorn thread; keep DELIVERY_STREAM_MAX_CONNECTIONS
+# below --threads so regular requests always have threads left.
+DELIVERY_STREAM_MAXLEN = 1000
+DELIVERY_STREAM_RETENTION_SECONDS = 3600
+DELIVERY_STREAM_HEARTBEAT_SECONDS = 15
+DELIVERY_STREAM_MAX_SECONDS = 300
+DELIVERY_STREAM_MAX_CONNECTIONS = 8
+
+# The delivery change feed (GET /v1/deliveries/changes) only lists changes at
+# least this old, so slow transactions cannot commit behind a client's cursor.
+DELIVERY_CHANGES_SETTLE_SECONDS = 5
+
+# Rows fetched per server-side cursor round-trip by GET /v1/deliveries/export.
+EXPORT_CHUNK_SIZE = 2000
 
 LOGGING = {
     "version": 1,
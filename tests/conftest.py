@@ -2,6 +2,7 @@ import pytest
 from django.core.cache import cache
 from rest_framework.test import APIClient
 
+from apps.tenants import key_cache
 from tests.factories import (
     create_api_key,
     create_delivery,
@@ -9,6 +10,7 @@ from tests.factories import (
     create_event,
     create_tenant,
 )
+from workers import kill_switch
 
 
 @pytest.fixture
@@ -48,8 +50,12 @@ def auth_client(api_key):
 @pytest.fixture(autouse=True)
 def flush_redis():
     cache.clear()
+    kill_switch.reset_local_state()
+    key_cache.clear_local()
     yield
     cache.clear()
+    kill_switch.reset_local_state()
+    key_cache.clear_local()
 
 
 @pytest.fixture
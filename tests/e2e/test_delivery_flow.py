@@ -57,7 +57,7 @@ class TestDeliveryFlow:
             mock_client.return_value.__exit__ = MagicMock(return_value=False)
 
             with patch("workers.delivery.execute_delivery") as mock_execute:
-                mock_execute.delay = MagicMock()
+                mock_execute.apply_async = MagicMock()
 
                 from workers.scheduler import schedule_due_deliveries
                 result = schedule_due_deliveries()
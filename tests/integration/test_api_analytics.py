@@ -31,6 +31,19 @@ class TestDeliveryVolume:
         client = APIClient()
         assert client.get("/v1/analytics/delivery-volume").status_code == 401
 
+    def test_etag(self, auth_client, tenant, event, endpoint, django_capture_on_commit_callbacks):
+        etag = auth_client.get("/v1/analytics/delivery-volume")["ETag"]
+        assert auth_client.get("/v1/analytics/delivery-volume", HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert auth_client.get("/v1/analytics/delivery-volume?hours=48")["ETag"] != etag
+        assert auth_client.get("/v1/analytics/success-rate")["ETag"] != etag
+
+        with django_capture_on_commit_callbacks(execute=True):
+            create_delivery(tenant, event, endpoint, status=Delivery.Status.DELIVERED)
+
+        response = auth_client.get("/v1/analytics/delivery-volume", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()[0]["delivered"] == 1
+
 
 @pytest.mark.django_db
 class TestSuccessRate:
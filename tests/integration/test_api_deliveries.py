@@ -1,10 +1,21 @@
+import csv
+import io
+import json
 import uuid
+from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
+from rest_framework.test import APIClient
 
+from apps.api.pagination import keyset_after, keyset_before
+from apps.api.views.deliveries import search_filter
 from apps.attempts.models import Attempt
 from apps.deliveries.models import Delivery
+from apps.deliveries.state_machine import DeliveryStateMachine
 from tests.factories import create_attempt, create_delivery, create_endpoint, create_event, create_tenant
 
 
@@ -41,6 +52,117 @@ class TestDeliveryList:
         assert response.status_code == 200
         assert len(response.json()["results"]) >= 1
 
+    @pytest.mark.parametrize("search, matches", [
+        ("ORDER", True),
+        ("ord", True),
+        ("completed", True),
+        ("ordr.completed", True),
+        ("invoice", False),
+    ])
+    def test_search_prefix_and_fuzzy(self, auth_client, tenant, endpoint, search, matches):
+        create_delivery(tenant, create_event(tenant, type="order.completed"), endpoint)
+
+        results = auth_client.get(f"/v1/deliveries?search={search}").json()["results"]
+
+        assert (len(results) == 1) is matches
+
+    def test_search_by_endpoint_name(self, auth_client, tenant, event):
+        endpoint = create_endpoint(tenant, name="billing-service")
+        create_delivery(tenant, event, endpoint)
+
+        results = auth_client.get("/v1/deliveries?search=billing").json()["results"]
+
+        assert [r["endpoint_id"] for r in results] == [f"ep_{endpoint.id}"]
+
+    def test_search_follows_endpoint_rename(
+        self, auth_client, tenant, event, celery_eager, django_capture_on_commit_callbacks,
+    ):
+        endpoint = create_endpoint(tenant, name="old-name")
+        create_delivery(tenant, event, endpoint)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            auth_client.patch(f"/v1/endpoints/ep_{endpoint.id}", {"name": "renamed-service"}, format="json")
+
+        assert len(auth_client.get("/v1/deliveries?search=renamed").json()["results"]) == 1
+        assert len(auth_client.get("/v1/deliveries?search=old-name").json()["results"]) == 0
+
+    def test_search_does_not_cross_tenants(self, auth_client, endpoint):
+        other_tenant = create_tenant()
+        create_delivery(
+            other_tenant, create_event(other_tenant, type="order.completed"), create_endpoint(other_tenant),
+        )
+
+        assert auth_client.get("/v1/deliveries?search=order").json()["results"] == []
+
+    def test_filter_by_event_payload(self, auth_client, tenant, endpoint):
+        match = create_delivery(tenant, create_event(tenant, payload={"order_id": "ord_123"}), endpoint)
+        create_delivery(tenant, create_event(tenant, payload={"order_id": "ord_456"}), endpoint)
+
+        results = auth_client.get("/v1/deliveries?payload.order_id=ord_123").json()["results"]
+
+        assert [r["id"] for r in results] == [f"del_{match.id}"]
+
+    def test_invalid_payload_filter(self, auth_client):
+        response = auth_client.get("/v1/deliveries?payload.=x")
+
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    @pytest.mark.parametrize("search", ["order", "ordr.completed"])
+    def test_search_query_uses_trigram_indexes(self, tenant, event, endpoint, search):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO deliveries (
+                    id, tenant_id, event_id, endpoint_id, mode, origin, status, attempts_count,
+                    idempotency_key_reused, cancel_requested, event_type, endpoint_name, created_at, updated_at
+                )
+                SELECT gen_random_uuid(), %s, %s, %s, 'BASIC', 'EVENT', 'DELIVERED', 1,
+                    false, false, 'invoice.type-' || (n %% 50), 'service-' || (n %% 50), now(), now()
+                FROM generate_series(1, 50000) AS n
+                """,
+                [tenant.id, event.id, endpoint.id],
+            )
+            cursor.execute("ANALYZE deliveries")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        plan = Delivery.objects.filter(search_filter(search), tenant=tenant).explain()
+
+        assert "idx_deliveries_event_type_trgm" in plan
+        assert "idx_deliveries_endpoint_trgm" in plan
+        assert "Join" not in plan
+
+    def test_sparse_fields(self, auth_client, tenant, event, endpoint):
+        for _ in range(3):
+            create_delivery(tenant, event, endpoint)
+
+        with CaptureQueriesContext(connection) as queries:
+            body = auth_client.get("/v1/deliveries?fields=id,status&limit=2").json()
+
+        assert [r.keys() for r in body["results"]] == [{"id", "status"}] * 2
+        assert body["next_cursor"] is not None
+        sql = " ".join(query["sql"] for query in queries)
+        assert '"endpoints"' not in sql
+        assert "terminal_reason" not in sql
+
+        rest = auth_client.get(f"/v1/deliveries?fields=id&cursor={body['next_cursor']}").json()["results"]
+        assert len(rest) == 1
+
+    def test_expand_attempts(self, auth_client, tenant, event, endpoint):
+        with_attempts = create_delivery(tenant, event, endpoint)
+        create_attempt(tenant, with_attempts, attempt_number=2, outcome=Attempt.Outcome.SUCCESS)
+        create_attempt(tenant, with_attempts, attempt_number=1, outcome=Attempt.Outcome.RETRYABLE_FAILURE)
+        without_attempts = create_delivery(tenant, event, endpoint)
+
+        results = auth_client.get("/v1/deliveries?expand=attempts").json()["results"]
+
+        by_id = {r["id"]: r for r in results}
+        assert [a["attempt_number"] for a in by_id[f"del_{with_attempts.id}"]["attempts"]] == [1, 2]
+        assert by_id[f"del_{without_attempts.id}"]["attempts"] == []
+
+    def test_list_omits_attempts_by_default(self, auth_client, delivery):
+        assert "attempts" not in auth_client.get("/v1/deliveries").json()["results"][0]
+
     def test_cursor_pagination(self, auth_client, tenant, event, endpoint):
         for _ in range(5):
             create_delivery(tenant, event, endpoint)
@@ -56,6 +178,258 @@ class TestDeliveryList:
         assert response2.status_code == 200
         assert len(response2.json()["results"]) == 2
 
+    def test_cursor_pagination_does_not_skip_shared_timestamps(self, auth_client, tenant, event, endpoint):
+        deliveries = [create_delivery(tenant, event, endpoint) for _ in range(7)]
+        shared = timezone.now()
+        Delivery.objects.filter(id__in=[d.id for d in deliveries]).update(created_at=shared)
+
+        seen = []
+        url = "/v1/deliveries?limit=3"
+        while url:
+            body = auth_client.get(url).json()
+            seen.extend(result["id"] for result in body["results"])
+            url = f"/v1/deliveries?limit=3&cursor={body['next_cursor']}" if body["has_more"] else None
+
+        assert len(seen) == 7
+        assert set(seen) == {f"del_{d.id}" for d in deliveries}
+
+    def test_cursor_is_opaque(self, auth_client, tenant, event, endpoint):
+        for _ in range(3):
+            create_delivery(tenant, event, endpoint)
+
+        cursor = auth_client.get("/v1/deliveries?limit=1").json()["next_cursor"]
+
+        assert ":" not in cursor
+        assert "/" not in cursor
+
+    def test_invalid_cursor(self, auth_client):
+        response = auth_client.get("/v1/deliveries?cursor=not-a-cursor")
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    @pytest.mark.parametrize("filter_field, index", [
+        (None, "idx_deliveries_tenant_created"),
+        ("status", "idx_deliveries_tenant_status"),
+        ("endpoint_id", "idx_deliveries_tenant_ep"),
+    ])
+    def test_page_query_uses_keyset_index(self, tenant, endpoint, filter_field, index):
+        filters = {
+            None: {},
+            "status": {"status": Delivery.Status.PENDING},
+            "endpoint_id": {"endpoint_id": endpoint.id},
+        }[filter_field]
+        queryset = Delivery.objects.filter(
+            keyset_before("created_at", timezone.now(), uuid.uuid4()), tenant=tenant, **filters,
+        ).order_by("-created_at", "-id")[:21]
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+            plan = queryset.explain()
+
+        assert index in plan
+        assert "Sort" not in plan
+
+    def test_unchanged_poll_is_not_modified(self, auth_client, delivery):
+        response = auth_client.get("/v1/deliveries?status=PENDING")
+        etag = response["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            repeat = auth_client.get("/v1/deliveries?status=PENDING", HTTP_IF_NONE_MATCH=etag)
+
+        assert repeat.status_code == 304
+        assert repeat["ETag"] == etag
+        assert '"deliveries"' not in " ".join(query["sql"] for query in queries)
+        assert auth_client.get("/v1/deliveries?status=FAILED")["ETag"] != etag
+
+    def test_state_change_invalidates_etag(self, auth_client, delivery, django_capture_on_commit_callbacks):
+        etag = auth_client.get("/v1/deliveries")["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            DeliveryStateMachine.schedule(delivery)
+
+        response = auth_client.get("/v1/deliveries", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()["results"][0]["status"] == "SCHEDULED"
+        assert response["ETag"] != etag
+
+    def test_lease_only_write_keeps_etag(self, auth_client, delivery, django_capture_on_commit_callbacks):
+        etag = auth_client.get("/v1/deliveries")["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            delivery.lease_expires_at = timezone.now()
+            delivery.save(update_fields=["lease_expires_at"])
+
+        assert callbacks == []
+        assert auth_client.get("/v1/deliveries", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    def test_endpoint_rename_invalidates_etag(
+        self, auth_client, endpoint, delivery, celery_eager, django_capture_on_commit_callbacks,
+    ):
+        etag = auth_client.get("/v1/deliveries")["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            auth_client.patch(f"/v1/endpoints/ep_{endpoint.id}", {"name": "renamed"}, format="json")
+
+        response = auth_client.get("/v1/deliveries", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()["results"][0]["endpoint_name"] == "renamed"
+
+    def test_no_etag_without_redis(self, auth_client, delivery):
+        with patch("workers.versions.get_client") as mock_get_client:
+            mock_get_client.side_effect = ConnectionError("redis down")
+            response = auth_client.get("/v1/deliveries", HTTP_IF_NONE_MATCH="*")
+
+        assert response.status_code == 200
+        assert "ETag" not in response
+
+
+@pytest.mark.django_db
+class TestDeliveryExport:
+    def _export(self, auth_client, query=""):
+        response = auth_client.get(f"/v1/deliveries/export?{query}")
+        assert response.status_code == 200
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_ndjson_matches_list(self, auth_client, tenant, event, endpoint):
+        for status_ in [Delivery.Status.DELIVERED, Delivery.Status.FAILED, Delivery.Status.DELIVERED]:
+            create_delivery(tenant, event, endpoint, status=status_)
+
+        response, content = self._export(auth_client, "status=DELIVERED")
+
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert 'filename="deliveries.ndjson"' in response["Content-Disposition"]
+        exported = [json.loads(line) for line in content.splitlines()]
+        assert exported == auth_client.get("/v1/deliveries?status=DELIVERED").json()["results"]
+
+    def test_csv_with_attempts(self, auth_client, tenant, event, endpoint):
+        with_attempts = create_delivery(tenant, event, endpoint)
+        create_attempt(tenant, with_attempts, attempt_number=1, http_status=503)
+        create_attempt(tenant, with_attempts, attempt_number=2, http_status=200)
+        without_attempts = create_delivery(tenant, event, endpoint)
+
+        response, content = self._export(
+            auth_client, "format=csv&fields=id,status,attempts.attempt_number,attempts.http_status"
+        )
+
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        assert list(csv.reader(io.StringIO(content))) == [
+            ["id", "status", "attempts.attempt_number", "attempts.http_status"],
+            [f"del_{without_attempts.id}", "PENDING", "", ""],
+            [f"del_{with_attempts.id}", "PENDING", "1", "503"],
+            [f"del_{with_attempts.id}", "PENDING", "2", "200"],
+        ]
+
+    def test_attempts_fetched_per_chunk(self, auth_client, settings, tenant, event, endpoint):
+        settings.EXPORT_CHUNK_SIZE = 2
+        for _ in range(5):
+            create_attempt(tenant, create_delivery(tenant, event, endpoint))
+
+        with CaptureQueriesContext(connection) as queries:
+            _, content = self._export(auth_client, "expand=attempts")
+
+        assert [len(json.loads(line)["attempts"]) for line in content.splitlines()] == [1] * 5
+        assert sum('FROM "attempts"' in query["sql"] for query in queries) == 3
+
+    def test_created_range(self, auth_client, tenant, event, endpoint):
+        old, new = create_delivery(tenant, event, endpoint), create_delivery(tenant, event, endpoint)
+        Delivery.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=40))
+        since = (timezone.now() - timedelta(days=30)).isoformat().replace("+00:00", "Z")
+
+        _, content = self._export(auth_client, f"created_after={since}")
+        assert [json.loads(line)["id"] for line in content.splitlines()] == [f"del_{new.id}"]
+
+        _, content = self._export(auth_client, f"created_before={since}")
+        assert [json.loads(line)["id"] for line in content.splitlines()] == [f"del_{old.id}"]
+
+    @pytest.mark.parametrize("query", ["format=xml", "created_after=yesterday", "payload..x=1", "fields=bogus"])
+    def test_invalid_parameters(self, auth_client, query):
+        response = auth_client.get(f"/v1/deliveries/export?{query}")
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.django_db
+class TestDeliveryChanges:
+    @pytest.fixture(autouse=True)
+    def no_settle_delay(self, settings):
+        settings.DELIVERY_CHANGES_SETTLE_SECONDS = 0
+
+    def _sync(self, auth_client, query="limit=2"):
+        seen = []
+        while True:
+            body = auth_client.get(f"/v1/deliveries/changes?{query}").json()
+            seen.extend(result["id"] for result in body["results"])
+            query = f"limit=2&cursor={body['next_cursor']}"
+            if not body["has_more"]:
+                return seen, body["next_cursor"]
+
+    def test_resumes_from_cursor(self, auth_client, tenant, event, endpoint):
+        first, second, third = [create_delivery(tenant, event, endpoint) for _ in range(3)]
+        first.save()
+
+        seen, cursor = self._sync(auth_client)
+        assert seen == [f"del_{second.id}", f"del_{third.id}", f"del_{first.id}"]
+
+        assert self._sync(auth_client, f"cursor={cursor}") == ([], cursor)
+
+        DeliveryStateMachine.schedule(second)
+        seen, _ = self._sync(auth_client, f"cursor={cursor}")
+        assert seen == [f"del_{second.id}"]
+
+    def test_does_not_skip_shared_timestamps(self, auth_client, tenant, event, endpoint):
+        deliveries = [create_delivery(tenant, event, endpoint) for _ in range(5)]
+        Delivery.objects.filter(id__in=[d.id for d in deliveries]).update(updated_at=timezone.now())
+
+        seen, _ = self._sync(auth_client)
+        assert sorted(seen) == sorted(f"del_{d.id}" for d in deliveries)
+
+    def test_updated_since(self, auth_client, tenant, event, endpoint):
+        old = create_delivery(tenant, event, endpoint)
+        since = timezone.now()
+        Delivery.objects.filter(id=old.id).update(updated_at=since - timedelta(minutes=1))
+        new = create_delivery(tenant, event, endpoint)
+
+        seen, _ = self._sync(auth_client, f"updated_since={since.isoformat().replace('+00:00', 'Z')}")
+        assert seen == [f"del_{new.id}"]
+
+    def test_recent_changes_wait_to_settle(self, auth_client, settings, delivery):
+        settings.DELIVERY_CHANGES_SETTLE_SECONDS = 60
+
+        body = auth_client.get("/v1/deliveries/changes").json()
+        assert body["results"] == []
+        assert body["next_cursor"] is not None
+
+        settings.DELIVERY_CHANGES_SETTLE_SECONDS = 0
+        seen, _ = self._sync(auth_client, f"cursor={body['next_cursor']}")
+        assert seen == [f"del_{delivery.id}"]
+
+    def test_tenant_isolation(self, auth_client):
+        other_tenant = create_tenant("other-tenant")
+        create_delivery(other_tenant, create_event(other_tenant), create_endpoint(other_tenant, name="other-ep"))
+
+        assert self._sync(auth_client)[0] == []
+
+    @pytest.mark.parametrize("query", ["cursor=not-a-cursor", "updated_since=yesterday", "fields=bogus"])
+    def test_invalid_parameters(self, auth_client, query):
+        response = auth_client.get(f"/v1/deliveries/changes?{query}")
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_page_query_uses_change_index(self, tenant):
+        now = timezone.now()
+        queryset = Delivery.objects.filter(
+            keyset_after("updated_at", now - timedelta(hours=1), uuid.uuid4()), tenant=tenant, updated_at__lt=now,
+        ).order_by("updated_at", "id")[:21]
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+            plan = queryset.explain()
+
+        assert "idx_deliveries_tenant_updated" in plan
+        assert "Sort" not in plan
+
 
 @pytest.mark.django_db
 class TestDeliveryDetail:
@@ -73,6 +447,69 @@ class TestDeliveryDetail:
         response = auth_client.get(f"/v1/deliveries/del_{uuid.uuid4()}")
         assert response.status_code == 404
 
+    def test_sparse_fields_skip_attempts(self, auth_client, tenant, delivery):
+        create_attempt(tenant, delivery, response_body_snippet="x" * 500)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(f"/v1/deliveries/del_{delivery.id}?fields=status,attempts_count,updated_at")
+
+        assert response.json().keys() == {"status", "attempts_count", "updated_at"}
+        sql = " ".join(query["sql"] for query in queries)
+        assert '"attempts"' not in sql
+        assert '"endpoints"' not in sql
+
+    def test_narrowed_attempt_fields(self, auth_client, tenant, delivery):
+        create_attempt(tenant, delivery, http_status=503, response_headers_json={"x": "y"})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(
+                f"/v1/deliveries/del_{delivery.id}?fields=id,status,attempts.outcome,attempts.http_status"
+            )
+
+        body = response.json()
+        assert body.keys() == {"id", "status", "attempts"}
+        assert body["attempts"] == [{"outcome": "SUCCESS", "http_status": 503}]
+        assert "response_headers_json" not in " ".join(query["sql"] for query in queries)
+
+    def test_empty_expand_omits_attempts(self, auth_client, tenant, delivery):
+        create_attempt(tenant, delivery)
+
+        body = auth_client.get(f"/v1/deliveries/del_{delivery.id}?expand=").json()
+
+        assert "attempts" not in body
+        assert body["id"] == f"del_{delivery.id}"
+
+    @pytest.mark.parametrize("query", ["fields=status,bogus", "fields=attempts.bogus", "expand=endpoint"])
+    def test_unknown_fields_rejected(self, auth_client, delivery, query):
+        response = auth_client.get(f"/v1/deliveries/del_{delivery.id}?{query}")
+
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_unchanged_poll_is_not_modified(self, auth_client, delivery):
+        etag = auth_client.get(f"/v1/deliveries/del_{delivery.id}")["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(f"/v1/deliveries/del_{delivery.id}", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert '"attempts"' not in " ".join(query["sql"] for query in queries)
+
+    def test_attempt_invalidates_etag(self, auth_client, tenant, delivery):
+        etag = auth_client.get(f"/v1/deliveries/del_{delivery.id}")["ETag"]
+
+        create_attempt(tenant, delivery)
+        delivery.attempts_count = 1
+        delivery.save()
+
+        response = auth_client.get(f"/v1/deliveries/del_{delivery.id}", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(response.json()["attempts"]) == 1
+
+    def test_not_found_has_no_etag(self, auth_client):
+        response = auth_client.get(f"/v1/deliveries/del_{uuid.uuid4()}")
+        assert "ETag" not in response
+
 
 @pytest.mark.django_db
 class TestDeliveryCancel:
@@ -96,3 +533,69 @@ class TestDeliveryCancel:
 
         response = auth_client.post(f"/v1/deliveries/del_{delivery.id}/cancel")
         assert response.status_code == 409
+
+
+@pytest.mark.django_db
+class TestDeliveryStream:
+    @pytest.fixture(autouse=True)
+    def short_streams(self, settings):
+        settings.DELIVERY_STREAM_HEARTBEAT_SECONDS = 0.05
+        settings.DELIVERY_STREAM_MAX_SECONDS = 0.2
+
+    def _read(self, auth_client, **headers):
+        response = auth_client.get("/v1/deliveries/stream", HTTP_ACCEPT="text/event-stream", **headers)
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        events = []
+        for block in b"".join(response.streaming_content).decode().split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+            if "event" in fields:
+                events.append((fields["event"], fields["id"], json.loads(fields["data"])))
+        return events
+
+    def test_resumes_after_last_event_id(self, auth_client, tenant, delivery, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            DeliveryStateMachine.schedule(delivery)
+        [(_, first_id, _)] = self._read(auth_client, HTTP_LAST_EVENT_ID="0-0")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            DeliveryStateMachine.acquire_lease(delivery)
+        with django_capture_on_commit_callbacks(execute=True):
+            DeliveryStateMachine.bulk_recover_leases([delivery.id])
+
+        events = self._read(auth_client, HTTP_LAST_EVENT_ID=first_id)
+        assert [(kind, data["id"], data["status"], data["attempts_count"]) for kind, _, data in events] == [
+            ("delivery", f"del_{delivery.id}", "IN_PROGRESS", 0),
+            ("delivery", f"del_{delivery.id}", "SCHEDULED", 1),
+        ]
+
+    def test_rejects_streams_over_process_limit(self, auth_client, settings):
+        settings.DELIVERY_STREAM_MAX_CONNECTIONS = 1
+        first = auth_client.get("/v1/deliveries/stream", HTTP_ACCEPT="text/event-stream")
+        assert first.status_code == 200
+
+        refused = auth_client.get("/v1/deliveries/stream", HTTP_ACCEPT="text/event-stream")
+        assert refused.status_code == 503
+        assert refused["Retry-After"] == "30"
+        assert refused.json()["error"]["code"] == "STREAM_LIMIT_REACHED"
+
+        first.close()
+        assert self._read(auth_client) == []
+
+    def test_other_tenants_not_streamed(self, auth_client, django_capture_on_commit_callbacks):
+        other_tenant = create_tenant("other-tenant")
+        other_delivery = create_delivery(
+            other_tenant, create_event(other_tenant), create_endpoint(other_tenant, name="other-ep")
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            DeliveryStateMachine.schedule(other_delivery)
+
+        assert self._read(auth_client, HTTP_LAST_EVENT_ID="0-0") == []
+
+    def test_invalid_token_resets(self, auth_client):
+        assert [kind for kind, _, _ in self._read(auth_client, HTTP_LAST_EVENT_ID="bogus")] == ["reset"]
+
+    def test_requires_auth(self):
+        response = APIClient().get("/v1/deliveries/stream", HTTP_ACCEPT="text/event-stream")
+        assert response.status_code == 401
+        assert response.json()["error"]["code"]
@@ -1,4 +1,5 @@
 import uuid
+from unittest.mock import patch
 
 import pytest
 from rest_framework.test import APIClient
@@ -44,6 +45,20 @@ class TestEndpointsCRUD:
         assert response.status_code == 200
         assert response.json()["name"] == "updated-name"
 
+    def test_rename_propagates_to_deliveries_after_commit(
+        self, auth_client, endpoint, delivery, django_capture_on_commit_callbacks,
+    ):
+        with patch("apps.api.serializers.endpoints.propagate_endpoint_name") as mock_task:
+            with django_capture_on_commit_callbacks() as callbacks:
+                auth_client.patch(f"/v1/endpoints/ep_{endpoint.id}", {"name": "renamed"}, format="json")
+
+            delivery.refresh_from_db()
+            assert delivery.endpoint_name == endpoint.name
+            for callback in callbacks:
+                callback()
+
+        mock_task.delay.assert_called_once_with(str(endpoint.id))
+
     def test_delete_endpoint(self, auth_client, endpoint):
         response = auth_client.delete(f"/v1/endpoints/ep_{endpoint.id}")
         assert response.status_code == 204
@@ -82,3 +97,14 @@ class TestEndpointsCRUD:
         response = auth_client.get("/v1/endpoints")
         ep_ids = [ep["id"] for ep in response.json()]
         assert f"ep_{other_endpoint.id}" not in ep_ids
+
+    def test_list_etag(self, auth_client, endpoint, django_capture_on_commit_callbacks):
+        etag = auth_client.get("/v1/endpoints")["ETag"]
+        assert auth_client.get("/v1/endpoints", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        with django_capture_on_commit_callbacks(execute=True):
+            endpoint.pause()
+
+        response = auth_client.get("/v1/endpoints", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()[0]["status"] == "PAUSED"
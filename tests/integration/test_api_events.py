@@ -1,10 +1,15 @@
+import importlib
+import json
 import uuid
 from datetime import timedelta
 
 import pytest
+from django.db import connection
+from django.http import QueryDict
 from django.utils import timezone
 from rest_framework.test import APIClient
 
+from apps.api.filters import payload_filter
 from apps.api.prefixed_ids import from_prefixed
 from apps.deliveries.models import Delivery
 from apps.events.models import Event
@@ -35,12 +40,27 @@ class TestEventCreate:
         assert len(body["deliveries"]) == 1
         assert body["deliveries"][0]["created"] is True
         assert body["deliveries"][0]["delivery_id"].startswith("del_")
+        assert Event.objects.get(id=from_prefixed(body["event_id"], "evt_")).payload == {"order_id": 1}
 
         event_uuid = from_prefixed(body["event_id"], "evt_")
         delivery_uuid = from_prefixed(body["deliveries"][0]["delivery_id"], "del_")
         assert Event.objects.filter(id=event_uuid).exists()
         assert Delivery.objects.filter(id=delivery_uuid).exists()
 
+    def test_accepts_payload_containing_nul(self, auth_client, endpoint):
+        data = {
+            "type": "note.created",
+            "payload": {"note": "a\u0000b"},
+            "endpoint_ids": [f"ep_{endpoint.id}"],
+        }
+
+        response = auth_client.post("/v1/events", data, format="json")
+
+        assert response.status_code == 202
+        event = Event.objects.get(id=from_prefixed(response.json()["event_id"], "evt_"))
+        assert event.payload is None
+        assert json.loads(event.payload_json) == {"note": "a\u0000b"}
+
     def test_validates_endpoint_ids_belong_to_tenant(self, auth_client):
         other_tenant = create_tenant("other")
         other_endpoint = create_endpoint(other_tenant)
@@ -155,3 +175,197 @@ class TestEventCreate:
 
         response = auth_client.post("/v1/events", data, format="json")
         assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestEventList:
+    def test_lists_tenant_events_newest_first(self, auth_client, tenant):
+        first = create_event(tenant)
+        second = create_event(tenant)
+        create_event(create_tenant())
+
+        response = auth_client.get("/v1/events")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert {r["id"] for r in body["results"]} == {f"evt_{first.id}", f"evt_{second.id}"}
+        assert body["results"][0]["payload"] == {"key": "value"}
+        assert body["has_more"] is False
+
+    def test_cursor_pagination(self, auth_client, tenant):
+        events = [create_event(tenant) for _ in range(5)]
+
+        seen = []
+        cursor = None
+        while True:
+            url = "/v1/events?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            body = auth_client.get(url).json()
+            seen += [r["id"] for r in body["results"]]
+            cursor = body["next_cursor"]
+            if not body["has_more"]:
+                break
+
+        assert sorted(seen) == sorted(f"evt_{e.id}" for e in events)
+
+    def test_filter_by_type(self, auth_client, tenant):
+        create_event(tenant, type="order.created")
+        create_event(tenant, type="invoice.paid")
+
+        results = auth_client.get("/v1/events?type=invoice.paid").json()["results"]
+
+        assert [r["type"] for r in results] == ["invoice.paid"]
+
+    def test_filter_by_payload_key(self, auth_client, tenant):
+        match = create_event(tenant, payload={"order_id": "ord_123", "total": 10})
+        create_event(tenant, payload={"order_id": "ord_456"})
+
+        results = auth_client.get("/v1/events?payload.order_id=ord_123").json()["results"]
+
+        assert [r["id"] for r in results] == [f"evt_{match.id}"]
+
+    def test_filter_by_nested_key_and_number(self, auth_client, tenant):
+        match = create_event(tenant, payload={"customer": {"id": "cus_1"}, "total": 10})
+        create_event(tenant, payload={"customer": {"id": "cus_1"}, "total": 11})
+        create_event(tenant, payload={"customer": {"id": "cus_2"}, "total": 10})
+
+        results = auth_client.get("/v1/events?payload.customer.id=cus_1&payload.total=10").json()["results"]
+
+        assert [r["id"] for r in results] == [f"evt_{match.id}"]
+
+    def test_payload_filter_does_not_cross_tenants(self, auth_client):
+        create_event(create_tenant(), payload={"order_id": "ord_123"})
+
+        assert auth_client.get("/v1/events?payload.order_id=ord_123").json()["results"] == []
+
+    def test_invalid_payload_filter(self, auth_client):
+        response = auth_client.get("/v1/events?payload..id=1")
+
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_payload_filter_rejects_nul(self, auth_client):
+        response = auth_client.get("/v1/events?payload.note=a%00b")
+
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_payload_backfill_skips_payloads_jsonb_cannot_store(self, tenant):
+        backfill = importlib.import_module("apps.events.migrations.0003_backfill_event_payload")
+        plain = create_event(tenant, payload={"note": "ab"})
+        nul = create_event(tenant, payload={"note": "a\u0000b"})
+        escaped = create_event(tenant, payload={"note": "\\u0000"})
+        Event.objects.update(payload=None)
+
+        with connection.schema_editor() as schema_editor:
+            backfill.backfill_payload(None, schema_editor)
+
+        payloads = dict(Event.objects.values_list("id", "payload"))
+        assert payloads == {plain.id: {"note": "ab"}, nul.id: None, escaped.id: {"note": "\\u0000"}}
+
+    def test_listing_is_not_ingest_throttled(self, auth_client, settings):
+        settings.INGEST_RATE_LIMITS = {
+            "tenant": {"rate": 1, "burst": 1},
+            "api_key": {"rate": 1, "burst": 1},
+        }
+
+        assert [auth_client.get("/v1/events").status_code for _ in range(3)] == [200, 200, 200]
+
+    def test_payload_filter_uses_gin_index(self, tenant):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO events (id, tenant_id, type, payload_json, payload, payload_hash, created_at)
+                SELECT gen_random_uuid(), CASE WHEN n %% 2 = 0 THEN %s ELSE %s END, 'order.created', '{}',
+                    jsonb_build_object('order_id', 'ord_' || n), '', now()
+                FROM generate_series(1, 20000) AS n
+                """,
+                [tenant.id, create_tenant().id],
+            )
+            # Leave the payload index as the only way to find the tenant's rows, so the
+            # plan shows whether it can apply the tenant condition itself.
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE tablename = 'events' "
+                "AND indexname NOT IN ('events_pkey', 'idx_events_payload')"
+            )
+            for (index,) in cursor.fetchall():
+                cursor.execute(f'DROP INDEX "{index}"')
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        plan = Event.objects.filter(
+            payload_filter(QueryDict("payload.order_id=ord_124")), tenant=tenant,
+        ).explain()
+
+        assert "idx_events_payload" in plan
+        assert "Index Cond: ((tenant_id = " in plan
+
+
+@pytest.mark.django_db
+class TestEventIngestThrottling:
+    def _post(self, client, endpoint, n=0):
+        return client.post("/v1/events", {
+            "type": "order.created",
+            "payload": {"n": n},
+            "endpoint_ids": [f"ep_{endpoint.id}"],
+        }, format="json")
+
+    def test_api_key_rate_limit(self, auth_client, endpoint, settings):
+        settings.INGEST_RATE_LIMITS = {
+            "tenant": {"rate": 100, "burst": 100},
+            "api_key": {"rate": 1, "burst": 2},
+        }
+
+        responses = [self._post(auth_client, endpoint, n) for n in range(3)]
+
+        assert [r.status_code for r in responses] == [202, 202, 429]
+        assert responses[2].json()["error"]["code"] == "THROTTLED"
+        assert int(responses[2]["Retry-After"]) >= 1
+
+    def test_tenant_rate_limit_spans_api_keys(self, auth_client, tenant, endpoint, settings):
+        settings.INGEST_RATE_LIMITS = {
+            "tenant": {"rate": 1, "burst": 2},
+            "api_key": {"rate": 100, "burst": 100},
+        }
+        _, raw = create_api_key(tenant, name="second-key")
+        other_client = APIClient()
+        other_client.credentials(HTTP_AUTHORIZATION=f"Bearer {raw}")
+
+        assert self._post(auth_client, endpoint, 1).status_code == 202
+        assert self._post(other_client, endpoint, 2).status_code == 202
+        assert self._post(other_client, endpoint, 3).status_code == 429
+
+    def test_rate_limits_are_per_tenant(self, auth_client, endpoint, settings):
+        settings.INGEST_RATE_LIMITS = {
+            "tenant": {"rate": 1, "burst": 1},
+            "api_key": {"rate": 1, "burst": 1},
+        }
+        other_tenant = create_tenant()
+        other_endpoint = create_endpoint(other_tenant)
+        _, raw = create_api_key(other_tenant)
+        other_client = APIClient()
+        other_client.credentials(HTTP_AUTHORIZATION=f"Bearer {raw}")
+
+        assert self._post(auth_client, endpoint).status_code == 202
+        assert self._post(auth_client, endpoint, 1).status_code == 429
+        assert self._post(other_client, other_endpoint).status_code == 202
+
+    def test_sheds_load_above_backlog_limit(self, auth_client, tenant, endpoint, settings):
+        settings.TENANT_BACKLOG_LIMIT = 2
+
+        assert self._post(auth_client, endpoint, 1).status_code == 202
+        assert self._post(auth_client, endpoint, 2).status_code == 202
+        response = self._post(auth_client, endpoint, 3)
+
+        assert response.status_code == 429
+        assert response["Retry-After"] == str(settings.BACKLOG_SHED_RETRY_AFTER_SECONDS)
+        assert "backlog" in response.json()["error"]["message"]
+
+    def test_backlog_counter_resyncs_from_gauges(self, auth_client, tenant, endpoint, settings):
+        settings.TENANT_BACKLOG_LIMIT = 2
+        self._post(auth_client, endpoint, 1)
+        self._post(auth_client, endpoint, 2)
+        Delivery.objects.filter(tenant=tenant).update(status=Delivery.Status.DELIVERED)
+
+        from workers.gauges import refresh_backlog_gauges
+        refresh_backlog_gauges()
+
+        assert self._post(auth_client, endpoint, 3).status_code == 202
@@ -1,12 +1,15 @@
 import pytest
 
+from tests.factories import create_endpoint, create_tenant
+from workers import kill_switch
+
 
 @pytest.mark.django_db
 class TestKillSwitchAPI:
     def test_get_status(self, auth_client):
         response = auth_client.get("/v1/kill-switch")
         assert response.status_code == 200
-        assert response.json()["active"] is False
+        assert response.json() == {"active": False, "global": False, "endpoints": []}
 
     def test_activate(self, auth_client):
         response = auth_client.post("/v1/kill-switch", {"active": True}, format="json")
@@ -25,3 +28,62 @@ class TestKillSwitchAPI:
 
         response = auth_client.get("/v1/kill-switch")
         assert response.json()["active"] is True
+
+    def test_activate_is_scoped_to_own_tenant(self, auth_client, tenant):
+        other_tenant = create_tenant(name="other-tenant")
+
+        auth_client.post("/v1/kill-switch", {"active": True}, format="json")
+
+        assert kill_switch.is_active(tenant_id=tenant.id) is True
+        assert kill_switch.is_active(tenant_id=other_tenant.id) is False
+        assert kill_switch.is_active() is False
+
+    def test_endpoint_scope(self, auth_client, endpoint):
+        response = auth_client.post(
+            "/v1/kill-switch",
+            {"active": True, "scope": "endpoint", "endpoint_id": f"ep_{endpoint.id}"},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert response.json()["endpoints"] == [f"ep_{endpoint.id}"]
+        assert response.json()["active"] is False
+        assert kill_switch.is_active(endpoint_id=endpoint.id) is True
+
+    def test_endpoint_scope_rejects_other_tenants_endpoint(self, auth_client):
+        other_endpoint = create_endpoint(create_tenant(name="other-tenant"))
+
+        response = auth_client.post(
+            "/v1/kill-switch",
+            {"active": True, "scope": "endpoint", "endpoint_id": f"ep_{other_endpoint.id}"},
+            format="json",
+        )
+
+        assert response.status_code == 404
+        assert kill_switch.is_active(endpoint_id=other_endpoint.id) is False
+
+    def test_global_scope_requires_internal_secret(self, auth_client, settings):
+        settings.INTERNAL_API_SECRET = "internal-secret"
+
+        response = auth_client.post("/v1/kill-switch", {"active": True, "scope": "global"}, format="json")
+
+        assert response.status_code == 403
+        assert response.json()["error"]["code"] == "FORBIDDEN"
+        assert kill_switch.is_active() is False
+
+    def test_global_scope_with_internal_secret(self, auth_client, settings):
+        settings.INTERNAL_API_SECRET = "internal-secret"
+
+        response = auth_client.post(
+            "/v1/kill-switch",
+            {"active": True, "scope": "global"},
+            format="json",
+            HTTP_X_INTERNAL_SECRET="internal-secret",
+        )
+
+        assert response.status_code == 200
+        assert response.json()["global"] is True
+
+    def test_rejects_non_boolean_active(self, auth_client):
+        response = auth_client.post("/v1/kill-switch", {"active": "yes"}, format="json")
+        assert response.status_code == 400
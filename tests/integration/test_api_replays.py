@@ -56,3 +56,17 @@ class TestReplayCreate:
             "dry_run": False,
         }, format="json")
         assert response.status_code == 400
+
+    def test_replayed_deliveries_use_replay_origin(self, auth_client, tenant, event, endpoint):
+        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.FAILED)
+
+        response = auth_client.post("/v1/replays", {
+            "delivery_ids": [f"del_{delivery.id}"],
+            "dry_run": False,
+        }, format="json")
+
+        assert response.status_code == 201
+        item = DeliveryBatchItem.objects.get(source_delivery=delivery)
+        assert item.created_delivery.origin == Delivery.Origin.REPLAY
+        delivery.refresh_from_db()
+        assert delivery.origin == Delivery.Origin.EVENT
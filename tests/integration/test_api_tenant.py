@@ -16,3 +16,12 @@ class TestTenantInfo:
     def test_requires_auth(self):
         client = APIClient()
         assert client.get("/v1/tenant").status_code == 401
+
+    def test_reports_last_used_at(self, auth_client, api_key):
+        key, _ = api_key
+        auth_client.get("/v1/tenant")
+
+        response = auth_client.get("/v1/tenant")
+
+        reported = next(k for k in response.json()["api_keys"] if k["id"] == str(key.id))
+        assert reported["last_used_at"] is not None
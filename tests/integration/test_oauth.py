@@ -66,6 +66,23 @@ class TestOAuthProvision:
         ).count()
         assert active_keys == 1
 
+    def test_revoked_oauth_key_is_rejected_after_being_cached(self):
+        client = self.get_client()
+        data = {
+            "email": "cached@example.com",
+            "name": "Cached Key",
+            "provider": "google",
+            "provider_account_id": "google-cached",
+        }
+        old_key = client.post("/v1/auth/oauth-provision", data, format="json").json()["api_key"]
+        old_client = APIClient()
+        old_client.credentials(HTTP_AUTHORIZATION=f"Bearer {old_key}")
+        assert old_client.get("/v1/tenant").status_code == 200
+
+        client.post("/v1/auth/oauth-provision", data, format="json")
+
+        assert old_client.get("/v1/tenant").status_code == 401
+
     def test_rejects_invalid_secret(self):
         client = APIClient()
         client.credentials(HTTP_X_INTERNAL_SECRET="wrong-secret")
@@ -96,6 +113,7 @@ class TestRevokeSession:
 
         key_obj.refresh_from_db()
         assert key_obj.status == APIKey.Status.REVOKED
+        assert auth_client.get("/v1/tenant").status_code == 401
 
     def test_requires_auth(self):
         client = APIClient()
@@ -1,14 +1,20 @@
+import socket
+import threading
+import time
 from datetime import timedelta
 from unittest.mock import patch, MagicMock
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from apps.attempts.models import Attempt
 from apps.deliveries.models import Delivery
 from apps.deliveries.state_machine import DeliveryStateMachine
 from tests.factories import create_delivery, create_endpoint, create_event, create_tenant
-from workers import kill_switch
+from workers import endpoint_latency, kill_switch, success_rate, tenant_backlog
+from workers.redis_client import get_client
 
 
 @pytest.fixture
@@ -58,6 +64,19 @@ class TestExecuteDelivery:
         assert result["status"] == "skipped"
         assert result["reason"] == "kill_switch_active"
 
+    def test_respects_endpoint_kill_switch(self, setup, celery_eager):
+        tenant, endpoint, event = setup
+        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED)
+
+        kill_switch.activate(endpoint_id=endpoint.id)
+
+        from workers.delivery import execute_delivery
+        result = execute_delivery(str(delivery.id))
+
+        assert result["reason"] == "kill_switch_active"
+        delivery.refresh_from_db()
+        assert delivery.status == Delivery.Status.SCHEDULED
+
     def test_retryable_failure(self, setup, celery_eager):
         tenant, endpoint, event = setup
         delivery = create_delivery(
@@ -129,6 +148,91 @@ class TestExecuteDelivery:
         attempt = Attempt.objects.filter(delivery=delivery).first()
         assert attempt.classification == Attempt.Classification.NETWORK_ERROR
 
+    def test_abandons_attempt_when_lease_lost(self, setup, celery_eager):
+        tenant, endpoint, event = setup
+        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED)
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.text = "ok"
+
+        def post_after_lease_recovered(*args, **kwargs):
+            Delivery.objects.filter(id=delivery.id).update(
+                status=Delivery.Status.SCHEDULED, lease_id=None, lease_expires_at=None,
+            )
+            return mock_response
+
+        with patch("workers.delivery.httpx.Client") as mock_client:
+            mock_client.return_value.__enter__ = MagicMock(return_value=MagicMock(
+                post=MagicMock(side_effect=post_after_lease_recovered)
+            ))
+            mock_client.return_value.__exit__ = MagicMock(return_value=False)
+
+            from workers.delivery import execute_delivery
+            result = execute_delivery(str(delivery.id))
+
+        assert result == {"status": "abandoned", "reason": "lease_lost"}
+        assert not Attempt.objects.filter(delivery=delivery).exists()
+        delivery.refresh_from_db()
+        assert delivery.status == Delivery.Status.SCHEDULED
+
+
+    def test_lease_loss_interrupts_blocked_request(self, setup, settings, celery_eager):
+        tenant, endpoint, event = setup
+        settings.LEASE_HEARTBEAT_INTERVAL_SECONDS = 0.2
+        # A real endpoint that accepts the request and never answers.
+        server = socket.create_server(("127.0.0.1", 0))
+        connections = []
+        threading.Thread(target=lambda: connections.append(server.accept()[0]), daemon=True).start()
+        endpoint.url = f"http://127.0.0.1:{server.getsockname()[1]}/hook"
+        endpoint.timeout_seconds = 30
+        endpoint.save()
+        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED)
+
+        started = time.monotonic()
+        try:
+            with patch("workers.lease.DeliveryStateMachine.extend_lease", return_value=False):
+                from workers.delivery import execute_delivery
+                result = execute_delivery(str(delivery.id))
+        finally:
+            for conn in connections:
+                conn.close()
+            server.close()
+
+        assert result == {"status": "abandoned", "reason": "lease_lost"}
+        assert time.monotonic() - started < 5
+        assert not Attempt.objects.filter(delivery=delivery).exists()
+
+
+@pytest.mark.django_db
+class TestLeaseHeartbeat:
+    def test_beat_extends_lease(self, setup):
+        tenant, endpoint, event = setup
+        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED)
+        delivery = DeliveryStateMachine.acquire_lease(delivery)
+
+        from workers.lease import LeaseHeartbeat
+        heartbeat = LeaseHeartbeat(delivery.id, delivery.lease_id, 300)
+
+        assert heartbeat.beat() is True
+        assert not heartbeat.lost.is_set()
+
+    def test_beat_flags_lost_lease(self, setup):
+        tenant, endpoint, event = setup
+        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED)
+        delivery = DeliveryStateMachine.acquire_lease(delivery)
+        lease_id = delivery.lease_id
+        DeliveryStateMachine.bulk_recover_leases([delivery.id])
+        on_lost = MagicMock()
+
+        from workers.lease import LeaseHeartbeat
+        heartbeat = LeaseHeartbeat(delivery.id, lease_id, 300, on_lost=on_lost)
+
+        assert heartbeat.beat() is False
+        assert heartbeat.lost.is_set()
+        on_lost.assert_called_once()
+
 
 @pytest.mark.django_db
 class TestScheduleDueDeliveries:
@@ -137,7 +241,7 @@ class TestScheduleDueDeliveries:
         delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.PENDING)
 
         with patch("workers.delivery.execute_delivery") as mock_task:
-            mock_task.delay = MagicMock()
+            mock_task.apply_async = MagicMock()
             from workers.scheduler import schedule_due_deliveries
             result = schedule_due_deliveries()
 
@@ -152,13 +256,56 @@ class TestScheduleDueDeliveries:
         delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.PENDING)
 
         with patch("workers.delivery.execute_delivery") as mock_task:
-            mock_task.delay = MagicMock()
+            mock_task.apply_async = MagicMock()
             from workers.scheduler import schedule_due_deliveries
             schedule_due_deliveries()
 
         delivery.refresh_from_db()
         assert delivery.status == Delivery.Status.PENDING
 
+    def test_skips_tenants_paused_by_kill_switch(self, setup, celery_eager):
+        tenant, endpoint, event = setup
+        other_tenant = create_tenant(name="other-tenant")
+        other_endpoint = create_endpoint(other_tenant)
+        other_event = create_event(other_tenant)
+        due = timezone.now() - timedelta(seconds=5)
+        create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED, next_attempt_at=due)
+        pending = create_delivery(tenant, event, endpoint, status=Delivery.Status.PENDING)
+        other = create_delivery(
+            other_tenant, other_event, other_endpoint, status=Delivery.Status.SCHEDULED, next_attempt_at=due,
+        )
+
+        kill_switch.activate(tenant_id=tenant.id)
+
+        with patch("workers.delivery.execute_delivery") as mock_task:
+            mock_task.apply_async = MagicMock()
+            from workers.scheduler import schedule_due_deliveries
+            result = schedule_due_deliveries()
+
+        assert result["scheduled"] == 0
+        assert result["dispatched"] == 1
+        mock_task.apply_async.assert_called_once()
+        assert mock_task.apply_async.call_args.kwargs["args"] == [str(other.id)]
+        pending.refresh_from_db()
+        assert pending.status == Delivery.Status.PENDING
+
+    def test_skips_endpoints_paused_by_kill_switch(self, setup, celery_eager):
+        tenant, endpoint, event = setup
+        create_delivery(
+            tenant, event, endpoint,
+            status=Delivery.Status.SCHEDULED,
+            next_attempt_at=timezone.now() - timedelta(seconds=5),
+        )
+
+        kill_switch.activate(endpoint_id=endpoint.id)
+
+        with patch("workers.delivery.execute_delivery") as mock_task:
+            mock_task.apply_async = MagicMock()
+            from workers.scheduler import schedule_due_deliveries
+            schedule_due_deliveries()
+
+        assert mock_task.apply_async.call_count == 0
+
     def test_respects_concurrency_limit(self, setup, settings, celery_eager):
         tenant, endpoint, event = setup
 
@@ -172,11 +319,363 @@ class TestScheduleDueDeliveries:
         )
 
         with patch("workers.delivery.execute_delivery") as mock_task:
-            mock_task.delay = MagicMock()
+            mock_task.apply_async = MagicMock()
+            from workers.scheduler import schedule_due_deliveries
+            schedule_due_deliveries()
+
+        assert mock_task.apply_async.call_count == 0
+
+    def test_routes_deliveries_to_lane_queues(self, setup, settings, celery_eager):
+        tenant, endpoint, event = setup
+        due = timezone.now() - timedelta(seconds=5)
+        fresh = create_delivery(
+            tenant, event, endpoint, status=Delivery.Status.SCHEDULED, next_attempt_at=due,
+        )
+        retry = create_delivery(
+            tenant, event, endpoint,
+            status=Delivery.Status.SCHEDULED,
+            next_attempt_at=due,
+            attempts_count=settings.RETRY_LANE_MIN_ATTEMPT - 1,
+        )
+        replay = create_delivery(
+            tenant, event, endpoint,
+            status=Delivery.Status.SCHEDULED,
+            next_attempt_at=due,
+            origin=Delivery.Origin.REPLAY,
+        )
+
+        with patch("workers.delivery.execute_delivery") as mock_task:
+            mock_task.apply_async = MagicMock()
+            from workers.scheduler import schedule_due_deliveries
+            result = schedule_due_deliveries()
+
+        queues = {
+            call.kwargs["args"][0]: call.kwargs["queue"]
+            for call in mock_task.apply_async.call_args_list
+        }
+        assert queues == {
+            str(fresh.id): settings.DELIVERY_LANES["fresh"]["queue"],
+            str(retry.id): settings.DELIVERY_LANES["retry"]["queue"],
+            str(replay.id): settings.DELIVERY_LANES["replay"]["queue"],
+        }
+        assert result["dispatched_by_lane"] == {"fresh": 1, "retry": 1, "replay": 1, "slow": 0}
+
+    def test_retry_lane_budget_does_not_starve_fresh(self, setup, settings, celery_eager):
+        tenant, endpoint, event = setup
+        settings.DELIVERY_LANES = {
+            "fresh": {"queue": "deliveries.fresh", "budget": 5},
+            "retry": {"queue": "deliveries.retry", "budget": 2},
+            "replay": {"queue": "deliveries.replay", "budget": 1},
+            "slow": {"queue": "deliveries.slow", "budget": 1},
+        }
+        for _ in range(5):
+            create_delivery(
+                tenant, event, endpoint,
+                status=Delivery.Status.SCHEDULED,
+                next_attempt_at=timezone.now() - timedelta(minutes=10),
+                attempts_count=3,
+            )
+        fresh = create_delivery(
+            tenant, event, endpoint,
+            status=Delivery.Status.SCHEDULED,
+            next_attempt_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        with patch("workers.delivery.execute_delivery") as mock_task:
+            mock_task.apply_async = MagicMock()
+            from workers.scheduler import schedule_due_deliveries
+            result = schedule_due_deliveries()
+
+        assert result["dispatched_by_lane"] == {"fresh": 1, "retry": 2, "replay": 0, "slow": 0}
+        dispatched_ids = [call.kwargs["args"][0] for call in mock_task.apply_async.call_args_list]
+        assert str(fresh.id) in dispatched_ids
+
+    def test_routes_slow_endpoint_to_slow_lane(self, setup, settings, celery_eager):
+        tenant, endpoint, event = setup
+        healthy_endpoint = create_endpoint(tenant)
+        for _ in range(settings.SLOW_ENDPOINT_MIN_SAMPLES):
+            endpoint_latency.record(endpoint.id, settings.SLOW_ENDPOINT_P95_MS + 1000)
+
+        due = timezone.now() - timedelta(seconds=5)
+        slow = create_delivery(
+            tenant, event, endpoint, status=Delivery.Status.SCHEDULED, next_attempt_at=due,
+        )
+        healthy = create_delivery(
+            tenant, event, healthy_endpoint, status=Delivery.Status.SCHEDULED, next_attempt_at=due,
+        )
+
+        with patch("workers.delivery.execute_delivery") as mock_task:
+            mock_task.apply_async = MagicMock()
+            from workers.scheduler import schedule_due_deliveries
+            result = schedule_due_deliveries()
+
+        queues = {
+            call.kwargs["args"][0]: call.kwargs["queue"]
+            for call in mock_task.apply_async.call_args_list
+        }
+        assert queues == {
+            str(slow.id): settings.DELIVERY_LANES["slow"]["queue"],
+            str(healthy.id): settings.DELIVERY_LANES["fresh"]["queue"],
+        }
+        assert result["dispatched_by_lane"]["slow"] == 1
+        assert result["dispatched_by_lane"]["fresh"] == 1
+
+
+@pytest.mark.django_db
+class TestSchedulerHeadOfLineBlocking:
+    def test_paused_endpoint_backlog_does_not_block_pending(self, setup, celery_eager):
+        tenant, endpoint, event = setup
+        endpoint.pause()
+        for _ in range(150):
+            create_delivery(tenant, event, endpoint, status=Delivery.Status.PENDING)
+
+        other_tenant = create_tenant()
+        other_endpoint = create_endpoint(other_tenant)
+        other_event = create_event(other_tenant)
+        other = create_delivery(other_tenant, other_event, other_endpoint, status=Delivery.Status.PENDING)
+
+        with patch("workers.delivery.execute_delivery") as mock_task:
+            mock_task.apply_async = MagicMock()
+            from workers.scheduler import schedule_due_deliveries
+            result = schedule_due_deliveries()
+
+        other.refresh_from_db()
+        assert other.status == Delivery.Status.SCHEDULED
+        assert result["scheduled"] == 1
+
+    def test_paused_endpoint_backlog_does_not_block_dispatch(self, setup, celery_eager):
+        tenant, endpoint, event = setup
+        endpoint.pause()
+        due = timezone.now() - timedelta(minutes=5)
+        for _ in range(150):
+            create_delivery(
+                tenant, event, endpoint, status=Delivery.Status.SCHEDULED, next_attempt_at=due,
+            )
+
+        other_endpoint = create_endpoint(create_tenant())
+        other = create_delivery(
+            other_endpoint.tenant, create_event(other_endpoint.tenant), other_endpoint,
+            status=Delivery.Status.SCHEDULED,
+            next_attempt_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        with patch("workers.delivery.execute_delivery") as mock_task:
+            mock_task.apply_async = MagicMock()
+            from workers.scheduler import schedule_due_deliveries
+            schedule_due_deliveries()
+
+        dispatched_ids = [call.kwargs["args"][0] for call in mock_task.apply_async.call_args_list]
+        assert dispatched_ids == [str(other.id)]
+
+    def test_saturated_endpoint_backlog_does_not_block_dispatch(self, setup, settings, celery_eager):
+        tenant, endpoint, event = setup
+        for _ in range(settings.MAX_ENDPOINT_CONCURRENCY):
+            create_delivery(tenant, event, endpoint, status=Delivery.Status.IN_PROGRESS)
+        due = timezone.now() - timedelta(minutes=5)
+        for _ in range(150):
+            create_delivery(
+                tenant, event, endpoint, status=Delivery.Status.SCHEDULED, next_attempt_at=due,
+            )
+
+        other_endpoint = create_endpoint(tenant)
+        other = create_delivery(
+            tenant, event, other_endpoint,
+            status=Delivery.Status.SCHEDULED,
+            next_attempt_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        with patch("workers.delivery.execute_delivery") as mock_task:
+            mock_task.apply_async = MagicMock()
             from workers.scheduler import schedule_due_deliveries
             schedule_due_deliveries()
 
-        assert mock_task.delay.call_count == 0
+        dispatched_ids = [call.kwargs["args"][0] for call in mock_task.apply_async.call_args_list]
+        assert dispatched_ids == [str(other.id)]
+
+    def test_caps_dispatch_per_endpoint_to_headroom(self, setup, settings, celery_eager):
+        tenant, endpoint, event = setup
+        settings.MAX_ENDPOINT_CONCURRENCY = 5
+        settings.SCHEDULER_ENDPOINT_BATCH_CAP = 3
+        create_delivery(tenant, event, endpoint, status=Delivery.Status.IN_PROGRESS)
+        due = timezone.now() - timedelta(minutes=5)
+        for _ in range(50):
+            create_delivery(
+                tenant, event, endpoint, status=Delivery.Status.SCHEDULED, next_attempt_at=due,
+            )
+        for _ in range(50):
+            create_delivery(
+                tenant, event, endpoint,
+                status=Delivery.Status.SCHEDULED,
+                next_attempt_at=due,
+                attempts_count=3,
+            )
+
+        with patch("workers.delivery.execute_delivery") as mock_task:
+            mock_task.apply_async = MagicMock()
+            from workers.scheduler import schedule_due_deliveries
+            result = schedule_due_deliveries()
+
+        assert result["dispatched_by_lane"]["fresh"] == 3
+        assert result["dispatched_by_lane"]["retry"] == 1
+        assert mock_task.apply_async.call_count == 4
+
+
+@pytest.mark.django_db
+class TestSchedulerWarmup:
+    def _due_backlog(self, tenant, event, endpoint, count):
+        due = timezone.now() - timedelta(minutes=5)
+        for _ in range(count):
+            create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED, next_attempt_at=due)
+
+    def _dispatch(self):
+        with patch("workers.delivery.execute_delivery") as mock_task:
+            mock_task.apply_async = MagicMock()
+            from workers.scheduler import schedule_due_deliveries
+            schedule_due_deliveries()
+        return [call.kwargs["args"][0] for call in mock_task.apply_async.call_args_list]
+
+    def test_resumed_endpoint_ramps_up(self, setup, settings, celery_eager):
+        settings.WARMUP_INITIAL_FRACTION = 0.3
+        tenant, endpoint, event = setup
+        endpoint.pause()
+        self._due_backlog(tenant, event, endpoint, 20)
+
+        endpoint.resume()
+
+        assert len(self._dispatch()) == 3
+
+    def test_released_tenant_kill_switch_ramps_up(self, setup, settings, celery_eager):
+        tenant, endpoint, event = setup
+        kill_switch.activate(tenant_id=tenant.id)
+        self._due_backlog(tenant, event, endpoint, 20)
+
+        kill_switch.deactivate(tenant_id=tenant.id)
+
+        assert len(self._dispatch()) == 1
+
+    def test_released_global_kill_switch_scales_lane_budgets(self, setup, settings, celery_eager):
+        settings.DELIVERY_LANES = {**settings.DELIVERY_LANES, "fresh": {"queue": "deliveries.fresh", "budget": 20}}
+        settings.WARMUP_INITIAL_FRACTION = 0.25
+        kill_switch.activate()
+        for _ in range(8):
+            tenant = create_tenant()
+            self._due_backlog(tenant, create_event(tenant), create_endpoint(tenant), 2)
+
+        kill_switch.deactivate()
+
+        assert len(self._dispatch()) == 5
+
+    def test_no_warmup_when_switch_was_not_active(self, setup, celery_eager):
+        tenant, endpoint, event = setup
+        self._due_backlog(tenant, event, endpoint, 5)
+
+        kill_switch.deactivate(tenant_id=tenant.id)
+
+        assert len(self._dispatch()) == 5
+
+
+@pytest.mark.django_db
+class TestSchedulerSelectionCost:
+    ENDPOINTS = 20
+    BACKLOG = 50000
+
+    def _backlog(self, tenant, event, endpoints, status, next_attempt_at):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO deliveries (
+                    id, tenant_id, event_id, endpoint_id, mode, origin, status, attempts_count,
+                    idempotency_key_reused, cancel_requested, event_type, endpoint_name,
+                    next_attempt_at, created_at, updated_at
+                )
+                SELECT gen_random_uuid(), %s, %s, (%s::uuid[])[1 + n %% %s], 'RELIABLE', 'EVENT', %s, 0,
+                    false, false, '', '', %s, now() - n * interval '1 ms', now()
+                FROM generate_series(1, %s) AS n
+                """,
+                [tenant.id, event.id, [e.id for e in endpoints], len(endpoints), status,
+                 next_attempt_at, self.BACKLOG],
+            )
+
+    def _deliveries_rows_read(self, select):
+        """Rows read from deliveries by the last query `select()` runs, from EXPLAIN ANALYZE."""
+        with CaptureQueriesContext(connection) as queries:
+            select()
+        with connection.cursor() as cursor:
+            # The bulk-loaded rows have no statistics, so a probe may look as cheap
+            # sorted as read in index order; rule sorting out as the other plan tests do.
+            cursor.execute("SET LOCAL enable_sort = off")
+            cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + queries.captured_queries[-1]["sql"])
+            plan = cursor.fetchone()[0][0]["Plan"]
+
+        def walk(node):
+            rows = 0
+            if node.get("Relation Name") == "deliveries":
+                rows += (node["Actual Rows"] + node.get("Rows Removed by Filter", 0)) * node["Actual Loops"]
+            return rows + sum(walk(child) for child in node.get("Plans", []))
+
+        return walk(plan)
+
+    def test_due_batch_reads_bounded_rows(self, setup, settings):
+        tenant, _, event = setup
+        endpoints = [create_endpoint(tenant) for _ in range(self.ENDPOINTS)]
+        for _ in range(3):
+            create_delivery(tenant, event, endpoints[0], status=Delivery.Status.IN_PROGRESS)
+        self._backlog(tenant, event, endpoints, Delivery.Status.SCHEDULED, timezone.now() - timedelta(minutes=5))
+
+        from workers.scheduler import due_batch
+        rows_read = self._deliveries_rows_read(lambda: due_batch("fresh", timezone.now(), 50))
+
+        # One capped probe per endpoint, including the fixture's idle one.
+        assert rows_read <= (self.ENDPOINTS + 1) * settings.SCHEDULER_ENDPOINT_BATCH_CAP
+
+    def test_pending_batch_reads_bounded_rows(self, setup, settings):
+        tenant, _, event = setup
+        endpoints = [create_endpoint(tenant) for _ in range(self.ENDPOINTS)]
+        self._backlog(tenant, event, endpoints, Delivery.Status.PENDING, None)
+
+        from workers.scheduler import pending_batch
+        rows_read = self._deliveries_rows_read(lambda: list(pending_batch()))
+
+        assert rows_read <= (self.ENDPOINTS + 1) * settings.SCHEDULER_ENDPOINT_BATCH_CAP
+
+
+@pytest.mark.django_db
+class TestShardedScheduler:
+    def test_partitions_dispatch_each_delivery_once(self, setup, settings, celery_eager):
+        tenant, _, event = setup
+        settings.SCHEDULER_PARTITIONS = 4
+        due = timezone.now() - timedelta(seconds=5)
+        deliveries = [
+            create_delivery(
+                tenant, event, create_endpoint(tenant),
+                status=Delivery.Status.SCHEDULED,
+                next_attempt_at=due,
+            )
+            for _ in range(12)
+        ]
+
+        from workers.scheduler import run_scheduler_tick
+        dispatched_ids = []
+        for partitions in ({0, 1}, {2}, {3}):
+            with patch("workers.delivery.execute_delivery") as mock_task:
+                mock_task.apply_async = MagicMock()
+                run_scheduler_tick(partitions)
+            dispatched_ids += [call.kwargs["args"][0] for call in mock_task.apply_async.call_args_list]
+
+        assert sorted(dispatched_ids) == sorted(str(d.id) for d in deliveries)
+
+    def test_partition_filter_uses_index(self, setup):
+        tenant, _, _ = setup
+        for _ in range(50):
+            create_endpoint(tenant)
+
+        from workers.scheduler import _active_endpoints
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE endpoints")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = _active_endpoints({0, 1}).explain()
+
+        assert "idx_endpoints_partition" in plan
 
 
 @pytest.mark.django_db
@@ -215,3 +714,148 @@ class TestRecoverExpiredLeases:
         assert attempt is not None
         assert attempt.classification == Attempt.Classification.WORKER_CRASH_OR_UNKNOWN
         assert attempt.outcome == Attempt.Outcome.RETRYABLE_FAILURE
+
+    def test_recovers_many_leases_in_constant_queries(self, setup, django_assert_max_num_queries):
+        tenant, endpoint, event = setup
+        expired = timezone.now() - timedelta(seconds=60)
+        deliveries = [
+            create_delivery(
+                tenant, event, endpoint,
+                status=Delivery.Status.IN_PROGRESS,
+                lease_expires_at=expired,
+                attempts_count=2,
+            )
+            for _ in range(50)
+        ]
+        create_delivery(
+            tenant, event, endpoint,
+            status=Delivery.Status.IN_PROGRESS,
+            lease_expires_at=timezone.now() + timedelta(seconds=60),
+        )
+
+        from workers.lease import recover_expired_leases
+        with django_assert_max_num_queries(8):
+            result = recover_expired_leases()
+
+        assert result["recovered"] == 50
+        assert Attempt.objects.filter(
+            classification=Attempt.Classification.WORKER_CRASH_OR_UNKNOWN,
+            attempt_number=3,
+            request_payload_hash=event.payload_hash,
+        ).count() == 50
+        for delivery in deliveries:
+            delivery.refresh_from_db()
+            assert delivery.status == Delivery.Status.SCHEDULED
+            assert delivery.attempts_count == 3
+
+    def test_next_attempt_after_recovery_gets_new_number(self, setup, celery_eager):
+        tenant, endpoint, event = setup
+        delivery = create_delivery(
+            tenant, event, endpoint,
+            status=Delivery.Status.IN_PROGRESS,
+            lease_expires_at=timezone.now() - timedelta(seconds=60),
+            first_scheduled_at=timezone.now(),
+        )
+
+        from workers.lease import recover_expired_leases
+        recover_expired_leases()
+        Delivery.objects.filter(id=delivery.id).update(next_attempt_at=timezone.now())
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.text = "ok"
+
+        with patch("workers.delivery.httpx.Client") as mock_client:
+            mock_client.return_value.__enter__ = MagicMock(return_value=MagicMock(
+                post=MagicMock(return_value=mock_response)
+            ))
+            mock_client.return_value.__exit__ = MagicMock(return_value=False)
+
+            from workers.delivery import execute_delivery
+            result = execute_delivery(str(delivery.id))
+
+        assert result["attempt_number"] == 2
+        assert list(
+            Attempt.objects.filter(delivery=delivery).order_by("attempt_number").values_list("attempt_number", flat=True)
+        ) == [1, 2]
+
+
+@pytest.mark.django_db
+class TestPropagateEndpointName:
+    def test_updates_deliveries_in_batches(self, setup, settings):
+        tenant, endpoint, event = setup
+        settings.ENDPOINT_RENAME_BATCH_SIZE = 2
+        for _ in range(5):
+            create_delivery(tenant, event, endpoint)
+        other_endpoint = create_endpoint(tenant)
+        untouched = create_delivery(tenant, event, other_endpoint)
+        endpoint.name = "renamed"
+        endpoint.save()
+
+        from workers.endpoint_names import propagate_endpoint_name
+        with CaptureQueriesContext(connection) as queries:
+            result = propagate_endpoint_name(str(endpoint.id))
+
+        assert result == {"updated": 5}
+        assert sum(query["sql"].startswith("UPDATE") for query in queries) == 3
+        assert set(Delivery.objects.filter(endpoint=endpoint).values_list("endpoint_name", flat=True)) == {"renamed"}
+        untouched.refresh_from_db()
+        assert untouched.endpoint_name == other_endpoint.name
+
+
+@pytest.mark.django_db
+class TestRefreshBacklogGauges:
+    def test_sets_backlog_gauges_from_grouped_count(self, setup, django_assert_num_queries):
+        tenant, endpoint, event = setup
+        create_delivery(tenant, event, endpoint, status=Delivery.Status.PENDING)
+        create_delivery(tenant, event, endpoint, status=Delivery.Status.PENDING)
+        create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED)
+        create_delivery(tenant, event, endpoint, status=Delivery.Status.DELIVERED)
+
+        from workers.gauges import refresh_backlog_gauges
+        from workers.metrics import backlog_size
+        with django_assert_num_queries(1):
+            result = refresh_backlog_gauges()
+
+        assert result == {"PENDING": 2, "SCHEDULED": 1, "IN_PROGRESS": 0}
+        assert backlog_size.labels(status="PENDING")._value.get() == 2
+        assert backlog_size.labels(status="IN_PROGRESS")._value.get() == 0
+        assert get_client().hget(tenant_backlog.TENANT_BACKLOG_KEY, str(tenant.id)) == b"3"
+
+
+@pytest.mark.django_db
+class TestRefreshEndpointSuccessRates:
+    def test_sets_gauge_from_rolling_window(self, setup, django_assert_num_queries):
+        tenant, endpoint, event = setup
+        success_rate.record(endpoint.id, True)
+        success_rate.record(endpoint.id, False)
+
+        from workers.gauges import refresh_endpoint_success_rates
+        from workers.metrics import endpoint_success_rate
+        with django_assert_num_queries(1):
+            result = refresh_endpoint_success_rates()
+
+        assert result == {"endpoints": 1}
+        gauge = endpoint_success_rate.labels(endpoint_id=str(endpoint.id), endpoint_name=endpoint.name)
+        assert gauge._value.get() == 0.5
+
+    def test_execute_delivery_records_outcome(self, setup, celery_eager):
+        tenant, endpoint, event = setup
+        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED)
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.text = "ok"
+
+        with patch("workers.delivery.httpx.Client") as mock_client:
+            mock_client.return_value.__enter__ = MagicMock(return_value=MagicMock(
+                post=MagicMock(return_value=mock_response)
+            ))
+            mock_client.return_value.__exit__ = MagicMock(return_value=False)
+
+            from workers.delivery import execute_delivery
+            execute_delivery(str(delivery.id))
+
+        assert success_rate.success_rates([endpoint.id]) == {endpoint.id: 1.0}
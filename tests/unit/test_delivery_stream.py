@@ -0,0 +1,90 @@
+import json
+import time
+import uuid
+
+import pytest
+
+from workers import delivery_stream
+from workers.delivery_stream import STREAM_KEY, Subscription
+from workers.redis_client import get_client
+
+
+def _publish(tenant_id, delivery_id):
+    delivery_stream._send([(tenant_id, {"id": delivery_id})])
+    return get_client().xrevrange(STREAM_KEY.format(tenant_id=tenant_id), count=1)[0][0].decode()
+
+
+def _deliveries(events):
+    return [json.loads(data)["id"] for kind, _, data in events if kind == "delivery"]
+
+
+@pytest.mark.django_db
+class TestDeliveryStream:
+    def test_live_transitions(self):
+        tenant_id = uuid.uuid4()
+        with Subscription(tenant_id) as subscription:
+            events = subscription.events(None, heartbeat_seconds=0.05, max_seconds=5)
+            assert next(events) is None
+            _publish(tenant_id, "del_1")
+            _publish(uuid.uuid4(), "del_other")
+            _publish(tenant_id, "del_2")
+
+            received = []
+            for event in events:
+                if event is not None:
+                    received.append(event)
+                if len(received) == 2:
+                    break
+
+        assert _deliveries(received) == ["del_1", "del_2"]
+
+    def test_resume_replays_after_token(self):
+        tenant_id = uuid.uuid4()
+        first = _publish(tenant_id, "del_1")
+        _publish(tenant_id, "del_2")
+        _publish(tenant_id, "del_3")
+
+        with Subscription(tenant_id) as subscription:
+            events = [e for e in subscription.events(first, heartbeat_seconds=0.05, max_seconds=0.2) if e]
+
+        assert _deliveries(events) == ["del_2", "del_3"]
+
+    def test_trimmed_token_resets(self, settings):
+        settings.DELIVERY_STREAM_MAXLEN = 1
+        tenant_id = uuid.uuid4()
+        first = _publish(tenant_id, "del_1")
+        for n in range(200):
+            latest = _publish(tenant_id, f"del_{n}")
+
+        with Subscription(tenant_id) as subscription:
+            events = [e for e in subscription.events(first, heartbeat_seconds=0.05, max_seconds=0.2) if e]
+
+        assert events == [("reset", latest, None)]
+
+    def test_expired_token_resets(self, settings):
+        settings.DELIVERY_STREAM_RETENTION_SECONDS = 60
+        tenant_id = uuid.uuid4()
+        stale = f"{int((time.time() - 120) * 1000)}-0"
+
+        with Subscription(tenant_id) as subscription:
+            events = [e for e in subscription.events(stale, heartbeat_seconds=0.05, max_seconds=0.2) if e]
+
+        assert events == [("reset", "0-0", None)]
+
+    def test_heartbeat_when_idle(self):
+        with Subscription(uuid.uuid4()) as subscription:
+            events = list(subscription.events(None, heartbeat_seconds=0.05, max_seconds=0.2))
+
+        assert events and all(event is None for event in events)
+
+    def test_publish_waits_for_commit(self, django_capture_on_commit_callbacks):
+        tenant_id = uuid.uuid4()
+        key = STREAM_KEY.format(tenant_id=tenant_id)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            delivery_stream.publish((tenant_id, {"id": "del_1"}))
+        assert get_client().xlen(key) == 0
+
+        for callback in callbacks:
+            callback()
+        assert get_client().xlen(key) == 1
@@ -0,0 +1,70 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.cache import cache
+
+from workers.endpoint_latency import LATENCY_KEY, SLOW_KEY, percentile, record, slow_endpoint_ids
+from workers.redis_client import get_client
+
+
+class TestPercentile:
+    def test_p95_of_uniform_samples(self):
+        assert percentile(list(range(1, 101)), 95) == 95
+
+    def test_single_sample(self):
+        assert percentile([42], 95) == 42
+
+
+@pytest.mark.django_db
+class TestEndpointLatency:
+    def test_not_slow_below_min_samples(self, settings):
+        endpoint_id = uuid.uuid4()
+        for _ in range(settings.SLOW_ENDPOINT_MIN_SAMPLES - 1):
+            record(endpoint_id, settings.SLOW_ENDPOINT_P95_MS * 2)
+        assert slow_endpoint_ids({endpoint_id}) == set()
+
+    def test_flags_slow_endpoint(self, settings):
+        endpoint_id = uuid.uuid4()
+        for _ in range(settings.SLOW_ENDPOINT_MIN_SAMPLES):
+            record(endpoint_id, settings.SLOW_ENDPOINT_P95_MS + 100)
+        assert slow_endpoint_ids({endpoint_id}) == {endpoint_id}
+        assert cache.get(SLOW_KEY.format(endpoint_id=endpoint_id)) == settings.SLOW_ENDPOINT_P95_MS + 100
+
+    def test_recovers_when_latency_drops(self, settings):
+        endpoint_id = uuid.uuid4()
+        for _ in range(settings.SLOW_ENDPOINT_MIN_SAMPLES):
+            record(endpoint_id, settings.SLOW_ENDPOINT_P95_MS + 100)
+        for _ in range(settings.SLOW_ENDPOINT_SAMPLE_SIZE):
+            record(endpoint_id, 100)
+        assert slow_endpoint_ids({endpoint_id}) == set()
+
+    def test_stays_slow_between_thresholds(self, settings):
+        endpoint_id = uuid.uuid4()
+        for _ in range(settings.SLOW_ENDPOINT_MIN_SAMPLES):
+            record(endpoint_id, settings.SLOW_ENDPOINT_P95_MS + 100)
+        for _ in range(settings.SLOW_ENDPOINT_SAMPLE_SIZE):
+            record(endpoint_id, settings.SLOW_ENDPOINT_RECOVERY_P95_MS + 100)
+        assert slow_endpoint_ids({endpoint_id}) == {endpoint_id}
+
+    def test_slow_endpoint_ids(self, settings):
+        slow_id, healthy_id = uuid.uuid4(), uuid.uuid4()
+        for _ in range(settings.SLOW_ENDPOINT_MIN_SAMPLES):
+            record(slow_id, settings.SLOW_ENDPOINT_P95_MS + 100)
+            record(healthy_id, 100)
+        assert slow_endpoint_ids({slow_id, healthy_id}) == {slow_id}
+        assert slow_endpoint_ids(set()) == set()
+
+    def test_concurrent_records_are_not_lost(self, settings):
+        endpoint_id = uuid.uuid4()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: record(endpoint_id, 100), range(settings.SLOW_ENDPOINT_SAMPLE_SIZE)))
+        key = LATENCY_KEY.format(endpoint_id=endpoint_id)
+        assert get_client().llen(key) == settings.SLOW_ENDPOINT_SAMPLE_SIZE
+
+    def test_keeps_only_recent_samples(self, settings):
+        endpoint_id = uuid.uuid4()
+        for _ in range(settings.SLOW_ENDPOINT_SAMPLE_SIZE + 5):
+            record(endpoint_id, 100)
+        key = LATENCY_KEY.format(endpoint_id=endpoint_id)
+        assert get_client().llen(key) == settings.SLOW_ENDPOINT_SAMPLE_SIZE
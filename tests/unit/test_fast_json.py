@@ -0,0 +1,66 @@
+import io
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.api import fast_json
+from apps.api.fast_json import FastJSONParser, FastJSONRenderer
+
+
+@pytest.fixture(params=["orjson", "fallback"])
+def codec(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    return request.param
+
+
+RENDER_CASES = [
+    {"id": uuid.UUID("6ba7b810-9dad-11d1-80b4-00c04fd430c8")},
+    {"at": datetime(2024, 1, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc)},
+    {"at": datetime(2024, 1, 1, 12, 30, 15, tzinfo=dt_timezone(timedelta(hours=-5)))},
+    {"day": date(2024, 1, 1), "amount": Decimal("9.99")},
+    {"name": "Zürich ✓", "separator": "a b c", "nested": [None, True, 1.5, {"k": []}]},
+    {1: "int key", "big": 2**70},
+]
+
+
+class TestFastJSONRenderer:
+    @pytest.mark.parametrize("data", RENDER_CASES)
+    def test_matches_stock_renderer(self, codec, data):
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent_matches_stock_renderer(self, codec):
+        data = {"a": [1, 2]}
+        media_type = "application/json; indent=2"
+
+        assert FastJSONRenderer().render(data, media_type) == JSONRenderer().render(data, media_type)
+
+    def test_none_renders_empty(self, codec):
+        assert FastJSONRenderer().render(None) == b""
+
+
+class TestFastJSONParser:
+    @pytest.mark.parametrize("body", [
+        b'{"type": "order.created", "payload": {"amount": 9.99, "name": "Z\\u00fcrich"}}',
+        '{"name": "Zürich"}'.encode(),
+        b'{"big": 123456789012345678901234567890}',
+        b'[1, 2.5, null, true]',
+    ])
+    def test_matches_stock_parser(self, codec, body):
+        assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+    @pytest.mark.parametrize("body", [b'{"a": ', b'{"a": NaN}'])
+    def test_invalid_json_raises_stock_error(self, codec, body):
+        with pytest.raises(ParseError) as fast_error:
+            FastJSONParser().parse(io.BytesIO(body))
+        with pytest.raises(ParseError) as stock_error:
+            JSONParser().parse(io.BytesIO(body))
+
+        assert str(fast_error.value) == str(stock_error.value)
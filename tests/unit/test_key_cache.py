@@ -0,0 +1,158 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.tenants import key_cache
+from apps.tenants.models import APIKey
+from tests.factories import create_api_key, create_tenant
+from workers.redis_client import get_client
+
+
+@pytest.mark.django_db
+class TestAPIKeyCache:
+    def test_cached_lookup_skips_database(self, django_assert_num_queries):
+        tenant = create_tenant()
+        key, raw = create_api_key(tenant)
+        APIKey.get_from_key(raw)
+
+        with django_assert_num_queries(0):
+            cached = APIKey.get_from_key(raw)
+
+        assert cached.id == key.id
+        assert cached.tenant.id == tenant.id
+        assert cached.tenant.name == tenant.name
+
+    def test_redis_tier_serves_other_processes(self, django_assert_num_queries):
+        _, raw = create_api_key(create_tenant())
+        APIKey.get_from_key(raw)
+        key_cache.clear_local()
+
+        with django_assert_num_queries(0):
+            assert APIKey.get_from_key(raw) is not None
+
+    def test_cached_key_can_be_saved(self):
+        key, raw = create_api_key(create_tenant())
+        APIKey.get_from_key(raw)
+
+        APIKey.get_from_key(raw).update_last_used()
+
+        key.refresh_from_db()
+        assert key.last_used_at is not None
+
+    def test_revoke_invalidates_both_tiers(self):
+        key, raw = create_api_key(create_tenant())
+        APIKey.get_from_key(raw)
+
+        key.revoke()
+
+        assert key_cache.lookup(key.key_hash) is None
+        assert APIKey.get_from_key(raw) is None
+
+    def test_queryset_revoke_invalidates(self):
+        tenant = create_tenant()
+        _, first = create_api_key(tenant, name="first")
+        _, second = create_api_key(tenant, name="second")
+        APIKey.get_from_key(first)
+        APIKey.get_from_key(second)
+
+        assert APIKey.objects.filter(tenant=tenant).revoke() == 2
+
+        assert APIKey.get_from_key(first) is None
+        assert APIKey.get_from_key(second) is None
+
+    def test_invalidation_broadcast_evicts_local_entry(self, settings):
+        key, _ = create_api_key(create_tenant())
+        key_cache.lookup(key.key_hash)
+        deadline = time.monotonic() + 2
+        while get_client().pubsub_numsub(key_cache.API_KEY_INVALIDATION_CHANNEL)[0][1] == 0:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        key_cache.store(key.key_hash, key.to_snapshot())
+
+        get_client().publish(key_cache.API_KEY_INVALIDATION_CHANNEL, key.key_hash)
+
+        deadline = time.monotonic() + 2
+        while key_cache._get_local(key.key_hash) is not None:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    def test_falls_back_to_database_without_redis(self):
+        key, raw = create_api_key(create_tenant())
+        with patch("apps.tenants.key_cache.cache") as mock_cache, \
+                patch("apps.tenants.key_cache.get_client") as mock_get_client:
+            mock_cache.get.side_effect = ConnectionError("redis down")
+            mock_cache.set.side_effect = ConnectionError("redis down")
+            mock_cache.delete_many.side_effect = ConnectionError("redis down")
+            mock_get_client.side_effect = ConnectionError("redis down")
+
+            assert APIKey.get_from_key(raw).id == key.id
+            key.revoke()
+            assert APIKey.get_from_key(raw) is None
+
+    def test_local_tier_is_bounded(self, settings):
+        settings.API_KEY_CACHE_LOCAL_SIZE = 2
+        for key_hash in ["a", "b", "c"]:
+            key_cache.store(key_hash, {"key": {}, "tenant": {}})
+
+        assert key_cache._get_local("a") is None
+        assert key_cache._get_local("c") is not None
+
+
+@pytest.mark.django_db
+class TestLastUsedThrottle:
+    def test_writes_once_per_interval(self, django_assert_num_queries):
+        key, _ = create_api_key(create_tenant())
+        key.update_last_used()
+        first_used_at = key.last_used_at
+
+        other = APIKey.objects.get(id=key.id)
+        other.last_used_at = None
+        with django_assert_num_queries(0):
+            other.update_last_used()
+            key.update_last_used()
+
+        key.refresh_from_db()
+        assert key.last_used_at == first_used_at
+
+    def test_writes_again_after_interval(self, settings):
+        settings.API_KEY_LAST_USED_INTERVAL_SECONDS = 1
+        key, _ = create_api_key(create_tenant())
+        key.update_last_used()
+        first_used_at = key.last_used_at
+
+        time.sleep(1.1)
+        key.update_last_used()
+
+        key.refresh_from_db()
+        assert key.last_used_at > first_used_at
+
+    def test_writes_without_redis(self):
+        key, _ = create_api_key(create_tenant())
+        with patch("apps.tenants.models.cache") as mock_cache:
+            mock_cache.add.side_effect = ConnectionError("redis down")
+            key.update_last_used()
+
+        key.refresh_from_db()
+        assert key.last_used_at is not None
+
+
+@pytest.mark.django_db
+class TestAuthenticationWithoutRedis:
+    def test_authenticated_request_succeeds(self, settings):
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:1/0",
+            },
+        }
+        _, raw = create_api_key(create_tenant())
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {raw}")
+
+        with patch("apps.tenants.key_cache.get_client") as mock_get_client:
+            mock_get_client.side_effect = ConnectionError("redis down")
+            response = client.get("/v1/endpoints")
+
+        assert response.status_code == 200
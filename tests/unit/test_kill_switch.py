@@ -1,6 +1,19 @@
+import time
+from unittest.mock import patch
+
 import pytest
 
-from workers.kill_switch import activate, deactivate, is_active
+from django.core.cache import cache
+
+from workers.kill_switch import (
+    KILL_SWITCH_CHANNEL,
+    KILL_SWITCH_KEY,
+    activate,
+    deactivate,
+    is_active,
+    paused_scopes,
+)
+from workers.redis_client import get_client
 
 
 @pytest.mark.django_db
@@ -25,3 +38,88 @@ class TestKillSwitch:
     def test_deactivate_when_already_inactive(self):
         deactivate()
         assert is_active() is False
+
+
+@pytest.mark.django_db
+class TestScopedKillSwitch:
+    TENANT_ID = "11111111-1111-1111-1111-111111111111"
+    OTHER_TENANT_ID = "22222222-2222-2222-2222-222222222222"
+    ENDPOINT_ID = "33333333-3333-3333-3333-333333333333"
+
+    def test_tenant_scope(self):
+        activate(tenant_id=self.TENANT_ID)
+
+        assert is_active(tenant_id=self.TENANT_ID) is True
+        assert is_active(tenant_id=self.OTHER_TENANT_ID) is False
+        assert is_active() is False
+
+    def test_endpoint_scope(self):
+        activate(endpoint_id=self.ENDPOINT_ID)
+
+        assert is_active(tenant_id=self.TENANT_ID, endpoint_id=self.ENDPOINT_ID) is True
+        assert is_active(tenant_id=self.TENANT_ID) is False
+
+    def test_global_covers_every_scope(self):
+        activate()
+        assert is_active(tenant_id=self.TENANT_ID, endpoint_id=self.ENDPOINT_ID) is True
+
+    def test_deactivate_scope(self):
+        activate(tenant_id=self.TENANT_ID)
+        activate(endpoint_id=self.ENDPOINT_ID)
+        deactivate(tenant_id=self.TENANT_ID)
+
+        assert paused_scopes() == (frozenset(), frozenset({self.ENDPOINT_ID}))
+
+
+@pytest.mark.django_db
+class TestKillSwitchLocalCache:
+    def _wait_for(self, predicate, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_cached_read_skips_redis(self):
+        assert is_active() is False
+        with patch("workers.kill_switch.get_client") as mock_get_client:
+            assert is_active(tenant_id="11111111-1111-1111-1111-111111111111") is False
+            assert paused_scopes() == (frozenset(), frozenset())
+        mock_get_client.assert_not_called()
+
+    def test_pubsub_update_reaches_other_processes(self):
+        assert is_active() is False
+        assert self._wait_for(lambda: get_client().pubsub_numsub(KILL_SWITCH_CHANNEL)[0][1] > 0)
+
+        get_client().set(KILL_SWITCH_KEY, "1")
+        get_client().publish(KILL_SWITCH_CHANNEL, "changed")
+
+        assert self._wait_for(lambda: is_active() is True)
+
+    def test_falls_back_to_polling_after_ttl(self, settings):
+        settings.KILL_SWITCH_LOCAL_TTL_SECONDS = 0
+        assert is_active() is False
+
+        get_client().set(KILL_SWITCH_KEY, "1")
+
+        assert is_active() is True
+
+    def test_uses_cached_state_when_redis_fails(self, settings):
+        activate()
+        settings.KILL_SWITCH_LOCAL_TTL_SECONDS = 0
+
+        with patch("workers.kill_switch.get_client") as mock_get_client:
+            mock_get_client.side_effect = ConnectionError("redis down")
+            assert is_active() is True
+
+    def test_honours_switch_set_under_legacy_cache_key(self):
+        cache.set(KILL_SWITCH_KEY, "1", timeout=None)
+
+        assert is_active() is True
+        assert get_client().get(KILL_SWITCH_KEY) == b"1"
+
+        deactivate()
+
+        assert is_active() is False
+        assert cache.get(KILL_SWITCH_KEY) is None
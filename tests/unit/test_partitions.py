@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from workers.partitions import MEMBERS_KEY, PARTITION_LEASE_KEY, PartitionHeartbeat, PartitionOwner
+from workers.redis_client import get_client
+
+
+@pytest.mark.django_db
+class TestPartitionOwner:
+    def test_single_instance_owns_all_partitions(self, settings):
+        settings.SCHEDULER_PARTITIONS = 8
+        owner = PartitionOwner(instance_id="a")
+        assert owner.rebalance() == set(range(8))
+
+    def test_instances_split_partitions_without_overlap(self, settings):
+        settings.SCHEDULER_PARTITIONS = 8
+        first = PartitionOwner(instance_id="a")
+        second = PartitionOwner(instance_id="b")
+
+        first.rebalance()
+        second.rebalance()
+        first.rebalance()
+        owned_first = first.rebalance()
+        owned_second = second.rebalance()
+
+        assert owned_first | owned_second == set(range(8))
+        assert owned_first & owned_second == set()
+        assert len(owned_first) == len(owned_second) == 4
+
+    def test_survivor_takes_over_after_instance_dies(self, settings):
+        settings.SCHEDULER_PARTITIONS = 8
+        first = PartitionOwner(instance_id="a")
+        second = PartitionOwner(instance_id="b")
+        first.rebalance()
+        second.rebalance()
+        first.rebalance()
+        second.rebalance()
+
+        client = get_client()
+        client.zrem("deliverant:scheduler:members", "b")
+        for partition in second.owned:
+            client.delete(PARTITION_LEASE_KEY.format(partition=partition))
+
+        assert first.rebalance() == set(range(8))
+
+    def test_release_all_frees_leases(self, settings):
+        settings.SCHEDULER_PARTITIONS = 4
+        owner = PartitionOwner(instance_id="a")
+        owner.rebalance()
+        owner.release_all()
+
+        other = PartitionOwner(instance_id="b")
+        assert other.rebalance() == set(range(4))
+
+    def test_heartbeat_keeps_leases_through_long_tick(self, settings):
+        settings.SCHEDULER_PARTITIONS = 2
+        settings.SCHEDULER_PARTITION_LEASE_SECONDS = 1
+        owner = PartitionOwner(instance_id="a")
+        owner.rebalance()
+
+        with PartitionHeartbeat(owner, interval_seconds=0.2):
+            time.sleep(1.5)
+
+        client = get_client()
+        assert client.get(PARTITION_LEASE_KEY.format(partition=0)) == b"a"
+        assert client.get(PARTITION_LEASE_KEY.format(partition=1)) == b"a"
+        assert client.zscore(MEMBERS_KEY, "a") > time.time() - 1
+        assert PartitionOwner(instance_id="b").rebalance() == set()
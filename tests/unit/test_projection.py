@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.api.serializers.deliveries import (
+    ATTEMPT_PROJECTION,
+    DELIVERY_PROJECTION,
+    AttemptSerializer,
+    DeliverySerializer,
+)
+from apps.attempts.models import Attempt
+from apps.deliveries.models import Delivery
+from tests.factories import create_attempt, create_delivery
+
+
+def _render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+class TestDeliveryProjection:
+    def test_fields_match_serializer(self):
+        assert [key for key, _, _ in DELIVERY_PROJECTION.fields] == DeliverySerializer.Meta.fields
+        assert [key for key, _, _ in ATTEMPT_PROJECTION.fields] == AttemptSerializer.Meta.fields
+
+    def test_matches_delivery_serializer(self, tenant, event, endpoint):
+        now = timezone.now()
+        create_delivery(tenant, event, endpoint)
+        create_delivery(
+            tenant, event, endpoint,
+            status=Delivery.Status.FAILED,
+            attempts_count=3,
+            next_attempt_at=now + timedelta(minutes=5),
+            first_scheduled_at=now,
+            last_attempt_at=now,
+            terminal_at=now,
+            terminal_reason="max_attempts",
+            cancel_requested=True,
+        )
+        queryset = Delivery.objects.filter(tenant=tenant).order_by("-created_at", "-id")
+
+        expected = DeliverySerializer(queryset.select_related("endpoint", "event"), many=True).data
+        actual = DELIVERY_PROJECTION.serialize(queryset.values(*DELIVERY_PROJECTION.sources))
+
+        assert _render(actual) == _render(expected)
+
+    def test_matches_attempt_serializer(self, tenant, delivery):
+        create_attempt(tenant, delivery, attempt_number=1, http_status=200, response_headers_json={"x-id": "1"})
+        create_attempt(
+            tenant, delivery,
+            attempt_number=2,
+            ended_at=None,
+            latency_ms=None,
+            outcome=Attempt.Outcome.RETRYABLE_FAILURE,
+            classification=Attempt.Classification.TIMEOUT,
+            error_detail="timed out",
+        )
+        queryset = Attempt.objects.filter(delivery=delivery).order_by("attempt_number")
+
+        expected = AttemptSerializer(queryset, many=True).data
+        actual = ATTEMPT_PROJECTION.serialize(queryset.values(*ATTEMPT_PROJECTION.sources))
+
+        assert _render(actual) == _render(expected)
+
+    def test_formats_datetimes_in_current_timezone(self, tenant, event, endpoint):
+        delivery = create_delivery(tenant, event, endpoint)
+        queryset = Delivery.objects.filter(id=delivery.id)
+
+        with timezone.override("America/New_York"):
+            expected = DeliverySerializer(queryset, many=True).data
+            actual = DELIVERY_PROJECTION.serialize(queryset.values(*DELIVERY_PROJECTION.sources))
+
+        assert _render(actual) == _render(expected)
+        assert not actual[0]["created_at"].endswith("Z")
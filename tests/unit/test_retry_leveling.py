@@ -0,0 +1,56 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.deliveries.state_machine import compute_next_attempt
+from workers.retry_leveling import PLANNED_KEY, leveled_retry_time
+
+
+def _planned_attempts(when):
+    bucket = int(when.timestamp() // settings.RETRY_LEVELING_BUCKET_SECONDS)
+    return int(cache.get(PLANNED_KEY.format(bucket=bucket)) or 0)
+
+
+@pytest.mark.django_db
+class TestRetryLeveling:
+    def test_stays_within_jitter_bounds(self):
+        now = timezone.now()
+        for _ in range(50):
+            result = leveled_retry_time(now, 120)
+            assert now <= result <= now + timedelta(seconds=120)
+
+    def test_counts_planned_attempts(self):
+        now = timezone.now()
+        result = leveled_retry_time(now, 0)
+        assert result == now
+        assert _planned_attempts(now) == 1
+
+    def test_flattens_load_across_buckets(self, settings):
+        settings.RETRY_LEVELING_BUCKET_SECONDS = 10
+        settings.RETRY_LEVELING_CHOICES = 3
+        now = timezone.now().replace(microsecond=0)
+        now = now - timedelta(seconds=now.timestamp() % 10)
+
+        for _ in range(600):
+            leveled_retry_time(now, 600)
+
+        counts = [_planned_attempts(now + timedelta(seconds=10 * i)) for i in range(60)]
+        assert sum(counts) == 600
+        assert max(counts) <= 15
+
+    def test_falls_back_to_plain_jitter_when_cache_fails(self):
+        now = timezone.now()
+        with patch("workers.retry_leveling.cache") as mock_cache:
+            mock_cache.get_many.side_effect = ConnectionError("redis down")
+            result = leveled_retry_time(now, 30)
+        assert now <= result <= now + timedelta(seconds=30)
+
+    def test_compute_next_attempt_uses_leveling_when_enabled(self, settings):
+        settings.RETRY_LEVELING_ENABLED = True
+        with patch("apps.deliveries.state_machine.retry_leveling.leveled_retry_time") as mock_level:
+            compute_next_attempt(3)
+        assert mock_level.call_args.args[1] == 120
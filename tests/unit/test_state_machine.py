@@ -3,6 +3,7 @@ from datetime import timedelta
 from unittest.mock import patch
 
 from django.utils import timezone
+from redis.client import Pipeline
 
 from apps.deliveries.models import Delivery
 from apps.deliveries.state_machine import (
@@ -11,6 +12,8 @@ from apps.deliveries.state_machine import (
     compute_next_attempt,
 )
 from tests.factories import create_delivery, create_endpoint, create_event, create_tenant
+from workers import delivery_stream, versions
+from workers.redis_client import get_client
 
 
 @pytest.fixture
@@ -32,6 +35,23 @@ class TestSchedule:
         assert result.next_attempt_at is not None
         assert result.first_scheduled_at is not None
 
+    def test_publishes_and_bumps_version_in_one_round_trip(self, setup, django_capture_on_commit_callbacks):
+        tenant, endpoint, event = setup
+        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.PENDING)
+        [before] = versions.current(tenant.id, versions.DELIVERIES)
+        stream_key = delivery_stream.STREAM_KEY.format(tenant_id=tenant.id)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            DeliveryStateMachine.schedule(delivery)
+        assert len(callbacks) == 1
+
+        with patch.object(Pipeline, "execute", autospec=True, side_effect=Pipeline.execute) as mock_execute:
+            callbacks[0]()
+
+        assert mock_execute.call_count == 1
+        assert versions.current(tenant.id, versions.DELIVERIES) == [before + 1]
+        assert get_client().xlen(stream_key) == 1
+
     def test_rejects_non_pending(self, setup):
         tenant, endpoint, event = setup
         delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED)
@@ -80,6 +100,38 @@ class TestAcquireLease:
         with pytest.raises(ValueError, match="Cannot acquire lease"):
             DeliveryStateMachine.acquire_lease(delivery)
 
+    def test_lease_covers_long_endpoint_timeout(self, setup, settings):
+        tenant, _, event = setup
+        endpoint = create_endpoint(tenant, timeout_seconds=120)
+        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED)
+
+        result = DeliveryStateMachine.acquire_lease(delivery)
+
+        lease_seconds = (result.lease_expires_at - timezone.now()).total_seconds()
+        assert lease_seconds > 120 + settings.LEASE_GRACE_SECONDS - 5
+
+
+class TestExtendLease:
+    def test_extends_held_lease(self, setup):
+        tenant, endpoint, event = setup
+        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED)
+        delivery = DeliveryStateMachine.acquire_lease(delivery)
+        original_expiry = delivery.lease_expires_at
+
+        assert DeliveryStateMachine.extend_lease(delivery.id, delivery.lease_id, 300) is True
+
+        delivery.refresh_from_db()
+        assert delivery.lease_expires_at > original_expiry
+
+    def test_fails_when_lease_lost(self, setup):
+        tenant, endpoint, event = setup
+        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.SCHEDULED)
+        delivery = DeliveryStateMachine.acquire_lease(delivery)
+        lease_id = delivery.lease_id
+        DeliveryStateMachine.bulk_recover_leases([delivery.id])
+
+        assert DeliveryStateMachine.extend_lease(delivery.id, lease_id, 300) is False
+
 
 class TestCompleteSuccess:
     def test_in_progress_to_delivered(self, setup):
@@ -175,17 +227,25 @@ class TestCancel:
                 DeliveryStateMachine.cancel(delivery)
 
 
-class TestRecoverLease:
-    def test_in_progress_to_scheduled(self, setup, settings):
+class TestBulkRecoverLeases:
+    def test_reschedules_in_progress_only(self, setup):
         tenant, endpoint, event = setup
-        delivery = create_delivery(tenant, event, endpoint, status=Delivery.Status.IN_PROGRESS)
-
-        result = DeliveryStateMachine.recover_lease(delivery)
-
-        assert result.status == Delivery.Status.SCHEDULED
-        assert result.next_attempt_at is not None
-        assert result.lease_id is None
-        assert result.lease_expires_at is None
+        in_progress = create_delivery(
+            tenant, event, endpoint, status=Delivery.Status.IN_PROGRESS, attempts_count=1,
+        )
+        delivered = create_delivery(tenant, event, endpoint, status=Delivery.Status.DELIVERED)
+
+        recovered = DeliveryStateMachine.bulk_recover_leases([in_progress.id, delivered.id])
+
+        assert recovered == 1
+        in_progress.refresh_from_db()
+        delivered.refresh_from_db()
+        assert in_progress.status == Delivery.Status.SCHEDULED
+        assert in_progress.attempts_count == 2
+        assert in_progress.lease_id is None
+        assert in_progress.lease_expires_at is None
+        assert in_progress.next_attempt_at is not None
+        assert delivered.status == Delivery.Status.DELIVERED
 
 
 class TestBackoff:
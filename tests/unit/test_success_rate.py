@@ -0,0 +1,29 @@
+import uuid
+
+import pytest
+
+from workers.success_rate import record, success_rates
+
+
+@pytest.mark.django_db
+class TestSuccessRate:
+    def test_no_attempts(self):
+        assert success_rates([uuid.uuid4()]) == {}
+
+    def test_rate_within_window(self):
+        endpoint_id = uuid.uuid4()
+        for success in (True, True, True, False):
+            record(endpoint_id, success, now=1000)
+        assert success_rates([endpoint_id], now=1000) == {endpoint_id: 0.75}
+
+    def test_old_buckets_leave_the_window(self, settings):
+        endpoint_id = uuid.uuid4()
+        record(endpoint_id, False, now=1000)
+        record(endpoint_id, True, now=1000 + settings.SUCCESS_RATE_WINDOW_SECONDS)
+        assert success_rates([endpoint_id], now=1000 + settings.SUCCESS_RATE_WINDOW_SECONDS) == {endpoint_id: 1.0}
+
+    def test_success_rates_for_many_endpoints(self):
+        first, second, idle = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        record(first, True, now=1000)
+        record(second, False, now=1000)
+        assert success_rates([first, second, idle], now=1000) == {first: 1.0, second: 0.0}
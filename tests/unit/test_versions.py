@@ -0,0 +1,43 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from workers import versions
+
+
+@pytest.mark.django_db
+class TestVersions:
+    def test_counter_is_stable_without_writes(self):
+        tenant_id = uuid.uuid4()
+        assert versions.current(tenant_id, versions.DELIVERIES) == versions.current(tenant_id, versions.DELIVERIES)
+
+    def test_bump_advances_after_commit(self, django_capture_on_commit_callbacks):
+        tenant_id = uuid.uuid4()
+        [before] = versions.current(tenant_id, versions.DELIVERIES)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            versions.bump(versions.DELIVERIES, tenant_id)
+            assert versions.current(tenant_id, versions.DELIVERIES) == [before]
+
+        for callback in callbacks:
+            callback()
+        assert versions.current(tenant_id, versions.DELIVERIES) == [before + 1]
+
+    def test_scopes_and_tenants_are_independent(self, django_capture_on_commit_callbacks):
+        tenant_id, other_tenant_id = uuid.uuid4(), uuid.uuid4()
+        before = versions.current(tenant_id, versions.DELIVERIES, versions.ENDPOINTS)
+        other_before = versions.current(other_tenant_id, versions.DELIVERIES)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            versions.bump(versions.ENDPOINTS, tenant_id)
+
+        assert versions.current(tenant_id, versions.DELIVERIES, versions.ENDPOINTS) == [before[0], before[1] + 1]
+        assert versions.current(other_tenant_id, versions.DELIVERIES) == other_before
+
+    def test_redis_unavailable(self, django_capture_on_commit_callbacks):
+        with patch("workers.versions.get_client") as mock_get_client:
+            mock_get_client.side_effect = ConnectionError("redis down")
+            assert versions.current(uuid.uuid4(), versions.DELIVERIES) is None
+            with django_capture_on_commit_callbacks(execute=True):
+                versions.bump(versions.DELIVERIES, uuid.uuid4())
@@ -0,0 +1,74 @@
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.utils import timezone
+
+from workers import warmup
+
+
+class TestRampFraction:
+    def test_full_capacity_without_warmup(self):
+        assert warmup.ramp_fraction(None, timezone.now()) == 1.0
+
+    def test_starts_at_initial_fraction(self, settings):
+        now = timezone.now()
+        assert warmup.ramp_fraction(now.timestamp(), now) == settings.WARMUP_INITIAL_FRACTION
+
+    def test_ramps_linearly(self, settings):
+        settings.WARMUP_WINDOW_SECONDS = 100
+        settings.WARMUP_INITIAL_FRACTION = 0.2
+        now = timezone.now()
+        started_at = (now - timedelta(seconds=50)).timestamp()
+        assert warmup.ramp_fraction(started_at, now) == pytest.approx(0.6)
+
+    def test_full_capacity_after_window(self, settings):
+        now = timezone.now()
+        started_at = (now - timedelta(seconds=settings.WARMUP_WINDOW_SECONDS)).timestamp()
+        assert warmup.ramp_fraction(started_at, now) == 1.0
+
+    def test_scaled_never_below_one(self):
+        assert warmup.scaled(10, 0.01) == 1
+        assert warmup.scaled(100, 0.25) == 25
+
+
+@pytest.mark.django_db
+class TestWarmup:
+    def _delivery(self, tenant_id=None, endpoint_id=None):
+        return SimpleNamespace(tenant_id=tenant_id or uuid.uuid4(), endpoint_id=endpoint_id or uuid.uuid4())
+
+    def test_global_warmup(self, settings):
+        now = timezone.now()
+        assert warmup.global_fraction(now) == 1.0
+        warmup.start(now=now)
+        assert warmup.global_fraction(now) == settings.WARMUP_INITIAL_FRACTION
+
+    def test_endpoint_limits_only_cover_warming_endpoints(self, settings):
+        warming = self._delivery()
+        other = self._delivery()
+        warmup.start(endpoint_id=warming.endpoint_id)
+
+        limits = warmup.endpoint_concurrency_limits([warming, other])
+
+        assert limits == {warming.endpoint_id: 1}
+
+    def test_tenant_warmup_limits_its_endpoints(self, settings):
+        settings.WARMUP_INITIAL_FRACTION = 0.5
+        tenant_id = uuid.uuid4()
+        first = self._delivery(tenant_id=tenant_id)
+        second = self._delivery(tenant_id=tenant_id)
+        warmup.start(tenant_id=tenant_id)
+
+        limits = warmup.endpoint_concurrency_limits([first, second])
+
+        assert limits == {
+            first.endpoint_id: settings.MAX_ENDPOINT_CONCURRENCY // 2,
+            second.endpoint_id: settings.MAX_ENDPOINT_CONCURRENCY // 2,
+        }
+
+    def test_disabled_with_zero_window(self, settings):
+        settings.WARMUP_WINDOW_SECONDS = 0
+        delivery = self._delivery()
+        warmup.start(endpoint_id=delivery.endpoint_id)
+        assert warmup.endpoint_concurrency_limits([delivery]) == {}
@@ -2,6 +2,8 @@ import hashlib
 import hmac
 import httpx
 import logging
+import socket
+import threading
 
 from django.db import transaction
 from django.utils import timezone
@@ -10,7 +12,8 @@ from apps.attempts.models import Attempt
 from apps.deliveries.models import Delivery
 from apps.deliveries.state_machine import DeliveryStateMachine
 from deliverant.celery import app
-from workers import kill_switch
+from workers import endpoint_latency, kill_switch, success_rate
+from workers.lease import LeaseHeartbeat
 from workers.metrics import attempts_executed_total, attempt_latency_seconds, delivery_latency_seconds
 
 logger = logging.getLogger("workers.delivery")
@@ -30,6 +33,42 @@ def generate_signature(secret, timestamp, body):
     return f"v1={signature}"
 
 
+class RequestCanceller:
+    """Lets another thread abort an in-flight httpx request, including a blocked read.
+
+    Pass it as the request's "trace" extension so it sees each socket the request
+    connects; cancel() shuts those sockets down, which wakes the blocked read with
+    an error. Closing the httpx Client from another thread does not.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._sockets = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event_name, info):
+        if event_name != "connection.connect_tcp.complete":
+            return
+        sock = info["return_value"].get_extra_info("socket")
+        with self._lock:
+            self._sockets.append(sock)
+            if self.cancelled:
+                self._shutdown(sock)
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            for sock in self._sockets:
+                self._shutdown(sock)
+
+    @staticmethod
+    def _shutdown(sock):
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
 def classify_response(response_exception, http_status):
     """Classify HTTP response into outcome and classification."""
     if response_exception:
@@ -70,6 +109,14 @@ def classify_response(response_exception, http_status):
     return Attempt.Outcome.RETRYABLE_FAILURE, Attempt.Classification.OTHER
 
 
+def _abandon_lost_lease(delivery_id, attempt_number):
+    logger.warning("Delivery attempt abandoned after losing lease", extra={
+        "delivery_id": str(delivery_id),
+        "attempt_number": attempt_number,
+    })
+    return {"status": "abandoned", "reason": "lease_lost"}
+
+
 @app.task
 def execute_delivery(delivery_id):
     """Execute HTTP delivery for a delivery."""
@@ -90,6 +137,10 @@ def execute_delivery(delivery_id):
                 })
                 return {"status": "skipped", "reason": f"delivery_status_{delivery.status}"}
 
+            if kill_switch.is_active(tenant_id=delivery.tenant_id, endpoint_id=delivery.endpoint_id):
+                logger.info("Delivery skipped due to scoped kill switch", extra={"delivery_id": delivery_id})
+                return {"status": "skipped", "reason": "kill_switch_active"}
+
             delivery = DeliveryStateMachine.acquire_lease(delivery)
 
     except Delivery.DoesNotExist:
@@ -128,12 +179,19 @@ def execute_delivery(delivery_id):
     response_body_snippet = None
     latency_ms = None
 
+    lease_id = delivery.lease_id
+    canceller = RequestCanceller()
+    heartbeat = LeaseHeartbeat(
+        delivery.id, lease_id, DeliveryStateMachine.lease_duration(delivery.endpoint), on_lost=canceller.cancel,
+    )
+
     try:
-        with httpx.Client(timeout=delivery.endpoint.timeout_seconds) as client:
+        with httpx.Client(timeout=delivery.endpoint.timeout_seconds) as client, heartbeat:
             response = client.post(
                 delivery.endpoint.url,
                 content=payload_body,
                 headers=headers,
+                extensions={"trace": canceller},
             )
             ended_at = timezone.now()
             latency_ms = int((ended_at - started_at).total_seconds() * 1000)
@@ -151,37 +209,36 @@ def execute_delivery(delivery_id):
         ended_at = timezone.now()
         latency_ms = int((ended_at - started_at).total_seconds() * 1000)
 
+    if heartbeat.lost.is_set():
+        return _abandon_lost_lease(delivery_id, attempt_number)
+
     outcome, classification = classify_response(response_exception, http_status)
 
     payload_hash = delivery.event.payload_hash
     error_detail = str(response_exception) if response_exception else None
 
-    attempt = Attempt.objects.create(
-        tenant=delivery.tenant,
-        delivery=delivery,
-        attempt_number=attempt_number,
-        started_at=started_at,
-        ended_at=ended_at,
-        latency_ms=latency_ms,
-        outcome=outcome,
-        classification=classification,
-        http_status=http_status,
-        response_headers_json=response_headers,
-        response_body_snippet=response_body_snippet,
-        error_detail=error_detail,
-        request_payload_hash=payload_hash,
-    )
-
-    attempts_executed_total.labels(
-        outcome=outcome or "unknown",
-        classification=classification or "none",
-    ).inc()
-    if latency_ms is not None:
-        attempt_latency_seconds.observe(latency_ms / 1000)
-
     with transaction.atomic():
         delivery = Delivery.objects.select_for_update().get(id=delivery_id)
 
+        if delivery.status != Delivery.Status.IN_PROGRESS or delivery.lease_id != lease_id:
+            return _abandon_lost_lease(delivery_id, attempt_number)
+
+        attempt = Attempt.objects.create(
+            tenant_id=delivery.tenant_id,
+            delivery=delivery,
+            attempt_number=attempt_number,
+            started_at=started_at,
+            ended_at=ended_at,
+            latency_ms=latency_ms,
+            outcome=outcome,
+            classification=classification,
+            http_status=http_status,
+            response_headers_json=response_headers,
+            response_body_snippet=response_body_snippet,
+            error_detail=error_detail,
+            request_payload_hash=payload_hash,
+        )
+
         if outcome == Attempt.Outcome.SUCCESS:
             DeliveryStateMachine.complete_success(delivery)
             total_seconds = (timezone.now() - delivery.created_at).total_seconds()
@@ -193,6 +250,16 @@ def execute_delivery(delivery_id):
         else:
             DeliveryStateMachine.complete_retryable(delivery, attempt_number)
 
+    success_rate.record(delivery.endpoint_id, outcome == Attempt.Outcome.SUCCESS)
+
+    attempts_executed_total.labels(
+        outcome=outcome or "unknown",
+        classification=classification or "none",
+    ).inc()
+    if latency_ms is not None:
+        attempt_latency_seconds.observe(latency_ms / 1000)
+        endpoint_latency.record(delivery.endpoint_id, latency_ms)
+
     logger.info("Delivery attempt completed", extra={
         "delivery_id": str(delivery.id),
         "attempt_id": str(attempt.id),
@@ -0,0 +1,187 @@
+import json
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from workers import versions
+from workers.redis_client import ensure_listener, get_client
+
+logger = logging.getLogger("workers.delivery_stream")
+
+# Delivery state transitions, per tenant. Each transition is appended to the
+# tenant's capped Redis stream, whose entry IDs are the resume tokens, and
+# announced on one pub/sub channel. Each API process runs a single listener on
+# the channel and hands messages to its open subscriptions for that tenant.
+STREAM_KEY = "deliverant:delivery_stream:{tenant_id}"
+CHANNEL = "deliverant:delivery_stream"
+
+# Appends to the stream and publishes "<tenant_id> <entry_id> <data>" in one
+# round-trip, so the live message carries the same ID a replay would.
+PUBLISH_SCRIPT = """
+local entry_id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[4])
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+redis.call('PUBLISH', KEYS[2], ARGV[3] .. ' ' .. entry_id .. ' ' .. ARGV[4])
+return entry_id
+"""
+
+# Queued to every subscription when the listener (re)subscribes or disconnects,
+# since messages may have been missed; subscriptions then catch up from the stream.
+RESET = object()
+
+_script = None
+_subscriptions = {}
+_subscriptions_lock = threading.Lock()
+
+
+def _publish_script():
+    global _script
+    if _script is None:
+        _script = get_client().register_script(PUBLISH_SCRIPT)
+    return _script
+
+
+def _key(tenant_id):
+    return STREAM_KEY.format(tenant_id=tenant_id)
+
+
+def _send(transitions):
+    try:
+        script = _publish_script()
+        pipe = get_client().pipeline(transaction=False)
+        for tenant_id, data in transitions:
+            script(
+                keys=[_key(tenant_id), CHANNEL],
+                args=[
+                    settings.DELIVERY_STREAM_MAXLEN,
+                    settings.DELIVERY_STREAM_RETENTION_SECONDS * 1000,
+                    str(tenant_id),
+                    json.dumps(data, cls=DjangoJSONEncoder),
+                ],
+                client=pipe,
+            )
+        versions.queue_incr(pipe, versions.DELIVERIES, {tenant_id for tenant_id, _ in transitions})
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Failed to publish delivery transitions", extra={"error": str(e)})
+
+
+def publish(*transitions):
+    """Publish (tenant_id, data) transitions once the current transaction commits.
+
+    The tenants' deliveries versions are advanced in the same pipeline, so a
+    transition costs one Redis round trip.
+    """
+    if transitions:
+        transaction.on_commit(lambda: _send(transitions))
+
+
+def _parse_id(entry_id):
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq)
+
+
+def parse_resume_token(token):
+    """Return the token as a stream entry ID, or None if it is not one."""
+    try:
+        _parse_id(token)
+    except (AttributeError, ValueError):
+        return None
+    return token
+
+
+def _on_message(data):
+    tenant_id, entry_id, payload = data.decode().split(" ", 2)
+    with _subscriptions_lock:
+        queues = list(_subscriptions.get(tenant_id, ()))
+    for q in queues:
+        q.put((entry_id, payload))
+
+
+def _on_reset():
+    with _subscriptions_lock:
+        queues = [q for tenant_queues in _subscriptions.values() for q in tenant_queues]
+    for q in queues:
+        q.put(RESET)
+
+
+class Subscription:
+    """A tenant's transitions as seen by one client, from live messages and stream replay.
+
+    Use as a context manager; iterate events() for ("delivery", entry_id, data),
+    ("reset", entry_id, None) when transitions after the resume token are no
+    longer retained (the client should refetch), or None when idle for
+    `heartbeat_seconds`. Redis errors propagate and end the subscription.
+    """
+
+    def __init__(self, tenant_id):
+        self.tenant_id = str(tenant_id)
+        self.queue = queue.SimpleQueue()
+
+    def __enter__(self):
+        with _subscriptions_lock:
+            _subscriptions.setdefault(self.tenant_id, set()).add(self.queue)
+        ensure_listener(CHANNEL, _on_message, _on_reset)
+        return self
+
+    def __exit__(self, *exc_info):
+        with _subscriptions_lock:
+            tenant_queues = _subscriptions.get(self.tenant_id, set())
+            tenant_queues.discard(self.queue)
+            if not tenant_queues:
+                _subscriptions.pop(self.tenant_id, None)
+
+    def _latest_id(self):
+        entries = get_client().xrevrange(_key(self.tenant_id), count=1)
+        return entries[0][0].decode() if entries else "0-0"
+
+    def _replay(self, after):
+        """Entries after `after`, or None if some may already have been trimmed or expired."""
+        min_ms = (time.time() - settings.DELIVERY_STREAM_RETENTION_SECONDS) * 1000
+        if after != "0-0" and _parse_id(after)[0] < min_ms:
+            return None
+
+        pipe = get_client().pipeline(transaction=False)
+        pipe.xrange(_key(self.tenant_id), count=1)
+        pipe.xread({_key(self.tenant_id): after}, count=settings.DELIVERY_STREAM_MAXLEN * 2)
+        oldest, read = pipe.execute()
+        if oldest and after != "0-0" and _parse_id(oldest[0][0].decode()) > _parse_id(after):
+            return None
+        entries = read[0][1] if read else []
+        return [(entry_id.decode(), fields[b"data"].decode()) for entry_id, fields in entries]
+
+    def _catch_up(self, after):
+        entries = self._replay(after)
+        if entries is None:
+            latest = self._latest_id()
+            return [("reset", latest, None)], latest
+        return [("delivery", entry_id, data) for entry_id, data in entries], entries[-1][0] if entries else after
+
+    def events(self, resume_token, heartbeat_seconds, max_seconds):
+        deadline = time.monotonic() + max_seconds
+        if resume_token is None:
+            last_id = self._latest_id()
+        else:
+            events, last_id = self._catch_up(resume_token)
+            yield from events
+
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                item = self.queue.get(timeout=min(heartbeat_seconds, remaining))
+            except queue.Empty:
+                yield None
+                continue
+
+            if item is RESET:
+                events, last_id = self._catch_up(last_id)
+                yield from events
+                continue
+
+            entry_id, data = item
+            if _parse_id(entry_id) > _parse_id(last_id):
+                last_id = entry_id
+                yield ("delivery", entry_id, data)
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from workers.redis_client import get_client
+
+LATENCY_KEY = "deliverant:endpoint_latency:{endpoint_id}"
+SLOW_KEY = "deliverant:endpoint_slow:{endpoint_id}"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, int(round(pct / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+def _samples(values):
+    return [float(value) for value in values]
+
+
+def record(endpoint_id, latency_ms):
+    """Record an attempt latency and update the endpoint's slow flag from the recent p95.
+
+    Samples live in a capped Redis list so concurrent workers never drop each
+    other's writes.
+    """
+    key = LATENCY_KEY.format(endpoint_id=endpoint_id)
+    pipe = get_client().pipeline()
+    pipe.lpush(key, latency_ms)
+    pipe.ltrim(key, 0, settings.SLOW_ENDPOINT_SAMPLE_SIZE - 1)
+    pipe.expire(key, settings.SLOW_ENDPOINT_SAMPLE_TTL_SECONDS)
+    pipe.lrange(key, 0, -1)
+    samples = _samples(pipe.execute()[-1])
+
+    if len(samples) < settings.SLOW_ENDPOINT_MIN_SAMPLES:
+        return
+
+    p95 = percentile(samples, 95)
+    slow_key = SLOW_KEY.format(endpoint_id=endpoint_id)
+    if p95 >= settings.SLOW_ENDPOINT_P95_MS:
+        cache.set(slow_key, p95, timeout=settings.SLOW_ENDPOINT_SAMPLE_TTL_SECONDS)
+    elif p95 < settings.SLOW_ENDPOINT_RECOVERY_P95_MS:
+        cache.delete(slow_key)
+
+
+def slow_endpoint_ids(endpoint_ids):
+    """Return the subset of endpoint_ids currently flagged as slow, in one cache round-trip."""
+    keys = {SLOW_KEY.format(endpoint_id=endpoint_id): endpoint_id for endpoint_id in endpoint_ids}
+    if not keys:
+        return set()
+    return {keys[key] for key in cache.get_many(keys)}
@@ -0,0 +1,50 @@
+import logging
+
+from django.conf import settings
+
+from apps.api.pagination import keyset_after
+from apps.deliveries.models import Delivery
+from apps.endpoints.models import Endpoint
+from deliverant.celery import app
+from workers import versions
+
+logger = logging.getLogger("workers.endpoint_names")
+
+
+@app.task
+def propagate_endpoint_name(endpoint_id):
+    """Copy an endpoint's current name onto its deliveries' endpoint_name.
+
+    Deliveries are walked in (created_at, id) order along idx_deliveries_tenant_ep,
+    and each batch is updated in its own statement, so a rename never holds row
+    locks on all of an endpoint's deliveries at once. Reading the name here rather
+    than taking it as an argument makes repeated or reordered runs converge.
+    """
+    endpoint = Endpoint.objects.filter(id=endpoint_id).first()
+    if endpoint is None:
+        return {"updated": 0}
+
+    deliveries = Delivery.objects.filter(tenant_id=endpoint.tenant_id, endpoint_id=endpoint.id)
+    updated_count = 0
+    position = None
+    while True:
+        batch = deliveries.filter(keyset_after("created_at", *position)) if position else deliveries
+        rows = list(
+            batch.order_by("created_at", "id")
+            .values_list("created_at", "id")[:settings.ENDPOINT_RENAME_BATCH_SIZE]
+        )
+        if not rows:
+            break
+        updated = (
+            Delivery.objects.filter(id__in=[pk for _, pk in rows])
+            .exclude(endpoint_name=endpoint.name)
+            .update(endpoint_name=endpoint.name)
+        )
+        if updated:
+            versions.bump(versions.DELIVERIES, endpoint.tenant_id)
+        updated_count += updated
+        position = rows[-1]
+
+    logger.info("Endpoint name propagated", extra={"endpoint_id": str(endpoint.id), "updated": updated_count})
+
+    return {"updated": updated_count}
@@ -0,0 +1,57 @@
+import logging
+from collections import defaultdict
+
+from django.db.models import Count
+
+from apps.deliveries.models import Delivery
+from apps.endpoints.models import Endpoint
+from deliverant.celery import app
+from workers import success_rate, tenant_backlog
+from workers.metrics import backlog_size, endpoint_success_rate
+
+logger = logging.getLogger("workers.gauges")
+
+BACKLOG_STATUSES = [
+    Delivery.Status.PENDING,
+    Delivery.Status.SCHEDULED,
+    Delivery.Status.IN_PROGRESS,
+]
+
+
+@app.task
+def refresh_backlog_gauges():
+    """Set backlog_size and resync per-tenant backlog counters from a single grouped count."""
+    rows = (
+        Delivery.objects.filter(status__in=BACKLOG_STATUSES)
+        .values("tenant_id", "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    counts = {status: 0 for status in BACKLOG_STATUSES}
+    tenant_counts = defaultdict(int)
+    for row in rows:
+        counts[row["status"]] += row["count"]
+        if row["status"] in tenant_backlog.STATUSES:
+            tenant_counts[row["tenant_id"]] += row["count"]
+
+    for status, count in counts.items():
+        backlog_size.labels(status=status).set(count)
+    tenant_backlog.replace(tenant_counts)
+
+    return {str(status): count for status, count in counts.items()}
+
+
+@app.task
+def refresh_endpoint_success_rates():
+    """Set endpoint_success_rate for active endpoints from the rolling-window counters."""
+    endpoints = list(Endpoint.objects.filter(status=Endpoint.Status.ACTIVE).values_list("id", "name"))
+    rates = success_rate.success_rates([endpoint_id for endpoint_id, _ in endpoints])
+
+    for endpoint_id, name in endpoints:
+        if endpoint_id in rates:
+            endpoint_success_rate.labels(
+                endpoint_id=str(endpoint_id),
+                endpoint_name=name,
+            ).set(rates[endpoint_id])
+
+    return {"endpoints": len(rates)}
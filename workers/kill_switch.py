@@ -1,15 +1,150 @@
+import logging
+import time
+
+from django.conf import settings
 from django.core.cache import cache
 
+from workers import warmup
+from workers.redis_client import ensure_listener, get_client
+
+logger = logging.getLogger("workers.kill_switch")
+
 KILL_SWITCH_KEY = "deliverant:kill_switch"
+KILL_SWITCH_TENANTS_KEY = "deliverant:kill_switch:tenants"
+KILL_SWITCH_ENDPOINTS_KEY = "deliverant:kill_switch:endpoints"
+KILL_SWITCH_CHANNEL = "deliverant:kill_switch:changed"
+
+GLOBAL = "global"
+TENANT = "tenant"
+ENDPOINT = "endpoint"
+
+# Process-local view of all switches. Workers read it without a Redis round-trip;
+# a pub/sub listener thread reloads it on every toggle, and it is re-read from
+# Redis at most KILL_SWITCH_LOCAL_TTL_SECONDS after the last refresh as a fallback.
+_local_global = False
+_local_tenants = frozenset()
+_local_endpoints = frozenset()
+_refreshed_at = None
+
+
+def _set_local(global_active, tenant_ids, endpoint_ids):
+    global _local_global, _local_tenants, _local_endpoints, _refreshed_at
+    _local_global = global_active
+    _local_tenants = frozenset(tenant_ids)
+    _local_endpoints = frozenset(endpoint_ids)
+    _refreshed_at = time.monotonic()
+
+
+def _legacy_key():
+    # Earlier releases stored the global switch through the Django cache, under a
+    # prefixed key. A switch left active across an upgrade is moved to KILL_SWITCH_KEY.
+    return cache.make_key(KILL_SWITCH_KEY)
+
+
+def _migrate_legacy():
+    logger.warning("Moving kill switch from legacy cache key")
+    pipe = get_client().pipeline(transaction=True)
+    pipe.set(KILL_SWITCH_KEY, "1")
+    pipe.delete(_legacy_key())
+    pipe.execute()
+
+
+def _refresh():
+    pipe = get_client().pipeline(transaction=False)
+    pipe.get(KILL_SWITCH_KEY)
+    pipe.smembers(KILL_SWITCH_TENANTS_KEY)
+    pipe.smembers(KILL_SWITCH_ENDPOINTS_KEY)
+    pipe.exists(_legacy_key())
+    global_value, tenant_ids, endpoint_ids, legacy_active = pipe.execute()
+    if legacy_active:
+        _migrate_legacy()
+        global_value = b"1"
+
+    _set_local(
+        global_value == b"1",
+        {member.decode() for member in tenant_ids},
+        {member.decode() for member in endpoint_ids},
+    )
+
+
+def reset_local_state():
+    """Forget the cached state so the next read goes to Redis."""
+    global _refreshed_at
+    _refreshed_at = None
+
+
+def _on_message(_data):
+    _refresh()
+
+
+def _on_reset():
+    try:
+        _refresh()
+    except Exception:
+        reset_local_state()
+
+
+def _ensure_fresh():
+    ensure_listener(KILL_SWITCH_CHANNEL, _on_message, _on_reset)
+    if _refreshed_at is not None and time.monotonic() - _refreshed_at < settings.KILL_SWITCH_LOCAL_TTL_SECONDS:
+        return
+
+    try:
+        _refresh()
+    except Exception:
+        if _refreshed_at is None:
+            raise
+        logger.warning("Kill switch refresh failed, using cached state")
+        _set_local(_local_global, _local_tenants, _local_endpoints)
+
+
+def is_active(tenant_id=None, endpoint_id=None):
+    """Return True if delivery is paused globally or for the given tenant or endpoint."""
+    _ensure_fresh()
+    if _local_global:
+        return True
+    if tenant_id is not None and str(tenant_id) in _local_tenants:
+        return True
+    return endpoint_id is not None and str(endpoint_id) in _local_endpoints
+
+
+def paused_scopes():
+    """Return the (tenant_ids, endpoint_ids) currently paused by scoped switches."""
+    _ensure_fresh()
+    return _local_tenants, _local_endpoints
+
+
+def _scope(tenant_id, endpoint_id):
+    if endpoint_id is not None:
+        return KILL_SWITCH_ENDPOINTS_KEY, str(endpoint_id)
+    if tenant_id is not None:
+        return KILL_SWITCH_TENANTS_KEY, str(tenant_id)
+    return None, None
+
 
+def _publish():
+    _refresh()
+    get_client().publish(KILL_SWITCH_CHANNEL, "changed")
 
-def is_active():
-    return cache.get(KILL_SWITCH_KEY) == "1"
 
+def activate(tenant_id=None, endpoint_id=None):
+    """Pause delivery for an endpoint, a tenant, or everything when no scope is given."""
+    key, member = _scope(tenant_id, endpoint_id)
+    if key is None:
+        get_client().set(KILL_SWITCH_KEY, "1")
+    else:
+        get_client().sadd(key, member)
+    _publish()
 
-def activate():
-    cache.set(KILL_SWITCH_KEY, "1", timeout=None)
 
+def deactivate(tenant_id=None, endpoint_id=None):
+    """Resume delivery for a scope, ramping dispatch back up over the warm-up window."""
+    key, member = _scope(tenant_id, endpoint_id)
+    if key is None:
+        released = get_client().delete(KILL_SWITCH_KEY)
+    else:
+        released = get_client().srem(key, member)
+    _publish()
 
-def deactivate():
-    cache.delete(KILL_SWITCH_KEY)
+    if released:
+        warmup.start(tenant_id=tenant_id, endpoint_id=endpoint_id)
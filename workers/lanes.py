@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db.models import Q
+
+from apps.deliveries.models import Delivery
+
+FRESH = "fresh"
+RETRY = "retry"
+REPLAY = "replay"
+SLOW = "slow"
+
+# Lanes the scheduler selects from. SLOW is not selected directly: deliveries
+# from any lane are diverted to it when their endpoint is flagged as slow.
+LANES = [FRESH, RETRY, REPLAY]
+
+
+def lane_filter(lane):
+    """Return a Q expression selecting the deliveries that belong to a lane."""
+    retry_from = settings.RETRY_LANE_MIN_ATTEMPT - 1
+
+    if lane == REPLAY:
+        return Q(origin=Delivery.Origin.REPLAY)
+    if lane == RETRY:
+        return Q(origin=Delivery.Origin.EVENT, attempts_count__gte=retry_from)
+    return Q(origin=Delivery.Origin.EVENT, attempts_count__lt=retry_from)
+
+
+def queue_for(lane):
+    return settings.DELIVERY_LANES[lane]["queue"]
+
+
+def budget_for(lane):
+    return settings.DELIVERY_LANES[lane]["budget"]
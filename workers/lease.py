@@ -1,70 +1,115 @@
 import logging
+import threading
 
-from django.db import transaction
+from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
 
 from apps.attempts.models import Attempt
 from apps.deliveries.models import Delivery
 from apps.deliveries.state_machine import DeliveryStateMachine
+from apps.events.models import Event
 from deliverant.celery import app
 
 logger = logging.getLogger("workers.lease")
 
+# One multi-row INSERT ... SELECT recording a WORKER_CRASH_OR_UNKNOWN attempt for each
+# recovered delivery, so recovery cost does not grow with per-row round-trips.
+INSERT_CRASH_ATTEMPTS_SQL = f"""
+    INSERT INTO {Attempt._meta.db_table} (
+        id, tenant_id, delivery_id, attempt_number, started_at, ended_at,
+        outcome, classification, error_detail, request_payload_hash, created_at
+    )
+    SELECT
+        gen_random_uuid(), d.tenant_id, d.id, d.attempts_count + 1, d.updated_at, %(now)s,
+        %(outcome)s, %(classification)s, %(error_detail)s, e.payload_hash, %(now)s
+    FROM {Delivery._meta.db_table} d
+    JOIN {Event._meta.db_table} e ON e.id = d.event_id
+    WHERE d.id = ANY(%(delivery_ids)s) AND d.status = %(status)s
+"""
+
+
+class LeaseHeartbeat:
+    """Extends a delivery's lease from a background thread while an attempt is in flight.
+
+    If an extension finds the lease gone (recovered and possibly re-leased elsewhere),
+    ``lost`` is set and ``on_lost`` is called so the worker can stop early.
+    """
+
+    def __init__(self, delivery_id, lease_id, duration_seconds, interval_seconds=None, on_lost=None):
+        self.delivery_id = delivery_id
+        self.lease_id = lease_id
+        self.duration_seconds = duration_seconds
+        self.interval_seconds = interval_seconds or settings.LEASE_HEARTBEAT_INTERVAL_SECONDS
+        self.on_lost = on_lost
+        self.lost = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def beat(self):
+        if DeliveryStateMachine.extend_lease(self.delivery_id, self.lease_id, self.duration_seconds):
+            return True
+
+        self.lost.set()
+        if self.on_lost is not None:
+            try:
+                self.on_lost()
+            except Exception:
+                pass
+        return False
+
+    def _run(self):
+        try:
+            while not self._stopped.wait(self.interval_seconds):
+                try:
+                    if not self.beat():
+                        break
+                except Exception as e:
+                    logger.error("Lease heartbeat failed", extra={
+                        "delivery_id": str(self.delivery_id),
+                        "error": str(e),
+                    })
+        finally:
+            connection.close()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stopped.set()
+        self._thread.join()
+        return False
+
 
 @app.task
 def recover_expired_leases():
-    """Recover deliveries with expired leases (crashed workers)."""
+    """Recover deliveries with expired leases (crashed workers) in bulk."""
     now = timezone.now()
 
-    expired_deliveries = Delivery.objects.filter(
-        status=Delivery.Status.IN_PROGRESS,
-        lease_expires_at__lt=now
-    ).select_related("tenant")[:100]
-
-    recovered_count = 0
-
-    for delivery in expired_deliveries:
-        try:
-            with transaction.atomic():
-                delivery = Delivery.objects.select_for_update().get(id=delivery.id)
-
-                if delivery.status != Delivery.Status.IN_PROGRESS:
-                    continue
-
-                attempt_number = delivery.attempts_count + 1
-
-                Attempt.objects.create(
-                    tenant=delivery.tenant,
-                    delivery=delivery,
-                    attempt_number=attempt_number,
-                    started_at=delivery.updated_at,
-                    ended_at=now,
-                    latency_ms=None,
-                    outcome=Attempt.Outcome.RETRYABLE_FAILURE,
-                    classification=Attempt.Classification.WORKER_CRASH_OR_UNKNOWN,
-                    http_status=None,
-                    response_headers_json=None,
-                    response_body_snippet=None,
-                    error_detail="Worker crashed or lease expired",
-                    request_payload_hash=delivery.event.payload_hash,
-                )
-
-                DeliveryStateMachine.recover_lease(delivery)
-                recovered_count += 1
-
-                logger.warning("Recovered expired lease", extra={
-                    "delivery_id": str(delivery.id),
-                    "tenant_id": str(delivery.tenant_id),
-                    "attempt_number": attempt_number,
-                })
-
-        except Exception as e:
-            logger.error("Error recovering delivery", extra={
-                "delivery_id": str(delivery.id),
-                "error": str(e),
+    with transaction.atomic():
+        delivery_ids = list(
+            Delivery.objects.select_for_update(skip_locked=True)
+            .filter(status=Delivery.Status.IN_PROGRESS, lease_expires_at__lt=now)
+            .values_list("id", flat=True)[:settings.LEASE_RECOVERY_BATCH_SIZE]
+        )
+
+        if not delivery_ids:
+            return {"recovered": 0}
+
+        with connection.cursor() as cursor:
+            cursor.execute(INSERT_CRASH_ATTEMPTS_SQL, {
+                "now": now,
+                "outcome": Attempt.Outcome.RETRYABLE_FAILURE,
+                "classification": Attempt.Classification.WORKER_CRASH_OR_UNKNOWN,
+                "error_detail": "Worker crashed or lease expired",
+                "delivery_ids": delivery_ids,
+                "status": Delivery.Status.IN_PROGRESS,
             })
 
-    if recovered_count > 0:
-        logger.info("Lease recovery completed", extra={"recovered": recovered_count})
+        recovered_count = DeliveryStateMachine.bulk_recover_leases(delivery_ids, now=now)
+
+    logger.info("Lease recovery completed", extra={"recovered": recovered_count})
 
     return {"recovered": recovered_count}
@@ -0,0 +1,158 @@
+import logging
+import math
+import os
+import socket
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.db.models import Func, IntegerField
+
+from workers.redis_client import get_client
+
+logger = logging.getLogger("workers.partitions")
+
+PARTITION_LEASE_KEY = "deliverant:scheduler:partition:{partition}"
+MEMBERS_KEY = "deliverant:scheduler:members"
+
+RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class EndpointPartition(Func):
+    """Postgres expression mapping an endpoint id to a partition in [0, partitions)."""
+
+    template = "mod(mod(hashtext(CAST(%(expressions)s AS text)), %(partitions)s) + %(partitions)s, %(partitions)s)"
+    output_field = IntegerField()
+
+    def __init__(self, expression, partitions=None, **extra):
+        partitions = partitions or settings.SCHEDULER_PARTITIONS
+        super().__init__(expression, partitions=int(partitions), **extra)
+
+
+class PartitionOwner:
+    """Holds leases on a fair share of scheduler partitions for one scheduler instance.
+
+    Every instance heartbeats into a shared membership set. On each rebalance it renews
+    the leases it holds, releases any above its fair share and claims free partitions
+    up to that share. Leases of a dead instance expire and are picked up by the others.
+    """
+
+    def __init__(self, instance_id=None, client=None):
+        self.instance_id = instance_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.client = client or get_client()
+        self.owned = set()
+        self._renew = self.client.register_script(RENEW_SCRIPT)
+        self._release = self.client.register_script(RELEASE_SCRIPT)
+
+    def _lease_key(self, partition):
+        return PARTITION_LEASE_KEY.format(partition=partition)
+
+    def _lease_ms(self):
+        return settings.SCHEDULER_PARTITION_LEASE_SECONDS * 1000
+
+    def live_members(self):
+        now = time.time()
+        pipe = self.client.pipeline()
+        pipe.zadd(MEMBERS_KEY, {self.instance_id: now})
+        pipe.zremrangebyscore(MEMBERS_KEY, 0, now - settings.SCHEDULER_PARTITION_LEASE_SECONDS)
+        pipe.zrange(MEMBERS_KEY, 0, -1)
+        members = pipe.execute()[-1]
+        return sorted(m.decode() for m in members)
+
+    def fair_share(self, members):
+        return math.ceil(settings.SCHEDULER_PARTITIONS / max(len(members), 1))
+
+    def rebalance(self):
+        """Renew, shed and claim partition leases; return the partitions owned for this tick."""
+        members = self.live_members()
+        share = self.fair_share(members)
+        self._renew_owned()
+
+        while len(self.owned) > share:
+            self.release(max(self.owned))
+
+        if len(self.owned) < share:
+            start = members.index(self.instance_id) * share
+            total = settings.SCHEDULER_PARTITIONS
+            for offset in range(total):
+                partition = (start + offset) % total
+                if partition in self.owned:
+                    continue
+                if self.client.set(self._lease_key(partition), self.instance_id, nx=True, px=self._lease_ms()):
+                    self.owned.add(partition)
+                    if len(self.owned) >= share:
+                        break
+
+        return set(self.owned)
+
+    def renew(self):
+        """Extend this instance's membership and held leases; return the partitions still owned."""
+        self.client.zadd(MEMBERS_KEY, {self.instance_id: time.time()})
+        self._renew_owned()
+        return set(self.owned)
+
+    def _renew_owned(self):
+        for partition in sorted(self.owned):
+            if not self._renew(keys=[self._lease_key(partition)], args=[self.instance_id, self._lease_ms()]):
+                self.owned.discard(partition)
+                logger.warning("Lost scheduler partition", extra={
+                    "instance_id": self.instance_id,
+                    "partition": partition,
+                })
+
+    def release(self, partition):
+        self._release(keys=[self._lease_key(partition)], args=[self.instance_id])
+        self.owned.discard(partition)
+
+    def release_all(self):
+        for partition in list(self.owned):
+            self.release(partition)
+        self.client.zrem(MEMBERS_KEY, self.instance_id)
+
+
+class PartitionHeartbeat:
+    """Renews a PartitionOwner's membership and leases from a background thread.
+
+    Wrap each tick in it: a tick over a large backlog can outlast
+    SCHEDULER_PARTITION_LEASE_SECONDS, and another instance would then claim the
+    partitions while they are still being dispatched.
+    """
+
+    def __init__(self, owner, interval_seconds=None):
+        self.owner = owner
+        self.interval_seconds = interval_seconds or settings.SCHEDULER_PARTITION_LEASE_SECONDS / 3
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(self.interval_seconds):
+            try:
+                self.owner.renew()
+            except Exception as e:
+                logger.error("Scheduler partition renewal failed", extra={
+                    "instance_id": self.owner.instance_id,
+                    "error": str(e),
+                })
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stopped.set()
+        self._thread.join()
+        return False
@@ -0,0 +1,55 @@
+import logging
+import os
+import threading
+import time
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger("workers.redis_client")
+
+_client = None
+_listener_pids = {}
+_listener_lock = threading.Lock()
+
+
+def get_client():
+    """Return a process-wide Redis client for operations the Django cache API does not expose."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+def _listen(channel, on_message, on_reset):
+    while True:
+        try:
+            pubsub = get_client().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(channel)
+            on_reset()
+            for message in pubsub.listen():
+                on_message(message["data"])
+        except Exception as e:
+            logger.warning("Pub/sub listener disconnected", extra={"channel": channel, "error": str(e)})
+            on_reset()
+            time.sleep(1)
+
+
+def ensure_listener(channel, on_message, on_reset):
+    """Start a daemon thread calling on_message(data) for each message on a channel.
+
+    One listener runs per channel and process; it is restarted after a fork. on_reset()
+    is called on every (re)subscribe and disconnect, since messages may have been missed.
+    """
+    if _listener_pids.get(channel) == os.getpid():
+        return
+    with _listener_lock:
+        if _listener_pids.get(channel) == os.getpid():
+            return
+        threading.Thread(
+            target=_listen,
+            args=(channel, on_message, on_reset),
+            name=f"listener:{channel}",
+            daemon=True,
+        ).start()
+        _listener_pids[channel] = os.getpid()
@@ -0,0 +1,50 @@
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger("workers.retry_leveling")
+
+PLANNED_KEY = "deliverant:planned_attempts:{bucket}"
+
+
+def _bucket(when):
+    return int(when.timestamp() // settings.RETRY_LEVELING_BUCKET_SECONDS)
+
+
+def _incr(key, timeout):
+    cache.add(key, 0, timeout=timeout)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=timeout)
+
+
+def leveled_retry_time(now, max_delay):
+    """Pick a retry time in [now, now + max_delay] from the least loaded of a few jittered candidates.
+
+    Each candidate is drawn with full jitter, so the result stays within the same
+    bounds; preferring the emptier bucket keeps retries after a shared outage from
+    clustering. The chosen bucket's planned-attempt counter is incremented.
+    """
+    candidates = [
+        now + timedelta(seconds=random.uniform(0, max_delay))
+        for _ in range(settings.RETRY_LEVELING_CHOICES)
+    ]
+
+    try:
+        keys = {PLANNED_KEY.format(bucket=_bucket(candidate)) for candidate in candidates}
+        counts = cache.get_many(keys)
+        chosen = min(
+            candidates,
+            key=lambda candidate: int(counts.get(PLANNED_KEY.format(bucket=_bucket(candidate)), 0)),
+        )
+        timeout = int((chosen - now).total_seconds()) + settings.RETRY_LEVELING_BUCKET_SECONDS
+        _incr(PLANNED_KEY.format(bucket=_bucket(chosen)), timeout)
+    except Exception as e:
+        logger.warning("Retry leveling unavailable, using plain jitter", extra={"error": str(e)})
+        return candidates[0]
+
+    return chosen
@@ -1,21 +1,151 @@
 import logging
+from collections import defaultdict
 
 from django.conf import settings
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.expressions import RawSQL
 from django.utils import timezone
 
 from apps.deliveries.models import Delivery
 from apps.deliveries.state_machine import DeliveryStateMachine
 from deliverant.celery import app
-from workers import kill_switch
+from workers import endpoint_latency, kill_switch, lanes, warmup
+from workers.partitions import EndpointPartition
 from apps.endpoints.models import Endpoint
-from workers.metrics import backlog_size, endpoint_success_rate
 
 logger = logging.getLogger("workers.scheduler")
 
+PENDING_BATCH_SIZE = 100
+
+CANDIDATES_SQL = """
+    SELECT candidates.* FROM ({endpoints}) candidate_endpoints
+    CROSS JOIN LATERAL ({probe}) candidates
+    ORDER BY {order_by}
+    LIMIT %s
+"""
+
+
+def _active_endpoints(partitions):
+    """Active endpoints in the given partitions (all when None).
+
+    Tenants and endpoints paused by a scoped kill switch are excluded here, so their
+    deliveries are never fetched or dispatched.
+    """
+    endpoints = Endpoint.objects.filter(status=Endpoint.Status.ACTIVE)
+    if partitions is not None:
+        endpoints = endpoints.alias(
+            partition=EndpointPartition("id"),
+        ).filter(partition__in=sorted(partitions))
+
+    paused_tenants, paused_endpoints = kill_switch.paused_scopes()
+    if paused_tenants:
+        endpoints = endpoints.exclude(tenant_id__in=sorted(paused_tenants))
+    if paused_endpoints:
+        endpoints = endpoints.exclude(id__in=sorted(paused_endpoints))
+    return endpoints
+
+
+def _in_flight_counts():
+    """Return {endpoint_id: IN_PROGRESS deliveries} for endpoints with any in flight."""
+    return dict(
+        Delivery.objects.filter(status=Delivery.Status.IN_PROGRESS)
+        .values_list("endpoint_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+
+def _first_per_endpoint(endpoints, deliveries, order_by, per_endpoint, limit):
+    """The first `limit` deliveries matching `deliveries`, at most `per_endpoint` from each of `endpoints`.
+
+    Each endpoint is probed by a LATERAL subquery with its own LIMIT. Postgres cannot
+    flatten it into a scan of the whole backlog, so it runs the probe once per endpoint
+    and stops after `per_endpoint` rows, reading the scheduler's partial indexes in
+    pick order. The cost grows with the number of endpoints and the cap rather than
+    with the size of the backlog.
+    """
+    endpoints_sql, endpoints_params = endpoints.values("id").query.sql_with_params()
+    probe_sql, probe_params = (
+        deliveries.filter(endpoint_id=RawSQL("candidate_endpoints.id", []))
+        .order_by(*order_by)[:per_endpoint]
+        .query.sql_with_params()
+    )
+    return Delivery.objects.raw(
+        CANDIDATES_SQL.format(
+            endpoints=endpoints_sql,
+            probe=probe_sql,
+            order_by=", ".join(f"candidates.{connection.ops.quote_name(field)}" for field in order_by),
+        ),
+        [*endpoints_params, *probe_params, limit],
+    )
+
+
+def pending_batch(partitions=None):
+    """Select PENDING deliveries for active endpoints, at most SCHEDULER_ENDPOINT_BATCH_CAP per endpoint."""
+    return _first_per_endpoint(
+        _active_endpoints(partitions),
+        Delivery.objects.filter(status=Delivery.Status.PENDING),
+        order_by=["created_at", "id"],
+        per_endpoint=settings.SCHEDULER_ENDPOINT_BATCH_CAP,
+        limit=PENDING_BATCH_SIZE,
+    )
+
+
+def due_batch(lane, now, limit, partitions=None):
+    """Select up to `limit` due deliveries for a lane, excluding paused and saturated endpoints.
+
+    Each endpoint contributes at most its remaining concurrency headroom (capped at
+    SCHEDULER_ENDPOINT_BATCH_CAP), so one endpoint's backlog cannot fill the batch.
+    Each delivery carries its endpoint's in-flight count as `endpoint_in_flight`.
+    """
+    in_flight = _in_flight_counts()
+    saturated = sorted(
+        endpoint_id for endpoint_id, count in in_flight.items()
+        if count >= settings.MAX_ENDPOINT_CONCURRENCY
+    )
+    per_endpoint = min(settings.SCHEDULER_ENDPOINT_BATCH_CAP, settings.MAX_ENDPOINT_CONCURRENCY)
+    headroom = {
+        endpoint_id: settings.MAX_ENDPOINT_CONCURRENCY - count
+        for endpoint_id, count in in_flight.items()
+        if 0 < settings.MAX_ENDPOINT_CONCURRENCY - count < per_endpoint
+    }
+    # Rows beyond a partially saturated endpoint's headroom are dropped below, so
+    # fetch enough extra that dropping them cannot leave the batch short.
+    overflow = sum(per_endpoint - room for room in headroom.values())
+
+    candidates = _first_per_endpoint(
+        _active_endpoints(partitions).exclude(id__in=saturated),
+        Delivery.objects.filter(
+            lanes.lane_filter(lane),
+            status=Delivery.Status.SCHEDULED,
+            next_attempt_at__lte=now,
+        ),
+        order_by=["next_attempt_at", "id"],
+        per_endpoint=per_endpoint,
+        limit=limit + overflow,
+    )
+
+    batch = []
+    taken = defaultdict(int)
+    for delivery in candidates:
+        if taken[delivery.endpoint_id] >= headroom.get(delivery.endpoint_id, per_endpoint):
+            continue
+        taken[delivery.endpoint_id] += 1
+        delivery.endpoint_in_flight = in_flight.get(delivery.endpoint_id, 0)
+        batch.append(delivery)
+        if len(batch) >= limit:
+            break
+    return batch
+
 
 @app.task
 def schedule_due_deliveries():
+    return run_scheduler_tick()
+
+
+def run_scheduler_tick(partitions=None):
+    """Schedule PENDING deliveries and dispatch due ones, limited to the given endpoint partitions."""
     if kill_switch.is_active():
         logger.info("Scheduler skipped due to kill switch")
         return {"status": "skipped", "reason": "kill_switch_active"}
@@ -23,72 +153,64 @@ def schedule_due_deliveries():
     now = timezone.now()
 
     with transaction.atomic():
-        pending_deliveries = Delivery.objects.filter(
-            status=Delivery.Status.PENDING
-        ).select_related("endpoint")[:100]
-
         scheduled_count = 0
-        for delivery in pending_deliveries:
-            if delivery.endpoint.status == delivery.endpoint.Status.ACTIVE:
-                try:
-                    DeliveryStateMachine.schedule(delivery)
-                    scheduled_count += 1
-                except Exception as e:
-                    logger.error("Error scheduling delivery", extra={
-                        "delivery_id": str(delivery.id),
-                        "error": str(e),
-                    })
+        for delivery in pending_batch(partitions):
+            try:
+                DeliveryStateMachine.schedule(delivery)
+                scheduled_count += 1
+            except Exception as e:
+                logger.error("Error scheduling delivery", extra={
+                    "delivery_id": str(delivery.id),
+                    "error": str(e),
+                })
 
     dispatched_count = 0
-    scheduled_deliveries = Delivery.objects.filter(
-        status=Delivery.Status.SCHEDULED,
-        next_attempt_at__lte=now
-    ).select_related("endpoint")[:100]
-
-    for delivery in scheduled_deliveries:
-        if delivery.endpoint.status != delivery.endpoint.Status.ACTIVE:
-            continue
-
-        in_flight_count = Delivery.objects.filter(
-            endpoint=delivery.endpoint,
-            status=Delivery.Status.IN_PROGRESS
-        ).count()
-
-        if in_flight_count >= settings.MAX_ENDPOINT_CONCURRENCY:
-            continue
-
-        from workers.delivery import execute_delivery
-        execute_delivery.delay(str(delivery.id))
-        dispatched_count += 1
-
-    pending_count = Delivery.objects.filter(status=Delivery.Status.PENDING).count()
-    scheduled_remaining = Delivery.objects.filter(status=Delivery.Status.SCHEDULED).count()
-    in_progress_count = Delivery.objects.filter(status=Delivery.Status.IN_PROGRESS).count()
-    backlog_size.labels(status="PENDING").set(pending_count)
-    backlog_size.labels(status="SCHEDULED").set(scheduled_remaining)
-    backlog_size.labels(status="IN_PROGRESS").set(in_progress_count)
-
-    for ep in Endpoint.objects.filter(status=Endpoint.Status.ACTIVE):
-        total = Delivery.objects.filter(endpoint=ep, status__in=[
-            Delivery.Status.DELIVERED, Delivery.Status.FAILED,
-            Delivery.Status.EXPIRED,
-        ]).count()
-        if total > 0:
-            success = Delivery.objects.filter(endpoint=ep, status=Delivery.Status.DELIVERED).count()
-            endpoint_success_rate.labels(
-                endpoint_id=str(ep.id),
-                endpoint_name=ep.name,
-            ).set(success / total)
+    dispatched_by_lane = {}
+    dispatched_by_endpoint = defaultdict(int)
+    slow_count = 0
+    global_fraction = warmup.global_fraction(now)
+    slow_budget = warmup.scaled(lanes.budget_for(lanes.SLOW), global_fraction)
+    for lane in lanes.LANES:
+        lane_budget = warmup.scaled(lanes.budget_for(lane), global_fraction)
+        scheduled_deliveries = due_batch(lane, now, lane_budget, partitions)
+        slow_endpoints = endpoint_latency.slow_endpoint_ids({d.endpoint_id for d in scheduled_deliveries})
+        concurrency_limits = warmup.endpoint_concurrency_limits(scheduled_deliveries, now)
+
+        lane_count = 0
+        for delivery in scheduled_deliveries:
+            in_flight_count = delivery.endpoint_in_flight + dispatched_by_endpoint[delivery.endpoint_id]
+            concurrency_limit = concurrency_limits.get(delivery.endpoint_id, settings.MAX_ENDPOINT_CONCURRENCY)
+            if in_flight_count >= concurrency_limit:
+                continue
+
+            target_lane = lane
+            if delivery.endpoint_id in slow_endpoints:
+                if slow_count >= slow_budget:
+                    continue
+                target_lane = lanes.SLOW
+                slow_count += 1
+            else:
+                lane_count += 1
+
+            from workers.delivery import execute_delivery
+            execute_delivery.apply_async(args=[str(delivery.id)], queue=lanes.queue_for(target_lane))
+            dispatched_by_endpoint[delivery.endpoint_id] += 1
+
+        dispatched_by_lane[lane] = lane_count
+        dispatched_count += lane_count
+
+    dispatched_by_lane[lanes.SLOW] = slow_count
+    dispatched_count += slow_count
 
     if scheduled_count > 0 or dispatched_count > 0:
         logger.info("Scheduler cycle completed", extra={
             "scheduled": scheduled_count,
             "dispatched": dispatched_count,
-            "backlog_pending": pending_count,
-            "backlog_scheduled": scheduled_remaining,
+            "dispatched_by_lane": dispatched_by_lane,
         })
 
     return {
         "scheduled": scheduled_count,
         "dispatched": dispatched_count,
+        "dispatched_by_lane": dispatched_by_lane,
     }
@@ -0,0 +1,66 @@
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+COUNTER_KEY = "deliverant:endpoint_outcomes:{endpoint_id}:{kind}:{bucket}"
+
+TOTAL = "total"
+SUCCESS = "success"
+
+
+def _bucket(now=None):
+    return int((now if now is not None else time.time()) // settings.SUCCESS_RATE_BUCKET_SECONDS)
+
+
+def _window_keys(endpoint_id, kind, bucket):
+    bucket_count = settings.SUCCESS_RATE_WINDOW_SECONDS // settings.SUCCESS_RATE_BUCKET_SECONDS
+    return [
+        COUNTER_KEY.format(endpoint_id=endpoint_id, kind=kind, bucket=bucket - offset)
+        for offset in range(bucket_count)
+    ]
+
+
+def _incr(key):
+    timeout = settings.SUCCESS_RATE_WINDOW_SECONDS + settings.SUCCESS_RATE_BUCKET_SECONDS
+    cache.add(key, 0, timeout=timeout)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=timeout)
+
+
+def record(endpoint_id, success, now=None):
+    """Count a completed attempt in the endpoint's current time bucket."""
+    bucket = _bucket(now)
+    _incr(COUNTER_KEY.format(endpoint_id=endpoint_id, kind=TOTAL, bucket=bucket))
+    if success:
+        _incr(COUNTER_KEY.format(endpoint_id=endpoint_id, kind=SUCCESS, bucket=bucket))
+
+
+def success_rates(endpoint_ids, now=None):
+    """Return {endpoint_id: rate} over the rolling window, in one cache round-trip.
+
+    Endpoints with no attempts in the window are omitted.
+    """
+    bucket = _bucket(now)
+    key_map = {}
+    for endpoint_id in endpoint_ids:
+        for kind in (TOTAL, SUCCESS):
+            for key in _window_keys(endpoint_id, kind, bucket):
+                key_map[key] = (endpoint_id, kind)
+
+    if not key_map:
+        return {}
+
+    counts = defaultdict(lambda: {TOTAL: 0, SUCCESS: 0})
+    for key, value in cache.get_many(key_map).items():
+        endpoint_id, kind = key_map[key]
+        counts[endpoint_id][kind] += int(value)
+
+    return {
+        endpoint_id: c[SUCCESS] / c[TOTAL]
+        for endpoint_id, c in counts.items()
+        if c[TOTAL] > 0
+    }
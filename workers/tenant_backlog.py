@@ -0,0 +1,32 @@
+import logging
+
+from apps.deliveries.models import Delivery
+from workers.redis_client import get_client
+
+logger = logging.getLogger("workers.tenant_backlog")
+
+# Per-tenant count of PENDING and SCHEDULED deliveries, used for ingest load
+# shedding. Ingest increments it; refresh_backlog_gauges replaces it with exact
+# counts on every run, which also corrects deliveries that left the backlog since.
+TENANT_BACKLOG_KEY = "deliverant:tenant_backlog"
+
+STATUSES = [Delivery.Status.PENDING, Delivery.Status.SCHEDULED]
+
+
+def add(tenant_id, count):
+    """Count newly created deliveries; a failure only delays shedding until the next resync."""
+    if not count:
+        return
+    try:
+        get_client().hincrby(TENANT_BACKLOG_KEY, str(tenant_id), count)
+    except Exception as e:
+        logger.warning("Failed to update tenant backlog counter", extra={"tenant_id": str(tenant_id), "error": str(e)})
+
+
+def replace(counts):
+    """Replace all tenant counters with exact counts ({tenant_id: count})."""
+    pipe = get_client().pipeline(transaction=True)
+    pipe.delete(TENANT_BACKLOG_KEY)
+    if counts:
+        pipe.hset(TENANT_BACKLOG_KEY, mapping={str(tenant_id): count for tenant_id, count in counts.items()})
+    pipe.execute()
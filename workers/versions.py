@@ -0,0 +1,57 @@
+import logging
+import time
+
+from django.db import transaction
+
+from workers.redis_client import get_client
+
+logger = logging.getLogger("workers.versions")
+
+# Per-tenant change counters used as cheap ETags for polled API responses.
+# Counters are advanced after the writing transaction commits, so a version is
+# never observed before the data it covers. A missing counter is seeded from the
+# clock, so one lost with Redis never repeats a version a client has cached.
+VERSION_KEY = "deliverant:version:{scope}:{tenant_id}"
+
+DELIVERIES = "deliveries"
+ENDPOINTS = "endpoints"
+
+
+def _key(scope, tenant_id):
+    return VERSION_KEY.format(scope=scope, tenant_id=tenant_id)
+
+
+def queue_incr(pipe, scope, tenant_ids):
+    """Queue the commands advancing the scope's version for each tenant on a pipeline."""
+    for tenant_id in tenant_ids:
+        pipe.set(_key(scope, tenant_id), time.time_ns(), nx=True)
+        pipe.incr(_key(scope, tenant_id))
+
+
+def _incr(scope, tenant_ids):
+    try:
+        pipe = get_client().pipeline(transaction=False)
+        queue_incr(pipe, scope, tenant_ids)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Failed to advance version counter", extra={"scope": scope, "error": str(e)})
+
+
+def bump(scope, *tenant_ids):
+    """Advance the scope's version for each tenant once the current transaction commits."""
+    if tenant_ids:
+        transaction.on_commit(lambda: _incr(scope, set(tenant_ids)))
+
+
+def current(tenant_id, *scopes):
+    """Return the tenant's version for each scope, or None if Redis is unavailable."""
+    try:
+        pipe = get_client().pipeline(transaction=False)
+        for scope in scopes:
+            pipe.set(_key(scope, tenant_id), time.time_ns(), nx=True)
+            pipe.get(_key(scope, tenant_id))
+        values = pipe.execute()[1::2]
+    except Exception as e:
+        logger.warning("Failed to read version counters", extra={"error": str(e)})
+        return None
+    return [int(value) for value in values]
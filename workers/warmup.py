@@ -0,0 +1,79 @@
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+GLOBAL_WARMUP_KEY = "deliverant:warmup:global"
+TENANT_WARMUP_KEY = "deliverant:warmup:tenant:{tenant_id}"
+ENDPOINT_WARMUP_KEY = "deliverant:warmup:endpoint:{endpoint_id}"
+
+
+def _key(tenant_id=None, endpoint_id=None):
+    if endpoint_id is not None:
+        return ENDPOINT_WARMUP_KEY.format(endpoint_id=endpoint_id)
+    if tenant_id is not None:
+        return TENANT_WARMUP_KEY.format(tenant_id=tenant_id)
+    return GLOBAL_WARMUP_KEY
+
+
+def start(tenant_id=None, endpoint_id=None, now=None):
+    """Start a warm-up window for an endpoint, a tenant, or all dispatch when no scope is given."""
+    if settings.WARMUP_WINDOW_SECONDS <= 0:
+        return
+    now = now or timezone.now()
+    cache.set(_key(tenant_id, endpoint_id), now.timestamp(), timeout=settings.WARMUP_WINDOW_SECONDS)
+
+
+def ramp_fraction(started_at, now):
+    """Share of full dispatch capacity allowed at `now` for a warm-up started at `started_at`.
+
+    Ramps linearly from WARMUP_INITIAL_FRACTION to 1.0 over WARMUP_WINDOW_SECONDS.
+    """
+    if started_at is None or settings.WARMUP_WINDOW_SECONDS <= 0:
+        return 1.0
+    progress = (now.timestamp() - started_at) / settings.WARMUP_WINDOW_SECONDS
+    if progress >= 1:
+        return 1.0
+    initial = settings.WARMUP_INITIAL_FRACTION
+    return initial + (1 - initial) * max(0.0, progress)
+
+
+def scaled(limit, fraction):
+    """Scale a concurrency limit or budget by a ramp fraction, never below 1."""
+    return max(1, math.floor(limit * fraction))
+
+
+def global_fraction(now=None):
+    now = now or timezone.now()
+    return ramp_fraction(cache.get(GLOBAL_WARMUP_KEY), now)
+
+
+def endpoint_concurrency_limits(deliveries, now=None):
+    """Return {endpoint_id: max in-flight} for endpoints warming up, in one cache round-trip.
+
+    An endpoint is limited by its own warm-up and its tenant's, whichever is stricter;
+    endpoints not warming up are omitted and keep MAX_ENDPOINT_CONCURRENCY.
+    """
+    now = now or timezone.now()
+    pairs = {(delivery.tenant_id, delivery.endpoint_id) for delivery in deliveries}
+    if not pairs:
+        return {}
+
+    keys = set()
+    for tenant_id, endpoint_id in pairs:
+        keys.add(_key(tenant_id=tenant_id))
+        keys.add(_key(endpoint_id=endpoint_id))
+    started = cache.get_many(keys)
+    if not started:
+        return {}
+
+    limits = {}
+    for tenant_id, endpoint_id in pairs:
+        fraction = min(
+            ramp_fraction(started.get(_key(tenant_id=tenant_id)), now),
+            ramp_fraction(started.get(_key(endpoint_id=endpoint_id)), now),
+        )
+        if fraction < 1:
+            limits[endpoint_id] = scaled(settings.MAX_ENDPOINT_CONCURRENCY, fraction)
+    return limits